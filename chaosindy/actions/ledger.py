@@ -0,0 +1,28 @@
+from chaosindy.common import true_list
+from chaosindy.helpers import run
+from chaosindy.ledger_interaction import close_sessions
+from logzero import logger
+
+from typing import Union
+
+
+def close_ledger_sessions(cleanup: str = "True",
+                          timeout: Union[str,int] = '60') -> bool:
+    """
+    Close the pool handles and wallets kept open by probes that reuse ledger
+    sessions (i.e. write_nym with reuse_session set). Intended to be used as a
+    rollback, so an experiment does not leave wallets behind.
+
+    :param cleanup: Delete each session's wallet?
+        Optional. (Default: "True")
+        Valid inputs (case insensitive): 'false', '0', 'f', 'n', 'no', 'true',
+        '1', 't', 'y', 'yes'
+    :type cleanup: str
+    :param timeout: How long (in seconds) to wait for the sessions to close.
+        Optional. (Default: '60')
+    :type timeout: Union[str,int]
+    :return: bool
+    """
+    logger.debug("cleanup: %s timeout: %s", cleanup, timeout)
+    return run(close_sessions, timeout=int(timeout),
+               cleanup=str(cleanup).lower() in true_list)
@@ -1,17 +1,37 @@
+import asyncio
+import base64
+import glob
+import io
 import os
 import json
 import random
+import shlex
 import subprocess
+import tarfile
+import threading
 import time
 from chaosindy.common import *
-from chaosindy.execute.execute import FabricExecutor, ParallelFabricExecutor
-from chaosindy.probes.validator_info import get_validator_info, detect_primary
+from chaosindy.execute.execute import (
+    AsyncRemoteExecutor, FabricExecutor, get_parallel_executor
+)
+from chaosindy.helpers import BackgroundTask
+from chaosindy.ledger_interaction import (
+    build_node_services_request, get_session, submit_requests_at
+)
+from chaosindy.load import (
+    generate_nym_load_async, merge_request_records, percentile,
+    read_request_records
+)
+from chaosindy.probes.catchup import get_ledger_consistency, track_catchup
+from chaosindy.probes.validator_info import (
+    ValidatorInfoSnapshot, get_validator_info, detect_primary, primary_quorum
+)
 from chaosindy.probes.validator_state import get_current_validator_list
 from logzero import logger
 from multiprocessing import Pool
 from os.path import expanduser, join
 from time import sleep
-from typing import Union, List, Dict
+from typing import Union, List, Dict, Tuple
 
 def generate_load(client: str, command: str = DEFAULT_CHAOS_LOAD_COMMAND,
                   timeout: Union[str,int] = DEFAULT_CHAOS_LOAD_TIMEOUT,
@@ -40,7 +60,8 @@ def generate_load(client: str, command: str = DEFAULT_CHAOS_LOAD_COMMAND,
     message = """Generating load from client %s using command >%s< and timeout
                  >%s seconds<"""
     logger.info(message, client, command, timeout)
-    executor = FabricExecutor(ssh_config_file=expanduser(ssh_config_file))
+    executor = FabricExecutor(ssh_config_file=expanduser(ssh_config_file),
+                              persistent=True)
     result = executor.execute(client, command, as_sudo=True,
                               timeout=int(timeout))
     if result.return_code != 0:
@@ -52,10 +73,15 @@ def generate_load(client: str, command: str = DEFAULT_CHAOS_LOAD_COMMAND,
 def generate_load_parallel(clients = List[str],
     command: str = DEFAULT_CHAOS_LOAD_COMMAND,
     timeout: Union[str,int] = DEFAULT_CHAOS_LOAD_TIMEOUT,
-    ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE) -> bool:
+    ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE,
+    use_asyncio: Union[str,bool] = False) -> bool:
     """
     Generate load on the ledger from one or more clients in parallel.
 
+    Set use_asyncio to start the load command on every client at once from a
+    single event loop (see chaosindy.execute.execute.AsyncRemoteExecutor)
+    instead of one client per client CPU core.
+
     :param clients: A list of client aliases/hostnames from which to generate
         load. Required.
     :type clients: List[str]
@@ -72,6 +98,9 @@ def generate_load_parallel(clients = List[str],
         file.
         Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SSH_CONFIG_FILE)
     :type ssh_config_file: str
+    :param use_asyncio: Use the asyncio-based remote executor?
+        Optional. (Default: False)
+    :type use_asyncio: Union[str,bool]
     :return: bool
     """
     message = """Generating load from clients %s using command >%s< and timeout
@@ -87,9 +116,20 @@ def generate_load_parallel(clients = List[str],
         logger.exception(e)
         return False
     ssh_config_file=expanduser(ssh_config_file)
-    executor = ParallelFabricExecutor(ssh_config_file=ssh_config_file)
-    result = executor.execute(client_list, command, as_sudo=True,
-                              timeout=int(timeout))
+    if str(use_asyncio).lower() in true_list:
+        executor = AsyncRemoteExecutor(ssh_config_file=ssh_config_file)
+        loop = asyncio.new_event_loop()
+        try:
+            result = loop.run_until_complete(
+                executor.execute(client_list, command, as_sudo=True,
+                                 timeout=int(timeout)))
+        finally:
+            loop.close()
+            executor.close()
+    else:
+        executor = get_parallel_executor(ssh_config_file=ssh_config_file)
+        result = executor.execute(client_list, command, as_sudo=True,
+                                  timeout=int(timeout))
 
     logger.debug("result: %s", json.dumps(result))
     for client in client_list:
@@ -99,6 +139,294 @@ def generate_load_parallel(clients = List[str],
     return True
 
 
+def _safe_tar_members(tar: tarfile.TarFile,
+                      dest: str) -> List[tarfile.TarInfo]:
+    """
+    Return the regular files and directories in tar that extract inside dest.
+    Anything else (i.e. absolute paths, paths containing '..', links and
+    devices) is skipped and logged, since archives come from remote hosts.
+    """
+    dest = os.path.realpath(dest)
+    members = []
+    for member in tar.getmembers():
+        target = os.path.realpath(join(dest, member.name))
+        if not (member.isfile() or member.isdir()) or \
+           (target != dest and not target.startswith(dest + os.sep)):
+            logger.warning("Skipping %s in archive", member.name)
+            continue
+        members.append(member)
+    return members
+
+
+def generate_load_fleet(clients: str,
+    command: str = DEFAULT_CHAOS_LOAD_COMMAND,
+    start_delay: Union[str,int] = DEFAULT_CHAOS_LOAD_FLEET_START_DELAY,
+    timeout: Union[str,int] = DEFAULT_CHAOS_LOAD_TIMEOUT,
+    time_sent_column: str = DEFAULT_CHAOS_LOAD_TIME_SENT_COLUMN,
+    time_reply_column: str = DEFAULT_CHAOS_LOAD_TIME_REPLY_COLUMN,
+    ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE) -> Dict:
+    """
+    Generate load on the ledger from a fleet of clients that all start at the
+    same instant, and merge what each client recorded into one time-aligned
+    series.
+
+    Each client runs the load command in a fresh working directory, after
+    sleeping until a shared wall clock start time (start_delay seconds from
+    now), so clients' clocks must be synchronized (i.e. NTP). Once every client
+    is done, the contents of each working directory are copied (in parallel)
+    to load-fleet-output/<client> in the experiment's temp dir. Every CSV file
+    with time_sent_column and time_reply_column columns (epoch seconds) is then
+    merged into a per-second series (see
+    chaosindy.load.merge_request_records) and written to the load-fleet file in
+    the experiment's temp dir, so it can be lined up with fault injection
+    timestamps.
+
+    :param clients: A JSON list of client aliases/hostnames from which to
+        generate load.
+        Required.
+    :type clients: str
+    :param command: The load command to execute from each client. It must
+        write its per-request CSV file(s) to the current working directory.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_LOAD_COMMAND)
+    :type command: str
+    :param start_delay: How long (in seconds) from now the clients start. Must
+        be long enough to reach every client.
+        Optional.
+        (Default: chaosindy.common.DEFAULT_CHAOS_LOAD_FLEET_START_DELAY)
+    :type start_delay: Union[str,int]
+    :param timeout: How long the command may execute, once started, before
+        timing out.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_LOAD_TIMEOUT)
+    :type timeout: Union[str,int]
+    :param time_sent_column: See chaosindy.load.read_request_records
+        Optional.
+        (Default: chaosindy.common.DEFAULT_CHAOS_LOAD_TIME_SENT_COLUMN)
+    :type time_sent_column: str
+    :param time_reply_column: See chaosindy.load.read_request_records
+        Optional.
+        (Default: chaosindy.common.DEFAULT_CHAOS_LOAD_TIME_REPLY_COLUMN)
+    :type time_reply_column: str
+    :param ssh_config_file: The relative or absolute path to the SSH config
+        file.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SSH_CONFIG_FILE)
+    :type ssh_config_file: str
+    :return: Dict - start_at (epoch seconds), clients (each client's
+        return_code and number of records) and the merged started_at, summary
+        and series. Empty if the clients list is invalid.
+    """
+    logger.info("Generating load from client fleet %s using command >%s<, " \
+                "start delay >%s seconds< and timeout >%s seconds<", clients,
+                command, start_delay, timeout)
+    try:
+        client_list = json.loads(clients)
+    except Exception as e:
+        message = """Failed to parse JSON clients list. The list of clients on
+                     which to generate load, must be a valid JSON list of node
+                     aliases found in your ssh config file %s"""
+        logger.error(message, ssh_config_file)
+        logger.exception(e)
+        return {}
+    output_dir = get_chaos_temp_dir()
+    executor = get_parallel_executor(
+        ssh_config_file=expanduser(ssh_config_file))
+
+    # Start barrier: every client sleeps until start_at
+    start_at = time.time() + int(start_delay)
+    run_dir = "/tmp/chaosindy-load-{}".format(int(start_at))
+    script = "mkdir -p {0} && cd {0} && sleep $(python3 -c 'import time; " \
+             "print(max(0, {1} - time.time()))') && {2}".format(
+             run_dir, start_at, command)
+    result = executor.execute(client_list,
+                              "bash -c {}".format(shlex.quote(script)),
+                              as_sudo=True,
+                              timeout=int(timeout) + int(start_delay))
+
+    # Pull back each client's working directory
+    script = "cd {0} && tar czf - . | base64 -w0 && rm -rf {0}".format(
+        run_dir)
+    archives = executor.execute(client_list,
+                                "bash -c {}".format(shlex.quote(script)),
+                                as_sudo=True, timeout=int(timeout))
+
+    rtn = {'start_at': start_at, 'clients': {}}
+    records = {}
+    for client in client_list:
+        rtn['clients'][client] = {
+            'return_code': result[client]['return_code'],
+            'records': 0
+        }
+        if result[client]['return_code'] != 0:
+            logger.error("Failed to generate load from client %s", client)
+        if archives[client]['return_code'] != 0:
+            logger.error("Failed to collect load output from client %s",
+                         client)
+            continue
+        client_dir = join(output_dir, 'load-fleet-output', client)
+        try:
+            archive = base64.b64decode(archives[client]['stdout'].strip())
+            with tarfile.open(fileobj=io.BytesIO(archive), mode='r:gz') as tar:
+                tar.extractall(client_dir,
+                               members=_safe_tar_members(tar, client_dir))
+        except Exception as e:
+            logger.error("Failed to unpack load output from client %s",
+                         client)
+            logger.exception(e)
+            continue
+        records[client] = []
+        for csv_file in glob.glob(join(client_dir, '**', '*.csv'),
+                                  recursive=True):
+            records[client].extend(read_request_records(csv_file,
+                time_sent_column=time_sent_column,
+                time_reply_column=time_reply_column))
+        rtn['clients'][client]['records'] = len(records[client])
+
+    rtn.update(merge_request_records(records))
+    with open(join(output_dir, 'load-fleet'), 'w') as f:
+        json.dump(rtn, f, sort_keys=True, indent=4)
+    return rtn
+
+
+# Background loads started by start_background_load in this process, keyed by
+# name. Each is a (BackgroundTask, stop threading.Event) tuple.
+_background_loads = {}
+
+
+def _write_background_load_state(name: str, state: Dict) -> None:
+    output_dir = get_chaos_temp_dir()
+    with open(join(output_dir, "background-load-{}".format(name)), 'w') as f:
+        json.dump(state, f, sort_keys=True, indent=4)
+
+
+def start_background_load(genesis_file: str, name: str = "load",
+    rate: Union[str,float] = DEFAULT_CHAOS_BACKGROUND_LOAD_RATE,
+    max_duration: Union[str,int] = DEFAULT_CHAOS_BACKGROUND_LOAD_MAX_DURATION,
+    arrival: str = DEFAULT_CHAOS_LOAD_ARRIVAL,
+    seed: str = DEFAULT_CHAOS_SEED, pool_name: str = DEFAULT_CHAOS_POOL,
+    wallet_name: str = DEFAULT_CHAOS_WALLET_NAME,
+    wallet_key: str = DEFAULT_CHAOS_WALLET_KEY) -> bool:
+    """
+    Start writing NYMs to the pool at a constant rate from the chaos process,
+    without waiting for the load to finish, so the actions that follow (i.e.
+    stop_primary) run while the pool is under load. Use stop_background_load,
+    with the same name, to stop the load and collect its throughput and latency
+    stats.
+
+    The load is open loop (see chaosindy.load.run_open_loop_load). Its state is
+    written to the background-load-<name> file in the experiment's temp dir.
+
+    :param genesis_file: Relative or absolute path to the pool's genesis
+        transaction file.
+        Required.
+    :type genesis_file: str
+    :param name: Names the load, so more than one can run at once.
+        Optional. (Default: "load")
+    :type name: str
+    :param rate: Target NYMs per second.
+        Optional.
+        (Default: chaosindy.common.DEFAULT_CHAOS_BACKGROUND_LOAD_RATE)
+    :type rate: Union[str,float]
+    :param max_duration: Stop offering load after this many seconds, even if
+        stop_background_load is never called.
+        Optional.
+        (Default: chaosindy.common.DEFAULT_CHAOS_BACKGROUND_LOAD_MAX_DURATION)
+    :type max_duration: Union[str,int]
+    :param arrival: 'poisson' or 'uniform'.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_LOAD_ARRIVAL)
+    :type arrival: str
+    :param seed: 32 byte string used to generate did, verkey pair. The seed must
+        be the seed for a Trustee, Steward, or Trust Anchor.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SEED)
+    :type seed: str
+    :param pool_name: Pool name
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_POOL)
+    :type pool_name: str
+    :param wallet_name: Wallet name
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_WALLET_NAME)
+    :type wallet_name: str
+    :param wallet_key: Wallet key
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_WALLET_KEY)
+    :type wallet_key: str
+    :return: bool - False if a load with the same name is already running
+    """
+    logger.info("Starting background load %s at %s NYMs per second",
+                name, rate)
+    if name in _background_loads and _background_loads[name][0].is_alive():
+        logger.error("Background load %s is already running", name)
+        return False
+
+    stop = threading.Event()
+    task = BackgroundTask("background-load-{}".format(name),
+                          generate_nym_load_async, 0,
+                          genesis_file=genesis_file, seed=seed,
+                          pool_name=pool_name, wallet_name=wallet_name,
+                          wallet_key=wallet_key, rate=float(rate),
+                          duration=float(max_duration), arrival=arrival,
+                          stop=stop, run_in_loop=True).start()
+    _background_loads[name] = (task, stop)
+    _write_background_load_state(name, {
+        'name': name,
+        'pid': os.getpid(),
+        'rate': float(rate),
+        'started_at': time.time(),
+        'status': 'running'
+    })
+    return True
+
+
+def stop_background_load(name: str = "load",
+    timeout: Union[str,int] = DEFAULT_CHAOS_LOAD_TIMEOUT) -> Dict:
+    """
+    Stop a load started by start_background_load, wait (up to timeout seconds)
+    for its outstanding requests, and collect its stats.
+
+    The stats are also written to the background-load-<name> file in the
+    experiment's temp dir.
+
+    :param name: The name given to start_background_load.
+        Optional. (Default: "load")
+    :type name: str
+    :param timeout: How long (in seconds) to wait for outstanding requests.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_LOAD_TIMEOUT)
+    :type timeout: Union[str,int]
+    :return: Dict - See chaosindy.load.run_open_loop_load. Empty if the load is
+        not running in this process, failed, or did not stop in time.
+    """
+    logger.info("Stopping background load %s", name)
+    if name not in _background_loads:
+        logger.error("Background load %s was not started by this process",
+                     name)
+        return {}
+    (task, stop) = _background_loads.pop(name)
+    stop.set()
+    state = {
+        'name': name,
+        'pid': os.getpid(),
+        'started_at': task.started_at,
+        'stopped_at': time.time()
+    }
+    if not task.join(int(timeout)):
+        logger.error("Background load %s did not stop within %s seconds",
+                     name, timeout)
+        state['status'] = 'timeout'
+        _write_background_load_state(name, state)
+        return {}
+    if task.exception is not None or not task.result:
+        state['status'] = 'failed'
+        state['error'] = str(task.exception)
+        _write_background_load_state(name, state)
+        return {}
+
+    stats = task.result
+    logger.info("Background load %s: %d/%d succeeded, %.2f tps, p50 %s " \
+                "p95 %s p99 %s", name, stats['succeeded'], stats['count'],
+                stats['tps'], stats['latency']['p50'],
+                stats['latency']['p95'], stats['latency']['p99'])
+    state['status'] = 'stopped'
+    state['stats'] = stats
+    _write_background_load_state(name, state)
+    return stats
+
+
 def apply_iptables_rule_by_node_name(node: str, rule: str,
     ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE) -> bool:
     """
@@ -115,7 +443,8 @@ def apply_iptables_rule_by_node_name(node: str, rule: str,
     :return: bool
     """
     logger.debug("applying iptables rule >%s< on node: %s", rule, node)
-    executor = FabricExecutor(ssh_config_file=expanduser(ssh_config_file))
+    executor = FabricExecutor(ssh_config_file=expanduser(ssh_config_file),
+                              persistent=True)
 
     ## 1. Apply iptables rule
     try:
@@ -132,6 +461,45 @@ def apply_iptables_rule_by_node_name(node: str, rule: str,
     return True
 
 
+def block_port_rule(port: str) -> str:
+    """
+    The iptables rule used to block a port or port range. See
+    block_port_by_node_name.
+
+    :param port: The port or port range to block. A port range is formatted
+        <from port>:<to port>. Required.
+    :type port: str
+    :return: str
+    """
+    if ":" in port:
+        return "-A INPUT -p tcp --match multiport --dports {} -j" \
+               " DROP".format(port)
+    return "-A INPUT -p tcp --destination-port {} -j DROP".format(port)
+
+
+def unblock_port_rule(port: str, best_effort: bool = False) -> str:
+    """
+    The iptables rule used to unblock a port or port range. See
+    unblock_port_by_node_name.
+
+    :param port: The port or port range to unblock. A port range is formatted
+        <from port>:<to port>. Required.
+    :type port: str
+    :param best_effort: Do NOT fail if the operation fails? (Default: False)
+    :type best_effort: bool
+    :return: str
+    """
+    do_not_fail = ""
+    if best_effort:
+       do_not_fail = " || true"
+
+    if ":" in port:
+        return "-D INPUT -p tcp --match multiport --dports {} -j" \
+               " DROP{}".format(port, do_not_fail)
+    return "-D INPUT -p tcp --destination-port {} -j" \
+           " DROP{}".format(port, do_not_fail)
+
+
 def block_port_by_node_name(node: str, port: str,
     ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE) -> bool:
     """
@@ -150,11 +518,7 @@ def block_port_by_node_name(node: str, port: str,
     """
     logger.debug("block node %s on port %s", node, port)
     ## 1. Block a port or port range using a firewall
-    if ":" in port:
-        rule = "-A INPUT -p tcp --match multiport --dports {} -j" \
-               " DROP".format(port)
-    else:
-        rule = "-A INPUT -p tcp --destination-port {} -j DROP".format(port)
+    rule = block_port_rule(port)
     return apply_iptables_rule_by_node_name(node, rule, ssh_config_file)
 
 
@@ -177,17 +541,8 @@ def unblock_port_by_node_name(node: str, port: str, best_effort: bool = False,
     :return: bool
     """
     logger.debug("unblock node %s on port %s", node, port)
-    do_not_fail = ""
-    if best_effort:
-       do_not_fail = " || true"
-
     ## 1. Unblock a port or port range using a firewall
-    if ":" in port:
-        rule = "-D INPUT -p tcp --match multiport --dports {} -j" \
-               " DROP{}".format(port, do_not_fail)
-    else:
-        rule = "-D INPUT -p tcp --destination-port {} -j" \
-               " DROP{}".format(port, do_not_fail)
+    rule = unblock_port_rule(port, best_effort=best_effort)
 
     try:
         return apply_iptables_rule_by_node_name(node, rule, ssh_config_file)
@@ -198,39 +553,92 @@ def unblock_port_by_node_name(node: str, port: str, best_effort: bool = False,
     return True
 
 
-def indy_node_is_stopped(node: str, timeout: Union[str,int] = 30,
-    ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE) -> bool:
+def stop_and_wait_command(deadline: Union[str,int] = \
+    DEFAULT_CHAOS_STOP_DEADLINE, stop: bool = True) -> str:
     """
-    Check if indy-node and indy-node-control services are stopped.
+    Build a command that stops indy-node and indy-node-control and then waits,
+    on the node, for both processes to exit. The command always exits 0, so
+    the executors do not raise on a failed stop, and prints a status followed
+    by the seconds elapsed since the stop was issued (see _parse_stop_result).
+    The status is 'stopped' once the processes are gone, 'failed' if
+    systemctl fails, or 'timeout' if they are still running after deadline
+    seconds.
+
+    systemctl does not wait for the unit to stop. It issues a signal and moves
+    on. The indy-node service has been observed to take up to a minute to
+    stop, so absence of a pid is used to determine that a node has stopped.
+
+    :param deadline: Seconds to wait for the processes to exit.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_STOP_DEADLINE)
+    :type deadline: Union[str,int]
+    :param stop: Issue systemctl stop? When False, only wait for the processes
+        to exit.
+        Optional. (Default: True)
+    :type stop: bool
+    :return: str
+    """
+    # The [s] keeps the pattern from matching this script's own command line
+    script = "start=$(date +%s%N); status=stopped; "
+    if stop:
+        script += "systemctl stop indy-node indy-node-control || " \
+                  "status=failed; "
+    script += "while [ $status = stopped ] && " \
+              "pgrep -f '[s]tart_indy_node|[s]tart_node_control_tool'" \
+              " > /dev/null; do " \
+              "if [ $(( $(date +%s%N) - start )) -ge {}000000000 ]; then " \
+              "status=timeout; break; fi; sleep 0.1; done; " \
+              "elapsed=$(( ($(date +%s%N) - start) / 1000000 )); " \
+              "printf '%s %d.%03d\\n' $status $((elapsed / 1000)) " \
+              "$((elapsed % 1000)); exit 0".format(int(deadline))
+    # sudo only applies to the first command of a list, so run the list in a
+    # shell
+    return "bash -c {}".format(shlex.quote(script))
+
+
+def record_stop_times(stop_times: Dict[str,float]) -> None:
+    """
+    Record how long nodes took to stop in the 'stop_times' file in the chaos
+    temp dir. The file maps each node alias to the time its most recent stop
+    completed ('stopped_at') and the seconds it took ('elapsed').
 
-    :param node: The node alias. Required.
-    :type node: str
-    :param timeout: Timeout waiting for status response.
-        Optional. (Default: 30 seconds)
-    :type timeout: Union[str, int]
-    :param ssh_config_file: The relative or absolute path to the SSH config
-        file.
-        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SSH_CONFIG_FILE)
-    :type ssh_config_file: str
-    :return: bool
+    :param stop_times: Seconds each node took to stop, keyed by alias.
+        Required.
+    :type stop_times: Dict[str,float]
+    :return: None
     """
-    # TODO: Decide if `systemctl is-active indy-node` is sufficient. Until then
-    #       assume that absense of a pid is more definitive.
-    logger.debug("Ensure indy-node/indy-node-control is stopped...")
-    command = "ps -ef | grep 'start_indy_node\|start_node_control_tool'"\
-              " | grep -v grep | awk '{print $2}' | wc -l"
-    executor = FabricExecutor(ssh_config_file=expanduser(ssh_config_file))
-    result = executor.execute(node,
-                              command,
-                              timeout=int(timeout), as_sudo=True)
-    if result.return_code == 0 and result.stdout.strip() == "0":
-       return True
-    return False
+    if not stop_times:
+        return
+    stop_times_file = join(get_chaos_temp_dir(), "stop_times")
+    data = {}
+    try:
+        with open(stop_times_file, 'r') as f:
+            data = json.load(f)
+    except (IOError, ValueError):
+        pass
+    stopped_at = time.time()
+    for alias, elapsed in stop_times.items():
+        data[alias] = {"stopped_at": stopped_at, "elapsed": elapsed}
+    with open(stop_times_file, 'w') as f:
+        f.write(json.dumps(data))
+
+
+def _parse_stop_result(stdout: str) -> Tuple[str,Union[float,None]]:
+    """
+    Parse the status and elapsed seconds printed by stop_and_wait_command.
+    The status is 'unknown' if the output can not be parsed.
+    """
+    lines = stdout.strip().splitlines()
+    try:
+        (status, elapsed) = lines[-1].split()
+        return (status, float(elapsed))
+    except (IndexError, ValueError):
+        return ('unknown', None)
 
 
 def stop_by_node_name(node: str, gracefully: bool = True, force: bool = True,
     timeout: Union[str,int] = 30,
-    ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE) -> bool:
+    ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE,
+    stop_deadline: Union[str,int] = DEFAULT_CHAOS_STOP_DEADLINE) -> bool:
     """
     Stop indy-node service by node name/alias
 
@@ -250,17 +658,24 @@ def stop_by_node_name(node: str, gracefully: bool = True, force: bool = True,
     :type gracefully: bool
     :param force: kill -9 (SIGKILL) the services?
     :type force: bool
-    :param timeout: Timeout waiting for service to stop.
-        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_LOAD_COMMAND)
+    :param timeout: Timeout waiting for the remote command to connect and
+        complete, in addition to stop_deadline.
+        Optional. (Default: 30)
     :type timeout: Union[str,int]
     :param ssh_config_file: The relative or absolute path to the SSH config
         file.
         Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SSH_CONFIG_FILE)
     :type ssh_config_file: str
+    :param stop_deadline: How long to wait for the services to stop when
+        stopping gracefully. See stop_and_wait_command. The time taken is
+        recorded in the 'stop_times' file (see record_stop_times).
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_STOP_DEADLINE)
+    :type stop_deadline: Union[str,int]
     :return: bool
     """
     logger.debug("stop node: %s", node)
-    executor = FabricExecutor(ssh_config_file=expanduser(ssh_config_file))
+    executor = FabricExecutor(ssh_config_file=expanduser(ssh_config_file),
+                              persistent=True)
 
     # Do not allow both gracefully and force to be set to False
     if not gracefully and not force:
@@ -270,34 +685,30 @@ def stop_by_node_name(node: str, gracefully: bool = True, force: bool = True,
 
     if gracefully:
         logger.debug("Attempting to stop indy-node service gracefully...")
-        # 1. Stop the node by alias name
-        result = executor.execute(node,
-                                  "systemctl stop indy-node indy-node-control",
-                                  timeout=int(timeout), as_sudo=True)
-        if result.return_code != 0:
+        # 1. Stop the node by alias name and wait for it to stop, on the node
+        result = executor.execute(node, stop_and_wait_command(stop_deadline),
+                                  timeout=int(timeout) + int(stop_deadline),
+                                  as_sudo=True)
+        (status, elapsed) = _parse_stop_result(result.stdout) \
+            if result.return_code == 0 else ('unknown', None)
+        if status == 'failed':
             logger.error("Failed to stop %s using systemctl", node)
             if not force:
                 return False
+        elif status == 'stopped':
+            logger.debug("Node services guaranteed to be stopped after %s " \
+                         "seconds.", elapsed)
+            record_stop_times({node: elapsed})
+            return True
+        elif status == 'timeout':
+            logger.debug("Node services are still running after %s " \
+                         "seconds.", elapsed)
+            return False
         else:
-            # systemctl does not wait for the unit to stop. It issues a signal
-            # and moves on. The indy-node service has been observed to take up
-            # to a minute to stop. Ensure both indy-node and indy-node-control
-            # pids do not exist. Try up to 10 times with a 6 second sleep in
-            # between tries.
-            tries = 0
-            while True:
-                logger.debug("Ensuring node services are stopped: try %d...",
-                             tries)
-                if tries == 10 or indy_node_is_stopped(node, timeout=timeout,
-                    ssh_config_file=ssh_config_file) or tries == 10:
-                    break
-                tries += 1
-                sleep(6)
-            if tries < 10:
-                logger.debug("Node services guaranteed to be stopped.")
-                return True
-            else:
-                logger.debug("Node services are still running.")
+            # The command did not complete (i.e. SSH failed), so whether the
+            # services stopped is unknown
+            logger.error("Failed to get the stop status of %s", node)
+            if not force:
                 return False
 
     if force:
@@ -329,7 +740,8 @@ def start_by_node_name(node: str,
     :return: bool
     """
     logger.debug("start node: %s", node)
-    executor = FabricExecutor(ssh_config_file=expanduser(ssh_config_file))
+    executor = FabricExecutor(ssh_config_file=expanduser(ssh_config_file),
+                              persistent=True)
 
     # Start the node by alias name
     result = executor.execute(node, "systemctl start indy-node", as_sudo=True)
@@ -341,7 +753,8 @@ def start_by_node_name(node: str,
 
 
 def start_nodes(aliases: List[str] = [],
-                ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE) -> bool:
+                ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE,
+                parallel: Union[str,bool] = False) -> bool:
     """
     Start indy-node service on a list of nodes.
 
@@ -351,17 +764,26 @@ def start_nodes(aliases: List[str] = [],
         file.
         Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SSH_CONFIG_FILE)
     :type ssh_config_file: str
+    :param parallel: Start all nodes at once? See start_services_parallel.
+        Optional. (Default: False)
+    :type parallel: Union[str,bool]
     :return: bool
     """
     # Start all nodes listed in aliases list
     count = len(aliases)
     tried_to_start = 0
     are_alive = 0
-    for alias in aliases:
-        logger.debug("alias to start: %s", alias)
-        if start_by_node_name(alias, ssh_config_file):
-            are_alive += 1
-        tried_to_start += 1
+    if str(parallel).lower() in true_list:
+        started = start_services_parallel(aliases,
+                                          ssh_config_file=ssh_config_file)
+        are_alive = list(started.values()).count(True)
+        tried_to_start = len(started)
+    else:
+        for alias in aliases:
+            logger.debug("alias to start: %s", alias)
+            if start_by_node_name(alias, ssh_config_file):
+                are_alive += 1
+            tried_to_start += 1
 
     logger.debug("are_alive: %s -- count: %s -- tried_to_start: %s -- " \
                  "len-aliases: %s", are_alive, count, tried_to_start,
@@ -373,7 +795,8 @@ def start_nodes(aliases: List[str] = [],
 
 
 def stop_nodes(aliases: List[str] = [],
-               ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE) -> bool:
+               ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE,
+               parallel: Union[str,bool] = False) -> bool:
     """
     Stop indy-node service on a list of nodes.
 
@@ -383,17 +806,26 @@ def stop_nodes(aliases: List[str] = [],
         file.
         Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SSH_CONFIG_FILE)
     :type ssh_config_file: str
+    :param parallel: Stop all nodes at once? See stop_services_parallel.
+        Optional. (Default: False)
+    :type parallel: Union[str,bool]
     :return: bool
     """
     # Start all nodes listed in aliases list
     count = len(aliases)
     tried_to_stop = 0
     are_alive = 0
-    for alias in aliases:
-        logger.debug("alias to stop: %s", alias)
-        if stop_by_node_name(alias, ssh_config_file):
-            are_alive += 1
-        tried_to_stop += 1
+    if str(parallel).lower() in true_list:
+        stopped = stop_services_parallel(aliases,
+                                         ssh_config_file=ssh_config_file)
+        are_alive = list(stopped.values()).count(True)
+        tried_to_stop = len(stopped)
+    else:
+        for alias in aliases:
+            logger.debug("alias to stop: %s", alias)
+            if stop_by_node_name(alias, ssh_config_file):
+                are_alive += 1
+            tried_to_stop += 1
 
     logger.debug("are_alive: %s -- count: %s -- tried_to_stop: %s -- " \
                  "len-aliases: %s", are_alive, count, tried_to_stop,
@@ -405,6 +837,165 @@ def stop_nodes(aliases: List[str] = [],
     return True
 
 
+def wait_for_services_stopped(aliases: List[str],
+    timeout: Union[str,int] = 30,
+    ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE,
+    stop_deadline: Union[str,int] = DEFAULT_CHAOS_STOP_DEADLINE
+    ) -> Dict[str,bool]:
+    """
+    Wait for indy-node and indy-node-control to stop on a list of nodes. Each
+    node waits for its own processes to exit (see stop_and_wait_command), so
+    all nodes are checked in a single round trip.
+
+    :param aliases: A list of nodes. Required.
+    :type aliases: List[str]
+    :param timeout: Timeout waiting for the remote command to connect and
+        complete, in addition to stop_deadline.
+        Optional. (Default: 30)
+    :type timeout: Union[str,int]
+    :param ssh_config_file: The relative or absolute path to the SSH config
+        file.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SSH_CONFIG_FILE)
+    :type ssh_config_file: str
+    :param stop_deadline: How long to wait for the services to stop.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_STOP_DEADLINE)
+    :type stop_deadline: Union[str,int]
+    :return: Dict[str,bool] - Whether each node has stopped, keyed by alias
+    """
+    stopped = dict([(alias, False) for alias in aliases])
+    if not aliases:
+        return stopped
+    executor = get_parallel_executor(
+        ssh_config_file=expanduser(ssh_config_file))
+    logger.debug("Ensuring node services are stopped on %s...", aliases)
+    result = executor.execute(aliases,
+                              stop_and_wait_command(stop_deadline, stop=False),
+                              timeout=int(timeout) + int(stop_deadline),
+                              as_sudo=True)
+    for alias in aliases:
+        (status, elapsed) = _parse_stop_result(result[alias]['stdout']) \
+            if result[alias]['return_code'] == 0 else ('unknown', None)
+        stopped[alias] = status == 'stopped'
+        if not stopped[alias]:
+            logger.debug("Node services are still running on %s after %s " \
+                         "seconds.", alias, elapsed)
+    return stopped
+
+
+def stop_services_parallel(aliases: List[str], gracefully: bool = True,
+    force: bool = True, timeout: Union[str,int] = 30,
+    ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE,
+    stop_deadline: Union[str,int] = DEFAULT_CHAOS_STOP_DEADLINE
+    ) -> Dict[str,bool]:
+    """
+    Stop indy-node service on a list of nodes concurrently. The parallel
+    equivalent of calling stop_by_node_name on each node: the same commands
+    are run, but on all nodes at once (see
+    chaosindy.execute.execute.ParallelFabricExecutor).
+
+    :param aliases: A list of nodes. Required.
+    :type aliases: List[str]
+    :param gracefully: Use systemctl to stop the services?
+    :type gracefully: bool
+    :param force: kill -9 (SIGKILL) the services?
+    :type force: bool
+    :param timeout: Timeout waiting for each command to complete, in
+        addition to stop_deadline.
+        Optional. (Default: 30)
+    :type timeout: Union[str,int]
+    :param ssh_config_file: The relative or absolute path to the SSH config
+        file.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SSH_CONFIG_FILE)
+    :type ssh_config_file: str
+    :param stop_deadline: How long to wait for the services to stop when
+        stopping gracefully. See stop_by_node_name.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_STOP_DEADLINE)
+    :type stop_deadline: Union[str,int]
+    :return: Dict[str,bool] - Whether each node was stopped, keyed by alias
+    """
+    logger.debug("stop nodes: %s", aliases)
+    stopped = dict([(alias, False) for alias in aliases])
+    if not gracefully and not force:
+        logger.info("Invalid gracefully/force flag options. Setting both to " \
+                    "False is effectively a no-op.")
+        return stopped
+    executor = get_parallel_executor(
+        ssh_config_file=expanduser(ssh_config_file))
+
+    to_kill = list(aliases)
+    if gracefully:
+        logger.debug("Attempting to stop indy-node service gracefully...")
+        result = executor.execute(aliases,
+                                  stop_and_wait_command(stop_deadline),
+                                  timeout=int(timeout) + int(stop_deadline),
+                                  as_sudo=True)
+        to_kill = []
+        stop_times = {}
+        for alias in aliases:
+            (status, elapsed) = _parse_stop_result(result[alias]['stdout']) \
+                if result[alias]['return_code'] == 0 else ('unknown', None)
+            if status == 'stopped':
+                stopped[alias] = True
+                stop_times[alias] = elapsed
+            elif status == 'failed':
+                logger.error("Failed to stop %s using systemctl", alias)
+                if force:
+                    to_kill.append(alias)
+            elif status == 'timeout':
+                logger.debug("Node services are still running on %s after " \
+                             "%s seconds.", alias, elapsed)
+            else:
+                logger.error("Failed to get the stop status of %s", alias)
+                if force:
+                    to_kill.append(alias)
+        record_stop_times(stop_times)
+
+    if to_kill:
+        logger.debug("Attempting to stop indy-node service forcefully on " \
+                     "%s...", to_kill)
+        kill_command = "kill -9 $(ps -ef |" \
+                       " grep 'start_indy_node\|start_node_control_tool' |" \
+                       " grep -v grep | awk '{print $2}' | xargs)"
+        result = executor.execute(to_kill, kill_command, timeout=int(timeout),
+                                  as_sudo=True)
+        for alias in to_kill:
+            if result[alias]['return_code'] != 0:
+                logger.error("Failed to forcefully stop %s using kill -9",
+                             alias)
+            else:
+                stopped[alias] = True
+    return stopped
+
+
+def start_services_parallel(aliases: List[str],
+    ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE) -> Dict[str,bool]:
+    """
+    Start indy-node service on a list of nodes concurrently. The parallel
+    equivalent of calling start_by_node_name on each node.
+
+    :param aliases: A list of nodes. Required.
+    :type aliases: List[str]
+    :param ssh_config_file: The relative or absolute path to the SSH config
+        file.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SSH_CONFIG_FILE)
+    :type ssh_config_file: str
+    :return: Dict[str,bool] - Whether each node was started, keyed by alias
+    """
+    logger.debug("start nodes: %s", aliases)
+    if not aliases:
+        return {}
+    executor = get_parallel_executor(
+        ssh_config_file=expanduser(ssh_config_file))
+    result = executor.execute(aliases, "systemctl start indy-node",
+                              as_sudo=True)
+    started = {}
+    for alias in aliases:
+        started[alias] = result[alias]['return_code'] == 0
+        if not started[alias]:
+            logger.error("Failed to start %s", alias)
+    return started
+
+
 def all_nodes_up(genesis_file: str,
                  ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE) -> bool:
     """
@@ -566,13 +1157,43 @@ def block_node_port_random(genesis_file: str, count: Union[str,int],
     return True
 
 
+def _nodes_are_caught_up_by_deadline(nodes: List[str], genesis_file: str,
+    transactions: Union[str,int], catchup_deadline: Union[str,int],
+    did: str = DEFAULT_CHAOS_DID, seed: str = DEFAULT_CHAOS_SEED,
+    wallet_name: str = DEFAULT_CHAOS_WALLET_NAME,
+    wallet_key: str = DEFAULT_CHAOS_WALLET_KEY, pool: str = DEFAULT_CHAOS_POOL,
+    ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE) -> bool:
+    """
+    Track catchup on nodes until they are synced or catchup_deadline seconds
+    pass. Then, if transactions is given, check the number of transactions
+    each node caught up (see nodes_are_caught_up).
+    """
+    logger.debug("Waiting up to %s seconds for %s to sync...",
+                 catchup_deadline, nodes)
+    catchup = track_catchup(genesis_file, nodes, deadline=catchup_deadline,
+                            did=did, seed=seed, wallet_name=wallet_name,
+                            wallet_key=wallet_key, pool=pool,
+                            ssh_config_file=ssh_config_file)
+    if not catchup['synced']:
+        return False
+    if transactions:
+        logger.debug("Checking if nodes are synced and report %s " \
+                     "transactions...", transactions)
+        return nodes_are_caught_up(nodes, genesis_file, transactions, did=did,
+                                   seed=seed, wallet_name=wallet_name,
+                                   wallet_key=wallet_key, pool=pool,
+                                   ssh_config_file=ssh_config_file)
+    return True
+
+
 def unblocked_nodes_are_caught_up(genesis_file: str,
     transactions: Union[str,int] = None,
     pause_before_synced_check: Union[str,int] = None, best_effort: bool = True,
     did: str = DEFAULT_CHAOS_DID, seed: str = DEFAULT_CHAOS_SEED,
     wallet_name: str = DEFAULT_CHAOS_WALLET_NAME,
     wallet_key: str = DEFAULT_CHAOS_WALLET_KEY, pool: str = DEFAULT_CHAOS_POOL,
-    ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE) -> bool:
+    ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE,
+    catchup_deadline: Union[str,int] = None) -> bool:
     """
     Check if unblocked nodes have completed catchup.
 
@@ -599,7 +1220,7 @@ def unblocked_nodes_are_caught_up(genesis_file: str,
         Optional. (Default: None)
     :type transactions: Union[str,int]
     :param pause_before_synced_check: Seconds to pause before checking if a node
-        is synced.
+        is synced. Ignored if catchup_deadline is given.
         Optional. (Default: None)
     :type pause_before_synced_check: Union[str,int]
     :param best_effort: Check if unblocked nodes are caught up without failing.
@@ -632,6 +1253,12 @@ def unblocked_nodes_are_caught_up(genesis_file: str,
         file.
         Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SSH_CONFIG_FILE)
     :type ssh_config_file: str
+    :param catchup_deadline: Instead of pausing, track catchup (see
+        chaosindy.probes.catchup.track_catchup) until the nodes are synced or
+        catchup_deadline seconds pass, then check the number of transactions
+        (if given).
+        Optional. (Default: None)
+    :type catchup_deadline: Union[str,int]
     :return: bool
     """
     # TODO: Use the traffic shaper tool Kelly is using.
@@ -653,7 +1280,13 @@ def unblocked_nodes_are_caught_up(genesis_file: str,
         else:
             raise e
 
-    selected = blocked_ports.keys()
+    selected = list(blocked_ports.keys())
+
+    if catchup_deadline:
+        return _nodes_are_caught_up_by_deadline(selected, genesis_file,
+            transactions, catchup_deadline, did=did, seed=seed,
+            wallet_name=wallet_name, wallet_key=wallet_key, pool=pool,
+            ssh_config_file=ssh_config_file)
 
     # Only check if resurrected nodes are caught up if both a pause and number
     # of transactions are given.
@@ -678,7 +1311,8 @@ def unblock_node_port_random(genesis_file: str,
     did: str = DEFAULT_CHAOS_DID, seed: str = DEFAULT_CHAOS_SEED,
     wallet_name: str = DEFAULT_CHAOS_WALLET_NAME,
     wallet_key: str = DEFAULT_CHAOS_WALLET_KEY, pool: str = DEFAULT_CHAOS_POOL,
-    ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE) -> bool:
+    ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE,
+    catchup_deadline: Union[str,int] = None) -> bool:
     """
     Unblock nodes randomly selected by calling block_node_port_random
 
@@ -705,7 +1339,7 @@ def unblock_node_port_random(genesis_file: str,
         Optional. (Default: None)
     :type transactions: Union[str,int]
     :param pause_before_synced_check: Seconds to pause before checking if a node
-        is synced.
+        is synced. Ignored if catchup_deadline is given.
         Optional. (Default: None)
     :type pause_before_synced_check: Union[str,int]
     :param best_effort: Attempt to unblock ports blocked when calling
@@ -740,6 +1374,12 @@ def unblock_node_port_random(genesis_file: str,
         file.
         Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SSH_CONFIG_FILE)
     :type ssh_config_file: str
+    :param catchup_deadline: Instead of pausing, track catchup (see
+        chaosindy.probes.catchup.track_catchup) until the nodes are synced or
+        catchup_deadline seconds pass, then check the number of transactions
+        (if given).
+        Optional. (Default: None)
+    :type catchup_deadline: Union[str,int]
     :return: bool
     """
 
@@ -787,6 +1427,12 @@ def unblock_node_port_random(genesis_file: str,
     if not best_effort and unblocked < len(selected):
         return False
 
+    if catchup_deadline:
+        return _nodes_are_caught_up_by_deadline(list(selected), genesis_file,
+            transactions, catchup_deadline, did=did, seed=seed,
+            wallet_name=wallet_name, wallet_key=wallet_key, pool=pool,
+            ssh_config_file=ssh_config_file)
+
     # Only check if resurrected nodes are caught up if both a pause and number
     # of transactions are given.
     if pause_before_synced_check and transactions:
@@ -797,14 +1443,16 @@ def unblock_node_port_random(genesis_file: str,
         sleep(int(pause_before_synced_check))
         logger.debug("Checking if unblocked nodes are synced and report %s " \
                      "transactions...", transactions)
-        return unblocked_nodes_are_caught_up(genesis_file, transactions, did,
-                                             seed, wallet_name, wallet_key,
-                                             pool, ssh_config_file)
+        return nodes_are_caught_up(list(selected), genesis_file, transactions,
+                                   did=did, seed=seed, wallet_name=wallet_name,
+                                   wallet_key=wallet_key, pool=pool,
+                                   ssh_config_file=ssh_config_file)
     return True
 
 
 def kill_random_nodes(genesis_file: str, count = Union[str,int],
-    ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE) -> bool:
+    ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE,
+    parallel: Union[str,bool] = False) -> bool:
     """
     Randomly select and kill the indy-node process on a given number of nodes.
 
@@ -868,17 +1516,27 @@ def kill_random_nodes(genesis_file: str, count = Union[str,int],
         file.
         Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SSH_CONFIG_FILE)
     :type ssh_config_file: str
+    :param parallel: Kill all selected nodes at once? See
+        stop_services_parallel.
+        Optional. (Default: False)
+    :type parallel: Union[str,bool]
     :return: bool
     """
     selected = get_random_nodes(genesis_file, count)
     tried_to_kill = 0
     are_dead = 0
     number_of_aliases = len(selected)
-    for node in selected:
-        logger.debug("node alias to kill: %s", node)
-        if stop_by_node_name(node, ssh_config_file):
-            are_dead += 1
-        tried_to_kill += 1
+    if str(parallel).lower() in true_list:
+        stopped = stop_services_parallel(selected,
+                                         ssh_config_file=ssh_config_file)
+        are_dead = list(stopped.values()).count(True)
+        tried_to_kill = len(stopped)
+    else:
+        for node in selected:
+            logger.debug("node alias to kill: %s", node)
+            if stop_by_node_name(node, ssh_config_file):
+                are_dead += 1
+            tried_to_kill += 1
 
     logger.debug("are_dead: %s -- count: %s -- tried_to_kill: %s -- " \
                  "len-aliases: %s", are_dead, count, tried_to_kill,
@@ -901,7 +1559,9 @@ def resurrect_random_nodes(genesis_file: str,
     did: str = DEFAULT_CHAOS_DID, seed: str = DEFAULT_CHAOS_SEED,
     wallet_name: str = DEFAULT_CHAOS_WALLET_NAME,
     wallet_key: str = DEFAULT_CHAOS_WALLET_KEY, pool: str = DEFAULT_CHAOS_POOL,
-    ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE) -> bool:
+    ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE,
+    parallel: Union[str,bool] = False,
+    catchup_deadline: Union[str,int] = None) -> bool:
     """
     Start the indy-node process on nodes that were killed by calling
     kill_random_nodes.
@@ -931,7 +1591,7 @@ def resurrect_random_nodes(genesis_file: str,
         Optional. (Default: None)
     :type transactions: Union[str,int]
     :param pause_before_synced_check: Seconds to pause before checking if a node
-        is synced.
+        is synced. Ignored if catchup_deadline is given.
         Optional. (Default: None)
     :type pause_before_synced_check: Union[str,int]
     :param best_effort: Attempt to unblock ports blocked when calling
@@ -966,6 +1626,15 @@ def resurrect_random_nodes(genesis_file: str,
         file.
         Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SSH_CONFIG_FILE)
     :type ssh_config_file: str
+    :param parallel: Start all nodes at once? See start_services_parallel.
+        Optional. (Default: False)
+    :type parallel: Union[str,bool]
+    :param catchup_deadline: Instead of pausing, track catchup (see
+        chaosindy.probes.catchup.track_catchup) until the nodes are synced or
+        catchup_deadline seconds pass, then check the number of transactions
+        (if given).
+        Optional. (Default: None)
+    :type catchup_deadline: Union[str,int]
     :return: bool
     """
     # This function assumes that kill_random_nodes has been called and a
@@ -990,17 +1659,32 @@ def resurrect_random_nodes(genesis_file: str,
     # experiment's method or rollback segments and write it back to
     # nodes_random in the experiement's temp directory
     still_killed_nodes = []
-    for node in selected:
-        logger.debug("node alias to resurrect: %s", node)
+    if str(parallel).lower() in true_list:
         try:
-            if start_by_node_name(node, ssh_config_file):
+            started = start_services_parallel(selected,
+                                              ssh_config_file=ssh_config_file)
+        except Exception as e:
+            if not best_effort:
+                raise e
+            started = {}
+        for node in selected:
+            if started.get(node, False):
                 resurrected += 1
             else:
                 still_killed_nodes.append(node)
-        except Exception as e:
-            if best_effort:
-                pass
-        tried_to_resurrect += 1
+            tried_to_resurrect += 1
+    else:
+        for node in selected:
+            logger.debug("node alias to resurrect: %s", node)
+            try:
+                if start_by_node_name(node, ssh_config_file):
+                    resurrected += 1
+                else:
+                    still_killed_nodes.append(node)
+            except Exception as e:
+                if best_effort:
+                    pass
+            tried_to_resurrect += 1
 
     logger.debug("resurrected: %s -- tried_to_resurrect: %s -- len-aliases: %s",
                  resurrected, tried_to_resurrect, len(selected))
@@ -1013,6 +1697,12 @@ def resurrect_random_nodes(genesis_file: str,
     with open(join(output_dir, "nodes_random"), "w") as f:
         f.write(json.dumps(still_killed_nodes))
 
+    if catchup_deadline:
+        return _nodes_are_caught_up_by_deadline(selected, genesis_file,
+            transactions, catchup_deadline, did=did, seed=seed,
+            wallet_name=wallet_name, wallet_key=wallet_key, pool=pool,
+            ssh_config_file=ssh_config_file)
+
     # Only check if resurrected nodes are caught up if both a pause and number
     # of transactions are given.
     if pause_before_synced_check and transactions:
@@ -1039,6 +1729,11 @@ def nodes_are_caught_up(nodes: List[str], genesis_file: str,
     """
     Check if nodes resurrected by calling resurrect_random_nodes are caught up.
 
+    A node is caught up if its domain ledger is synced with the expected number
+    of transactions added during catchup and, on every ledger, it is neither
+    lagging, divergent nor missing the ledger when compared with all other
+    nodes (see chaosindy.probes.catchup.get_ledger_consistency).
+
     State file "nodes_random" located in the chaos temp dir (see
     get_chaos_temp_dir for details) is shared with the following functions
     kill_random_nodes
@@ -1092,40 +1787,41 @@ def nodes_are_caught_up(nodes: List[str], genesis_file: str,
     :type ssh_config_file: str
     :return: bool
     """
-    # TODO: add support for all ledgers, not just domain ledger.
-    #
     # This function assumes that kill_random_nodes has been called and a
     # "nodes_random" file has been created in a temporary directory
     # created using rules defined by get_chaos_temp_dir()
-    # 1. Get validator info from all nodes
-    get_validator_info(genesis_file, did=did, seed=seed,
-                       wallet_name=wallet_name, wallet_key=wallet_key,
-                       pool=pool, ssh_config_file=ssh_config_file)
-    output_dir = get_chaos_temp_dir()
+    # 1. Get validator info from all nodes and compare every ledger across
+    #    them
+    consistency = get_ledger_consistency(genesis_file, did=did, seed=seed,
+                                         wallet_name=wallet_name,
+                                         wallet_key=wallet_key, pool=pool,
+                                         ssh_config_file=ssh_config_file)
+    # The snapshot get_ledger_consistency collected
+    snapshot = ValidatorInfoSnapshot.latest(genesis_file)
+
+    not_consistent = {}
+    for ledger, report in consistency['ledgers'].items():
+        for state in ['lagging', 'divergent', 'missing']:
+            for alias in report[state]:
+                if alias in nodes:
+                    not_consistent.setdefault(alias, []).append(
+                        "{} on ledger {}".format(state, ledger))
+    for alias, states in not_consistent.items():
+        logger.error("Node %s failed to catchup. It is %s", alias,
+                     ", ".join(states))
 
     matching = []
     not_matching = {}
     for alias in nodes:
         logger.debug("Checking if node %s has %s catchup transactions", alias,
                      transactions)
-        validator_info = join(output_dir, "{}-validator-info".format(alias))
         try:
-            with open(validator_info, 'r') as f:
-                node_info = json.load(f)
-
-            # Get the number of transactions added during catchup
-            txns_in_catchup = None
             # Get the catchup status
-            catchup_status = None
-            if 'data' in node_info:
-                # Shorten things to less than 80 characters per line
-                data_node_info = node_info['data']['Node_info']
-                catchup_status = data_node_info['Catchup_status']
-                txns_in_catchup = catchup_status['Number_txns_in_catchup']
-            else:
-                # Shorten things to less than 80 characters per line
-                catchup_status = node_info['Node_info']['Catchup_status']
-                txns_in_catchup = catchup_status['Number_txns_in_catchup']
+            catchup_status = snapshot.catchup_status(alias)
+            if catchup_status is None:
+                raise FileNotFoundError(alias)
+            # Get the number of transactions added during catchup
+            txns_in_catchup = catchup_status['Number_txns_in_catchup']
             # Get the number of catchup transactions
             catchup_transactions = txns_in_catchup['1']
             # Get the domain ledger status
@@ -1164,6 +1860,9 @@ def nodes_are_caught_up(nodes: List[str], genesis_file: str,
                         catchup_transactions)
         return False
 
+    if not_consistent:
+        return False
+
     return True
 
 
@@ -1191,7 +1890,8 @@ def ensure_nodes_up(genesis_file: str, count = Union[str,int],
     aliases = get_aliases(genesis_file)
     logger.debug(aliases)
 
-    executor = FabricExecutor(ssh_config_file=expanduser(ssh_config_file))
+    executor = FabricExecutor(ssh_config_file=expanduser(ssh_config_file),
+                              persistent=True)
 
     # 2. Start 'count' nodes. It is okay to count a node if the service is
     #    already alive/started
@@ -1681,16 +2381,19 @@ def stop_by_strategy(genesis_file: str, alias: str, stop_strategy: int,
             ssh_config_file=ssh_config_file)
         operation = "stop"
     elif stop_strategy == StopStrategy.PORT.value:
-        with open("{}/{}-validator-info".format(output_dir, alias), 'r') as vif:
-            validator_info = json.load(vif)
-            node_info = validator_info['Node_info']
-            # "stop/block" inbound messages from clients and other nodes
-            details['client_port'] = str(node_info['Client_port'])
-            details['node_port'] = str(node_info['Node_port'])
-            succeeded = block_port_by_node_name(alias, details['client_port'],
-                ssh_config_file=ssh_config_file)
-            succeeded = block_port_by_node_name(alias, details['node_port'],
-                ssh_config_file=ssh_config_file)
+        validator_info = ValidatorInfoSnapshot.latest(genesis_file).get(alias)
+        if validator_info is None:
+            logger.error("No validator info for %s. Can not determine which " \
+                         "ports to block.", alias)
+            return False
+        node_info = validator_info['Node_info']
+        # "stop/block" inbound messages from clients and other nodes
+        details['client_port'] = str(node_info['Client_port'])
+        details['node_port'] = str(node_info['Node_port'])
+        succeeded = block_port_by_node_name(alias, details['client_port'],
+            ssh_config_file=ssh_config_file)
+        succeeded = block_port_by_node_name(alias, details['node_port'],
+            ssh_config_file=ssh_config_file)
         operation = "block"
     elif stop_strategy == StopStrategy.DEMOTE.value:
         # "stop" participating in consensus
@@ -1789,9 +2492,397 @@ def start_by_strategy(genesis_file: str, alias: str,
     return True
 
 
+def stop_nodes_by_strategy(genesis_file: str, aliases: List[str],
+    stop_strategy: int,
+    timeout: Union[str,int] = DEFAULT_CHAOS_LEDGER_TRANSACTION_TIMEOUT,
+    ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE
+    ) -> Dict[str,Union[bool,Dict[str,str]]]:
+    """
+    Remove a list of nodes from participating in consensus, concurrently. The
+    parallel equivalent of calling stop_by_strategy on each node.
+
+    SERVICE and KILL run the same commands on every node at once (see
+    stop_services_parallel). PORT blocks each node's own client and node ports
+    on every node at once. DEMOTE sends a ledger transaction per node, so nodes
+    are demoted one at a time.
+
+    Call start_nodes_by_strategy to undo what is done by
+    stop_nodes_by_strategy.
+
+    :param genesis_file: The relative or absolute path to a genesis file.
+        Required.
+    :type genesis_file: str
+    :param aliases: The nodes to stop.
+        Required.
+    :type aliases: List[str]
+    :param stop_strategy: A stop strategy defined by the
+        chaosindy.common.StopStrategy enum. See stop_by_strategy.
+    :type stop_strategy: int
+    :param timeout: How long to perform the operation before timing out.
+        Optional.
+        (Default: chaosindy.common.DEFAULT_CHAOS_LEDGER_TRANSACTION_TIMEOUT)
+    :type timeout: Union[str,int]
+    :param ssh_config_file: The relative or absolute path to the SSH config
+        file.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SSH_CONFIG_FILE)
+    :type ssh_config_file: str
+    :return: Dict[str,Union[bool,Dict[str,str]]] - For each alias, False if it
+        failed. Otherwise, the dictionary stop_by_strategy would have returned
+        for it.
+    """
+    stop_strategy = int(stop_strategy)
+    results = dict([(alias, False) for alias in aliases])
+    if not aliases:
+        return results
+    if stop_strategy in (StopStrategy.SERVICE.value, StopStrategy.KILL.value):
+        gracefully = stop_strategy == StopStrategy.SERVICE.value
+        stopped = stop_services_parallel(aliases, gracefully=gracefully,
+                                         force=True, timeout=timeout,
+                                         ssh_config_file=ssh_config_file)
+        for alias in aliases:
+            if stopped[alias]:
+                results[alias] = {"stop_strategy": stop_strategy}
+    elif stop_strategy == StopStrategy.PORT.value:
+        snapshot = ValidatorInfoSnapshot.latest(genesis_file)
+        commands = {}
+        for alias in aliases:
+            validator_info = snapshot.get(alias)
+            if validator_info is None:
+                logger.error("No validator info for %s. Can not determine " \
+                             "which ports to block.", alias)
+                continue
+            node_info = validator_info['Node_info']
+            results[alias] = {
+                "stop_strategy": stop_strategy,
+                "client_port": str(node_info['Client_port']),
+                "node_port": str(node_info['Node_port'])
+            }
+            # sudo only applies to the first command of a list, so run the
+            # list in a shell
+            commands[alias] = "bash -c {}".format(shlex.quote(
+                "iptables {} && iptables {}".format(
+                    block_port_rule(results[alias]['client_port']),
+                    block_port_rule(results[alias]['node_port']))))
+        if commands:
+            executor = get_parallel_executor(
+                ssh_config_file=expanduser(ssh_config_file))
+            result = executor.execute(list(commands.keys()), commands,
+                                      as_sudo=True, timeout=int(timeout))
+            for alias in commands:
+                if result[alias]['return_code'] != 0:
+                    results[alias] = False
+    elif stop_strategy == StopStrategy.DEMOTE.value:
+        for alias in aliases:
+            results[alias] = stop_by_strategy(genesis_file, alias,
+                stop_strategy, timeout=timeout,
+                ssh_config_file=ssh_config_file)
+    else:
+        message = """Stop strategy %s not supported or not found."""
+        logger.error(message, stop_strategy)
+        return results
+
+    for alias in aliases:
+        if not results[alias]:
+            logger.error("Failed to stop %s using stop strategy %s", alias,
+                         stop_strategy)
+    return results
+
+
+def start_nodes_by_strategy(genesis_file: str,
+    stopped_nodes: Dict[str,Dict[str,str]],
+    timeout: Union[str,int] = DEFAULT_CHAOS_LEDGER_TRANSACTION_TIMEOUT,
+    ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE) -> Dict[str,bool]:
+    """
+    Restore a list of nodes to participating in consensus, concurrently. The
+    parallel equivalent of calling start_by_strategy on each node, intended to
+    undo what was done by stop_nodes_by_strategy (or stop_by_strategy).
+
+    :param genesis_file: The relative or absolute path to a genesis file.
+        Required.
+    :type genesis_file: str
+    :param stopped_nodes: The details returned by stop_by_strategy (or
+        stop_nodes_by_strategy) for each node, keyed by alias.
+        Required.
+    :type stopped_nodes: Dict[str,Dict[str,str]]
+    :param timeout: How long to perform the operation before timing out.
+        Optional.
+        (Default: chaosindy.common.DEFAULT_CHAOS_LEDGER_TRANSACTION_TIMEOUT)
+    :type timeout: Union[str,int]
+    :param ssh_config_file: The relative or absolute path to the SSH config
+        file.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SSH_CONFIG_FILE)
+    :type ssh_config_file: str
+    :return: Dict[str,bool] - Whether each node was started, keyed by alias
+    """
+    results = dict([(alias, False) for alias in stopped_nodes])
+    to_start = []
+    to_unblock = {}
+    for alias, details in stopped_nodes.items():
+        stop_strategy = details.get('stop_strategy', None)
+        if (stop_strategy == StopStrategy.SERVICE.value
+            or stop_strategy == StopStrategy.KILL.value):
+            to_start.append(alias)
+        elif stop_strategy == StopStrategy.PORT.value:
+            client_port = details.get('client_port', None)
+            node_port = details.get('node_port', None)
+            if not (client_port and node_port):
+                logger.error("Missing client_port and/or node_port for %s",
+                             alias)
+                continue
+            # Unblock both ports even if the first fails
+            to_unblock[alias] = "bash -c {}".format(shlex.quote(
+                "iptables {}; rc=$?; iptables {} && exit $rc".format(
+                    unblock_port_rule(client_port),
+                    unblock_port_rule(node_port))))
+        elif stop_strategy == StopStrategy.DEMOTE.value:
+            results[alias] = start_by_strategy(genesis_file, alias, details,
+                timeout=timeout, ssh_config_file=ssh_config_file)
+        else:
+            message = """Stop strategy %s not supported or not found."""
+            logger.error(message, stop_strategy)
+
+    results.update(start_services_parallel(to_start,
+                                           ssh_config_file=ssh_config_file))
+    if to_unblock:
+        executor = get_parallel_executor(
+            ssh_config_file=expanduser(ssh_config_file))
+        result = executor.execute(list(to_unblock.keys()), to_unblock,
+                                  as_sudo=True, timeout=int(timeout))
+        for alias in to_unblock:
+            results[alias] = result[alias]['return_code'] == 0
+            if not results[alias]:
+                logger.error("Failed to unblock %s", alias)
+    return results
+
+
+def _synchronized_fault_command(release_at: float, fault: str) -> str:
+    """
+    Build a command that sleeps until release_at (according to the remote
+    host's clock), prints the time at which it was released and then runs
+    fault. sudo only applies to the first command of a list, so the list is
+    run in a shell.
+    """
+    script = "python3 -c 'import time; time.sleep(max(0, {:.6f} - " \
+             "time.time()))' && date +%s.%N && {}".format(release_at, fault)
+    return "bash -c {}".format(shlex.quote(script))
+
+
+def stop_nodes_synchronized(genesis_file: str, aliases: Union[str,List[str]],
+    stop_strategy: int = StopStrategy.SERVICE.value,
+    release_delay: Union[str,int,float] = \
+        DEFAULT_CHAOS_SYNCHRONIZED_FAULT_RELEASE_DELAY,
+    timeout: Union[str,int] = DEFAULT_CHAOS_LEDGER_TRANSACTION_TIMEOUT,
+    ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE
+    ) -> Dict[str,Union[int,float,Dict]]:
+    """
+    Remove a list of nodes from participating in consensus at the same
+    instant. stop_nodes_by_strategy stops nodes concurrently, but each node is
+    stopped as soon as its command arrives, so connection setup spreads the
+    faults over seconds. To stop nodes within a fraction of a second of each
+    other:
+
+    1. A connection to every node is opened (and kept open) ahead of time.
+    2. A release time release_delay seconds in the future is chosen.
+    3. Every node is sent its fault and waits for the release time before
+       injecting it.
+
+    Each node reports when (according to its own clock) its fault was
+    injected. The skew is the time between the first and last injection. This
+    assumes node clocks are synchronized (i.e. NTP). The offset of each node's
+    clock from this client's, measured when connections are opened, is
+    reported so the assumption can be checked.
+
+    SERVICE, KILL and PORT faults are released on the nodes. A DEMOTE is a
+    ledger transaction sent from this client. A single ledger session is
+    opened and every NODE transaction is built and signed ahead of time (see
+    chaosindy.ledger_interaction.submit_requests_at). At the release time all
+    of them are submitted at once. Each injection time is when its
+    transaction was submitted.
+
+    Writes the result to a 'synchronized_fault' file and the nodes that were
+    stopped to the 'stopped_nodes' file in the chaos temp dir, so they can be
+    restored with start_stopped_nodes.
+
+    :param genesis_file: The relative or absolute path to a genesis file.
+        Required.
+    :type genesis_file: str
+    :param aliases: The nodes to stop. A list or a JSON list of node aliases.
+        Required.
+    :type aliases: Union[str,List[str]]
+    :param stop_strategy: A stop strategy defined by the
+        chaosindy.common.StopStrategy enum. See stop_by_strategy.
+        Optional. (Default: chaosindy.common.StopStrategy.SERVICE.value)
+    :type stop_strategy: int
+    :param release_delay: Seconds from now at which faults are released. Must
+        be long enough to send every node its fault.
+        Optional.
+        (Default:
+         chaosindy.common.DEFAULT_CHAOS_SYNCHRONIZED_FAULT_RELEASE_DELAY)
+    :type release_delay: Union[str,int,float]
+    :param timeout: How long to perform the operation (after the release)
+        before timing out.
+        Optional.
+        (Default: chaosindy.common.DEFAULT_CHAOS_LEDGER_TRANSACTION_TIMEOUT)
+    :type timeout: Union[str,int]
+    :param ssh_config_file: The relative or absolute path to the SSH config
+        file.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SSH_CONFIG_FILE)
+    :type ssh_config_file: str
+    :return: Dict[str,Union[int,float,Dict]] - The stop_strategy, release_at,
+        injected_at (the time each fault was injected, keyed by alias), skew
+        (seconds between the first and last injection, None if fewer than two
+        faults were injected), clock_offsets (keyed by alias) and
+        stopped_nodes (in the form written by stop_n_nodes).
+    """
+    if isinstance(aliases, str):
+        aliases = json.loads(aliases)
+    stop_strategy = int(stop_strategy)
+    release_delay = float(release_delay)
+    timeout = int(timeout)
+    results = {
+        "stop_strategy": stop_strategy,
+        "release_at": None,
+        "injected_at": {},
+        "skew": None,
+        "clock_offsets": {},
+        "stopped_nodes": {}
+    }
+    stopped_nodes = results['stopped_nodes']
+    injected_at = results['injected_at']
+
+    if stop_strategy == StopStrategy.DEMOTE.value:
+        loop = asyncio.get_event_loop()
+        # Open the ledger session, and build and sign every NODE transaction,
+        # before choosing the release time, so only submitting them counts
+        # against release_delay and the skew.
+        session = loop.run_until_complete(get_session(
+            genesis_file=genesis_file))
+        requests = {}
+        for alias in aliases:
+            node_genesis_json = get_info_by_node_name(genesis_file, alias,
+                                                      path="txn.data")
+            requests[alias] = loop.run_until_complete(
+                build_node_services_request(session, alias,
+                                            node_genesis_json['dest'], []))
+
+        results['release_at'] = time.time() + release_delay
+        submitted = loop.run_until_complete(submit_requests_at(session,
+            requests, results['release_at'], timeout=timeout))
+        for alias in aliases:
+            injected_at[alias] = submitted[alias]['submitted_at']
+            if submitted[alias]['success']:
+                stopped_nodes[alias] = {"stop_strategy": stop_strategy}
+            else:
+                logger.error("Failed to demote %s", alias)
+    elif stop_strategy in (StopStrategy.SERVICE.value, StopStrategy.KILL.value,
+                           StopStrategy.PORT.value):
+        commands = {}
+        for alias in aliases:
+            if stop_strategy == StopStrategy.SERVICE.value:
+                fault = "systemctl stop indy-node indy-node-control"
+                details = {"stop_strategy": stop_strategy}
+            elif stop_strategy == StopStrategy.KILL.value:
+                fault = "kill -9 $(ps -ef |" \
+                        " grep 'start_indy_node\|start_node_control_tool' |" \
+                        " grep -v grep | awk '{print $2}' | xargs)"
+                details = {"stop_strategy": stop_strategy}
+            else:
+                validator_info = ValidatorInfoSnapshot.latest(
+                    genesis_file).get(alias)
+                if validator_info is None:
+                    logger.error("No validator info for %s. Can not " \
+                                 "determine which ports to block.", alias)
+                    continue
+                node_info = validator_info['Node_info']
+                details = {
+                    "stop_strategy": stop_strategy,
+                    "client_port": str(node_info['Client_port']),
+                    "node_port": str(node_info['Node_port'])
+                }
+                fault = "iptables {} && iptables {}".format(
+                    block_port_rule(details['client_port']),
+                    block_port_rule(details['node_port']))
+            commands[alias] = details, fault
+        targets = [alias for alias in aliases if alias in commands]
+
+        executor = AsyncRemoteExecutor(
+            ssh_config_file=expanduser(ssh_config_file),
+            max_concurrency=max(len(targets), 1))
+        try:
+            loop = asyncio.get_event_loop()
+            # Open a connection to every node before choosing the release
+            # time, so connection setup does not count against release_delay.
+            sent_at = time.time()
+            result = loop.run_until_complete(
+                executor.execute(targets, "date +%s.%N", timeout=timeout))
+            received_at = time.time()
+            for alias in targets:
+                if result[alias]['return_code'] == 0:
+                    results['clock_offsets'][alias] = \
+                        float(result[alias]['stdout'].strip()) - \
+                        (sent_at + received_at) / 2
+                else:
+                    logger.error("Failed to connect to %s: %s", alias,
+                                 result[alias]['stderr'])
+
+            results['release_at'] = time.time() + release_delay
+            actions = dict([(alias, _synchronized_fault_command(
+                results['release_at'], commands[alias][1]))
+                for alias in targets])
+            result = loop.run_until_complete(
+                executor.execute(targets, actions, as_sudo=True,
+                                 timeout=int(release_delay) + 1 + timeout))
+        finally:
+            executor.close()
+
+        for alias in targets:
+            lines = result[alias]['stdout'].splitlines()
+            if lines:
+                try:
+                    injected_at[alias] = float(lines[0])
+                except ValueError:
+                    pass
+            if result[alias]['return_code'] == 0:
+                stopped_nodes[alias] = commands[alias][0]
+            else:
+                logger.error("Failed to inject fault on %s: %s", alias,
+                             result[alias]['stderr'])
+
+        if stop_strategy == StopStrategy.SERVICE.value:
+            # systemctl stop is not guaranteed to have stopped all processes.
+            # See stop_by_node_name.
+            stopped = wait_for_services_stopped(list(stopped_nodes.keys()),
+                                                ssh_config_file=ssh_config_file)
+            for alias in stopped:
+                if not stopped[alias]:
+                    logger.error("%s is still running", alias)
+    else:
+        message = """Stop strategy %s not supported or not found."""
+        logger.error(message, stop_strategy)
+        return results
+
+    if len(injected_at) > 1:
+        results['skew'] = max(injected_at.values()) - min(injected_at.values())
+    logger.info("Injected faults on %s with a skew of %s seconds",
+                list(injected_at.keys()), results['skew'])
+    for alias in aliases:
+        if alias not in stopped_nodes:
+            logger.error("Failed to stop %s using stop strategy %s", alias,
+                         stop_strategy)
+
+    output_dir = get_chaos_temp_dir()
+    with open(join(output_dir, "synchronized_fault"), 'w') as f:
+        f.write(json.dumps(results))
+    with open(join(output_dir, "stopped_nodes"), 'w') as f:
+        f.write(json.dumps({'stopped_nodes': stopped_nodes}))
+    return results
+
+
 def get_primary(genesis_file: str,
                 ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE,
-                compile_stats: bool = True) -> str:
+                compile_stats: bool = True,
+                source: int = DEFAULT_CHAOS_VALIDATOR_INFO_SOURCE,
+                quorum: Union[str,int] = None) -> str:
     """
     Return the alias of the primary from the 'primaries' state file.
 
@@ -1812,12 +2903,22 @@ def get_primary(genesis_file: str,
         is not written correctly.
         Optional. (Default: True)
     :type compile_stats: bool
+    :param source: The source of validator info used to compile stats. See
+        chaosindy.probes.validator_info.get_validator_info.
+        Optional. (Default: chaosindy.common.DEFAULT_VALIDATOR_INFO_SOURCE)
+    :type source: int
+    :param quorum: How many nodes must agree on the primary before compiling
+        stats. Either a number or 'n-f'. See
+        chaosindy.probes.validator_info.detect_primary.
+        Optional. (Default: None - wait on all nodes)
+    :type quorum: Union[str,int]
     :return: str
 
     """
     primary = None
     if compile_stats:
-        detect_primary(genesis_file, ssh_config_file=ssh_config_file)
+        detect_primary(genesis_file, ssh_config_file=ssh_config_file,
+                       source=source, quorum=quorum)
 
     output_dir = get_chaos_temp_dir()
     with open("{}/primaries".format(output_dir), 'r') as primaries:
@@ -1876,21 +2977,56 @@ def stop_primary(genesis_file: str,
             return False
 
         stopped_primary['stopped_primary_details'] = details
+        stopped_primary['stopped_at'] = time.time()
         with open("{}/stopped_primary".format(output_dir), 'w') as f:
             f.write(json.dumps(stopped_primary))
         return True
     return False
 
 
+def _agreed_primary(snapshot: ValidatorInfoSnapshot,
+                    quorum: int) -> Union[str,None]:
+    """
+    Return the primary at least quorum nodes in snapshot agree on, if any.
+    """
+    primaries = {}
+    for alias in snapshot.aliases:
+        primary = snapshot.primary(alias)
+        if primary and primary != 'Unknown':
+            primaries[primary] = primaries.get(primary, 0) + 1
+    for primary, count in primaries.items():
+        if count >= quorum:
+            return primary
+    return None
+
+
 def wait_for_view_change(genesis_file: str,
     previous_primary: str = None, max_checks_for_primary: int = 6,
     sleep_between_checks: int = 10,
-    ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE) -> int:
+    ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE,
+    source: int = DEFAULT_CHAOS_VALIDATOR_INFO_SOURCE,
+    quorum: Union[str,int] = 'n-f',
+    deadline: Union[str,int,float] = None,
+    initial_interval: Union[str,int,float] = \
+        DEFAULT_CHAOS_VIEW_CHANGE_INITIAL_INTERVAL,
+    backoff: Union[str,int,float] = DEFAULT_CHAOS_VIEW_CHANGE_BACKOFF,
+    started_at: float = None) -> Dict[str,Union[bool,int,float,str]]:
     """
     Wait until view change is complete.
 
-    When the primary is not the previous_primary a viewchange has progressed far
-    enough to achive consensus.
+    When quorum nodes agree on a primary that is not the previous_primary a
+    viewchange has progressed far enough to achive consensus.
+
+    Validator info is polled quickly at first (every initial_interval
+    seconds), backing off exponentially up to sleep_between_checks seconds
+    between polls, until a view change is detected or the deadline passes. With
+    ValidatorInfoSource.NODE, each poll stops waiting on the remaining nodes as
+    soon as quorum nodes agree on a primary. The primary is read from the
+    validator info collected; the pool ledger is not traversed on each poll.
+
+    The result is also written to a 'view_change' file in the chaos temp dir,
+    and the 'current_primary' in the 'primaries' file (see get_primary) is
+    updated when a view change is detected.
 
     :param genesis_file: The relative or absolute path to a genesis file.
         Required.
@@ -1898,11 +3034,11 @@ def wait_for_view_change(genesis_file: str,
     :param previous_primary: The previous known primary
         Optional. (Default: None)
     :type previous_primary: str
-    :param max_checks_for_primary: How many times to poll validator info for
-        primary information.
+    :param max_checks_for_primary: Used with sleep_between_checks to compute
+        the deadline when no deadline is given.
         Optional. (Default: 6)
     :type max_checks_for_primary: int
-    :param sleep_between_checks: How long (in seconds) to pause/sleep between
+    :param sleep_between_checks: The maximum time (in seconds) to sleep between
         polling validator info.
         Optional. (Default: 10)
     :type sleep_between_checks: int
@@ -1910,26 +3046,108 @@ def wait_for_view_change(genesis_file: str,
         file.
         Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SSH_CONFIG_FILE)
     :type ssh_config_file: str
-    :return: int
-    """
-    tries = 0
-    while tries < max_checks_for_primary:
-        current_primary = get_primary(genesis_file,
-                                      ssh_config_file=ssh_config_file,
-                                      compile_stats=True)
-        logger.debug("Check %d of %d if view change is complete", tries,
-                     max_checks_for_primary)
+    :param source: The source of validator info. See
+        chaosindy.probes.validator_info.get_validator_info.
+        Optional. (Default: chaosindy.common.DEFAULT_VALIDATOR_INFO_SOURCE)
+    :type source: int
+    :param quorum: How many nodes must agree on the new primary. Either a
+        number or 'n-f'. None means all nodes.
+        Optional. (Default: 'n-f')
+    :type quorum: Union[str,int]
+    :param deadline: How long (in seconds) to wait for a view change.
+        Optional.
+        (Default: max_checks_for_primary * sleep_between_checks)
+    :type deadline: Union[str,int,float]
+    :param initial_interval: How long (in seconds) to sleep after the first
+        poll.
+        Optional.
+        (Default: chaosindy.common.DEFAULT_CHAOS_VIEW_CHANGE_INITIAL_INTERVAL)
+    :type initial_interval: Union[str,int,float]
+    :param backoff: The factor the time between polls grows by after each
+        poll.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_VIEW_CHANGE_BACKOFF)
+    :type backoff: Union[str,int,float]
+    :param started_at: When the primary was lost. The view change duration is
+        measured from this time.
+        Optional. (Default: now)
+    :type started_at: float
+    :return: Dict[str,Union[bool,int,float,str]] - view_changed,
+        previous_primary, primary (the new primary or None), started_at,
+        first_new_primary_at (the first poll on which any node reported a new
+        primary), agreed_at (the poll on which quorum nodes agreed on it),
+        duration (agreed_at - started_at, or None) and checks (the number of
+        polls).
+    """
+    if started_at is None:
+        started_at = time.time()
+    if deadline is None:
+        deadline = int(max_checks_for_primary) * int(sleep_between_checks)
+    deadline_at = started_at + float(deadline)
+    interval = float(initial_interval)
+    max_interval = float(sleep_between_checks)
+    backoff = float(backoff)
+    required = get_quorum(quorum, len(get_aliases(genesis_file)))
+    predicate = primary_quorum(required) \
+        if int(source) == ValidatorInfoSource.NODE.value else None
+    result = {
+        "view_changed": False,
+        "previous_primary": previous_primary,
+        "primary": None,
+        "started_at": started_at,
+        "first_new_primary_at": None,
+        "agreed_at": None,
+        "duration": None,
+        "checks": 0
+    }
+    while True:
+        snapshot = ValidatorInfoSnapshot.collect(genesis_file, ttl=0,
+            ssh_config_file=ssh_config_file, source=source,
+            predicate=predicate)
+        polled_at = time.time()
+        result['checks'] += 1
+        if result['first_new_primary_at'] is None:
+            for alias in snapshot.aliases:
+                primary = snapshot.primary(alias)
+                if primary and primary not in ('Unknown', previous_primary):
+                    result['first_new_primary_at'] = polled_at
+                    break
+        current_primary = _agreed_primary(snapshot, required)
+        logger.debug("Check %d if view change is complete", result['checks'])
         logger.debug("Former primary: %s", previous_primary)
         logger.debug("Current primary: %s", current_primary)
         if current_primary and previous_primary != current_primary:
-            logger.debug("View change detected!")
-            break;
-        else:
-            logger.debug("View change not yet complete. Sleeping for {}" \
-                         " seconds...".format(sleep_between_checks))
-            sleep(sleep_between_checks)
-            tries += 1
-    return tries
+            result['view_changed'] = True
+            result['primary'] = current_primary
+            result['agreed_at'] = polled_at
+            result['duration'] = polled_at - started_at
+            logger.debug("View change detected after %f seconds!",
+                         result['duration'])
+            break
+        remaining = deadline_at - time.time()
+        if remaining <= 0:
+            logger.debug("No view change detected after %s seconds", deadline)
+            break
+        pause = min(interval, max_interval, remaining)
+        logger.debug("View change not yet complete. Sleeping for %f " \
+                     "seconds...", pause)
+        sleep(pause)
+        interval *= backoff
+
+    output_dir = get_chaos_temp_dir()
+    with open(join(output_dir, "view_change"), 'w') as f:
+        f.write(json.dumps(result))
+    if result['view_changed']:
+        primaries_file = join(output_dir, "primaries")
+        primary_dict = {}
+        try:
+            with open(primaries_file, 'r') as f:
+                primary_dict = json.load(f)
+        except (IOError, ValueError):
+            pass
+        primary_dict['current_primary'] = result['primary']
+        with open(primaries_file, 'w') as f:
+            f.write(json.dumps(primary_dict))
+    return result
 
 
 def start_stopped_primary_after_view_change(genesis_file: str,
@@ -1994,15 +3212,16 @@ def start_stopped_primary_after_view_change(genesis_file: str,
         return False
     stopped_primary = stopped_primary_dict.get('stopped_primary', None)
     if stopped_primary:
-        tries = wait_for_view_change(genesis_file=genesis_file,
+        view_change = wait_for_view_change(genesis_file=genesis_file,
             previous_primary=stopped_primary,
             max_checks_for_primary=max_checks_for_primary,
             sleep_between_checks=sleep_between_checks,
-            ssh_config_file=ssh_config_file)
+            ssh_config_file=ssh_config_file,
+            started_at=stopped_primary_dict.get('stopped_at', None))
 
         # Only start stopped primary and backup primaries if a viewchange
         # completed.
-        if tries < max_checks_for_primary:
+        if view_change['view_changed']:
             # Start backup primaries?
             stopped_nodes = stopped_primary_dict.get(
                 'stopped_nodes', None)
@@ -2083,6 +3302,150 @@ def start_stopped_primary(genesis_file: str,
     return False
 
 
+def _distribution(values: List[float]) -> Dict[str,Union[float,None]]:
+    values = sorted(values)
+    return {
+        "min": values[0] if values else None,
+        "median": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "max": values[-1] if values else None
+    }
+
+
+def benchmark_view_change(genesis_file: str,
+    iterations: Union[str,int] = DEFAULT_CHAOS_VIEW_CHANGE_BENCHMARK_ITERATIONS,
+    stop_strategy: int = StopStrategy.SERVICE.value,
+    pause_between_iterations: Union[str,int] = \
+        DEFAULT_CHAOS_VIEW_CHANGE_BENCHMARK_PAUSE,
+    max_checks_for_primary: Union[str,int] = 6,
+    sleep_between_checks: Union[str,int] = 10,
+    report_file: str = None,
+    ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE) -> Dict:
+    """
+    Measure how long view changes take.
+
+    Runs stop_primary followed by start_stopped_primary_after_view_change
+    iterations times, pausing between iterations so the pool can settle. For
+    each iteration the following are timestamped:
+      - primary_lost_at: the primary was stopped (see stop_primary)
+      - first_new_primary_at: the first node reported a new primary
+      - agreed_at: n-f nodes agreed on the new primary
+    See wait_for_view_change.
+
+    The report contains each iteration and, for the time from primary loss to
+    the first report of a new primary (time_to_first_report) and to agreement
+    on it (time_to_agreement), the min, median, p95 and max of iterations
+    that completed a view change. It is written to a 'view-change-benchmark'
+    file in the chaos temp dir and to report_file, if given.
+
+    If no view change is detected in an iteration the stopped primary is
+    started anyway (see start_stopped_primary) and the iteration is counted
+    as failed.
+
+    :param genesis_file: The relative or absolute path to a genesis file.
+        Required.
+    :type genesis_file: str
+    :param iterations: How many view changes to measure.
+        Optional.
+        (Default:
+         chaosindy.common.DEFAULT_CHAOS_VIEW_CHANGE_BENCHMARK_ITERATIONS)
+    :type iterations: Union[str,int]
+    :param stop_strategy: How to stop the primary. A stop strategy defined by
+        the chaosindy.common.StopStrategy enum. See stop_by_strategy.
+        Optional. (Default: chaosindy.common.StopStrategy.SERVICE.value)
+    :type stop_strategy: int
+    :param pause_between_iterations: How long (in seconds) to wait after the
+        stopped primary is started before the next iteration.
+        Optional.
+        (Default: chaosindy.common.DEFAULT_CHAOS_VIEW_CHANGE_BENCHMARK_PAUSE)
+    :type pause_between_iterations: Union[str,int]
+    :param max_checks_for_primary: See wait_for_view_change.
+        Optional. (Default: 6)
+    :type max_checks_for_primary: Union[str,int]
+    :param sleep_between_checks: See wait_for_view_change.
+        Optional. (Default: 10)
+    :type sleep_between_checks: Union[str,int]
+    :param report_file: The relative or absolute path to a file to write the
+        report to.
+        Optional. (Default: None)
+    :type report_file: str
+    :param ssh_config_file: The relative or absolute path to the SSH config
+        file.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SSH_CONFIG_FILE)
+    :type ssh_config_file: str
+    :return: Dict - The report
+    """
+    iterations = int(iterations)
+    stop_strategy = int(stop_strategy)
+    output_dir = get_chaos_temp_dir()
+    runs = []
+    for iteration in range(iterations):
+        if iteration > 0:
+            sleep(int(pause_between_iterations))
+        logger.info("View change benchmark iteration %d of %d", iteration + 1,
+                    iterations)
+        run = {
+            "iteration": iteration + 1,
+            "view_changed": False
+        }
+        runs.append(run)
+        if not stop_primary(genesis_file, stop_strategy=stop_strategy,
+                            ssh_config_file=ssh_config_file):
+            logger.error("Failed to stop the primary. Ending benchmark.")
+            break
+        with open(join(output_dir, "stopped_primary"), 'r') as f:
+            stopped_primary = json.load(f)
+        run['previous_primary'] = stopped_primary['stopped_primary']
+        run['primary_lost_at'] = stopped_primary['stopped_at']
+
+        started = start_stopped_primary_after_view_change(genesis_file,
+            max_checks_for_primary=max_checks_for_primary,
+            sleep_between_checks=sleep_between_checks,
+            ssh_config_file=ssh_config_file)
+        with open(join(output_dir, "view_change"), 'r') as f:
+            view_change = json.load(f)
+        run['view_changed'] = view_change['view_changed']
+        run['primary'] = view_change['primary']
+        run['first_new_primary_at'] = view_change['first_new_primary_at']
+        run['agreed_at'] = view_change['agreed_at']
+        if run['view_changed']:
+            run['time_to_first_report'] = \
+                run['first_new_primary_at'] - run['primary_lost_at']
+            run['time_to_agreement'] = run['agreed_at'] - run['primary_lost_at']
+        else:
+            logger.error("No view change detected after stopping %s",
+                         run['previous_primary'])
+            started = start_stopped_primary(genesis_file,
+                                            ssh_config_file=ssh_config_file)
+        if not started:
+            logger.error("Failed to start %s. Ending benchmark.",
+                         run['previous_primary'])
+            break
+
+    completed = [run for run in runs if run['view_changed']]
+    report = {
+        "genesis_file": genesis_file,
+        "stop_strategy": stop_strategy,
+        "iterations": iterations,
+        "completed": len(completed),
+        "failed": len(runs) - len(completed),
+        "time_to_first_report": _distribution(
+            [run['time_to_first_report'] for run in completed]),
+        "time_to_agreement": _distribution(
+            [run['time_to_agreement'] for run in completed]),
+        "runs": runs
+    }
+    logger.info("View change time to agreement: %s",
+                report['time_to_agreement'])
+    report_files = [join(output_dir, "view-change-benchmark")]
+    if report_file:
+        report_files.append(expanduser(report_file))
+    for path in report_files:
+        with open(path, 'w') as f:
+            f.write(json.dumps(report, indent=2))
+    return report
+
+
 def stop_f_backup_primaries_before_primary(genesis_file: str,
     f: Union[str, int] = None, stop_strategy: int = StopStrategy.SERVICE.value,
     ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE) -> bool:
@@ -2140,12 +3503,11 @@ def stop_f_backup_primaries_before_primary(genesis_file: str,
                           ssh_config_file=ssh_config_file)
     if primary:
         output_dir = get_chaos_temp_dir()
-        with open("{}/{}-validator-info".format(output_dir, primary), 'r') as vif:
-            validator_info = json.load(vif)
+        snapshot = ValidatorInfoSnapshot.latest(genesis_file)
         # Stop up to f backup primaries
         # Set f if not defined
         if not f:
-            f = validator_info['Pool_info']['f_value']
+            f = snapshot.f_value(primary)
 
         backup_primaries = {}
         # No backup primaries are stopped when f == 1
@@ -2153,17 +3515,13 @@ def stop_f_backup_primaries_before_primary(genesis_file: str,
         if int(f) > 1:
             # Starting at 1 and iterating up to, but not inclding f ensures we
             # do not fall out of concensus by shutting down too many nodes.
-            node_info = validator_info['Node_info']
-            replica_status = node_info['Replicas_status']
             for i in range(1, f):
-                replica = replica_status["{}:{}".format(primary, i)]['Primary']
-                replica = replica.split(":")[0]
+                replica = snapshot.primary(primary, i)
                 details = stop_by_strategy(genesis_file, replica, stop_strategy,
                     ssh_config_file=ssh_config_file)
                 backup_primaries[replica] = details
         # Get the next expected primary
-        next_primary = replica_status["{}:{}".format(primary, i+1)]['Primary']
-        next_primary = next_primary.split(":")[0]
+        next_primary = snapshot.primary(primary, i+1)
 
         # Stop the primary
         primary_details = stop_by_strategy(genesis_file, primary, stop_strategy,
@@ -2173,7 +3531,8 @@ def stop_f_backup_primaries_before_primary(genesis_file: str,
             'stopped_primary': primary,
             'stopped_primary_details': primary_details,
             'stopped_nodes': backup_primaries,
-            'next_primary': next_primary
+            'next_primary': next_primary,
+            'stopped_at': time.time()
         }
         with open("{}/stopped_primary".format(output_dir), 'w') as sp:
             sp.write(json.dumps(primary_data))
@@ -2189,7 +3548,9 @@ def stop_n_nodes(genesis_file: str, number_of_nodes: Union[str, int] = 1,
     max_checks_for_primary: Union[str,int] = 6,
     sleep_between_checks: Union[str,int] = 10,
     stop_node_timeout: Union[str,int] = DEFAULT_CHAOS_LEDGER_TRANSACTION_TIMEOUT,
-    ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE) -> bool:
+    ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE,
+    parallel: Union[str,bool] = False,
+    synchronized: Union[str,bool] = False) -> bool:
     """
     Stop a least one or more nodes
 
@@ -2271,6 +3632,15 @@ def stop_n_nodes(genesis_file: str, number_of_nodes: Union[str, int] = 1,
         file.
         Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SSH_CONFIG_FILE)
     :type ssh_config_file: str
+    :param parallel: Stop the selected nodes concurrently? See
+        stop_nodes_by_strategy. Nodes that were stopped are recorded even if
+        others failed, so start_stopped_nodes can restore them.
+        Optional. (Default: False)
+    :type parallel: Union[str,bool]
+    :param synchronized: Stop the selected nodes at the same instant? See
+        stop_nodes_synchronized. Takes precedence over parallel.
+        Optional. (Default: False)
+    :type synchronized: Union[str,bool]
     :return: bool
     """
     # Variable substitution in chaostoolkit appears to only support strings.
@@ -2340,21 +3710,15 @@ def stop_n_nodes(genesis_file: str, number_of_nodes: Union[str, int] = 1,
 
     # Get replica information from the primary's validator info
     output_dir = get_chaos_temp_dir()
-    with open("{}/{}-validator-info".format(output_dir, primary), 'r') as vif:
-        validator_info = json.load(vif)
-    replica_count = validator_info['Node_info']['Count_of_replicas']
-    node_info = validator_info['Node_info']
-    replica_status = node_info['Replicas_status']
+    snapshot = ValidatorInfoSnapshot.latest(genesis_file)
+    replica_count = snapshot.replica_count(primary)
 
     # Extract the backup primaries
     backup_primaries = []
-    for key in replica_status.keys():
-        # Skip the primary. It already be added if include_primary is set to
-        # True.
-        if key.endswith(":0"):
-            continue
-        alias = replica_status[key]['Primary'].split(":")[0]
-        backup_primaries.append(alias)
+    for instance in range(1, replica_count):
+        # Skip the primary (instance 0). It already be added if
+        # include_primary is set to True.
+        backup_primaries.append(snapshot.primary(primary, instance))
 
     # Add backup primaries to node_selection in the order they are listed in
     # the genesis file.
@@ -2400,13 +3764,27 @@ def stop_n_nodes(genesis_file: str, number_of_nodes: Union[str, int] = 1,
     elif selection_strategy == SelectionStrategy.FORWARD.value:
         node_selection = node_selection[0:number_of_nodes]
 
-    for node in node_selection:
-        details = stop_by_strategy(genesis_file, node, stop_strategy,
-                                   timeout=stop_node_timeout,
-                                   ssh_config_file=ssh_config_file)
-        if not details:
-            return False
-        stopped_nodes[node] = details
+    if str(synchronized).lower() in true_list:
+        results = stop_nodes_synchronized(genesis_file, node_selection,
+                                          stop_strategy=stop_strategy,
+                                          timeout=stop_node_timeout,
+                                          ssh_config_file=ssh_config_file)
+        stopped_nodes = results['stopped_nodes']
+    elif str(parallel).lower() in true_list:
+        results = stop_nodes_by_strategy(genesis_file, node_selection,
+                                         stop_strategy,
+                                         timeout=stop_node_timeout,
+                                         ssh_config_file=ssh_config_file)
+        stopped_nodes = dict([(node, details) for (node, details)
+                              in results.items() if details])
+    else:
+        for node in node_selection:
+            details = stop_by_strategy(genesis_file, node, stop_strategy,
+                                       timeout=stop_node_timeout,
+                                       ssh_config_file=ssh_config_file)
+            if not details:
+                return False
+            stopped_nodes[node] = details
 
     data = {
         'stopped_nodes': stopped_nodes
@@ -2414,25 +3792,30 @@ def stop_n_nodes(genesis_file: str, number_of_nodes: Union[str, int] = 1,
     with open("{}/stopped_nodes".format(output_dir), 'w') as f:
         f.write(json.dumps(data))
 
+    if len(stopped_nodes) < len(node_selection):
+        return False
+
     if primary in stopped_nodes.keys():
         message = "Primary %s was included in list of demoted nodes. Wait for" \
                   " view change."
         logger.debug(message, primary)
-        tries = wait_for_view_change(genesis_file=genesis_file,
+        view_change = wait_for_view_change(genesis_file=genesis_file,
             previous_primary=primary,
             max_checks_for_primary=max_checks_for_primary,
             sleep_between_checks=sleep_between_checks,
             ssh_config_file=ssh_config_file)
-        if tries >= max_checks_for_primary:
+        if not view_change['view_changed']:
             message="No view change detected after approximately %d*%d seconds"
-            logger.debug(message, max_checks_for_primary, sleep_between_checks)
+            logger.debug(message, int(max_checks_for_primary),
+                         int(sleep_between_checks))
             return False
 
     return True
 
 
 def start_stopped_nodes(genesis_file: str,
-    ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE) -> bool:
+    ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE,
+    parallel: Union[str,bool] = False) -> bool:
     """
     Start the nodes stopped by a call to stop_n_nodes.
 
@@ -2464,6 +3847,10 @@ def start_stopped_nodes(genesis_file: str,
         file.
         Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SSH_CONFIG_FILE)
     :type ssh_config_file: str
+    :param parallel: Start the stopped nodes concurrently? See
+        start_nodes_by_strategy.
+        Optional. (Default: False)
+    :type parallel: Union[str,bool]
     :return: bool
     """
     output_dir = get_chaos_temp_dir()
@@ -2486,6 +3873,11 @@ def start_stopped_nodes(genesis_file: str,
         logger.error(message.format(stopped_nodes_file))
         return False
 
+    if str(parallel).lower() in true_list:
+        results = start_nodes_by_strategy(genesis_file, stopped_nodes,
+                                          ssh_config_file=ssh_config_file)
+        return all(results.values())
+
     for backup_primary in stopped_nodes.keys():
         succeeded = start_by_strategy(genesis_file, backup_primary,
             stopped_nodes[backup_primary],
@@ -2588,10 +3980,8 @@ def decrease_f_to(genesis_file: str, f_value: Union[str,int] = 1,
 
     current_f_value = None
     if primary:
-        output_dir = get_chaos_temp_dir()
-        with open("{}/{}-validator-info".format(output_dir, primary), 'r') as vif:
-            validator_info = json.load(vif)
-        current_f_value = validator_info['Pool_info']['f_value']
+        snapshot = ValidatorInfoSnapshot.latest(genesis_file)
+        current_f_value = snapshot.f_value(primary)
     else:
         logger.error("Could not get primary.")
         return False
@@ -2662,6 +4052,7 @@ def decrease_f_to(genesis_file: str, f_value: Union[str,int] = 1,
         demoted_node_detail[node] = details
     # Write the demoted-nodes state file. This file will be used by the revert_f
     # function below.
+    output_dir = get_chaos_temp_dir()
     with open("{}/demoted-nodes".format(output_dir), 'w') as f:
         f.write(json.dumps(demoted_node_detail))
 
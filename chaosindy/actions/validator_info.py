@@ -1,6 +1,6 @@
 import json
 from chaosindy.common import (
-    get_chaos_temp_dir,
+    get_aliases, get_chaos_temp_dir,
     DEFAULT_CHAOS_SSH_CONFIG_FILE,
     true_list, false_list
 )
@@ -45,11 +45,8 @@ def delete_validator_info(genesis_file: str = None, cleanup: str = "True",
     if genesis_file:
         logger.debug("genesis_file: %s ssh_config_file: %s", genesis_file,
                      ssh_config_file)
-        # 1. Open genesis_file and load all aliases into an array
-        aliases = []
-        with open(expanduser(genesis_file), 'r') as genesisfile:
-            for line in genesisfile:
-                aliases.append(json.loads(line)['data']['alias'])
+        # 1. Load all aliases from genesis_file
+        aliases = get_aliases(genesis_file)
         logger.debug(str(aliases))
 
         # 2. Delete validator info collected by the experiment
@@ -61,7 +58,11 @@ def delete_validator_info(genesis_file: str = None, cleanup: str = "True",
         for alias in aliases:
             logger.debug("alias to delete validator info: %s", alias)
             tried_to_delete += 1
-            remove(join(output_dir, "{}-validator-info".format(alias)))
+            try:
+                remove(join(output_dir, "{}-validator-info".format(alias)))
+            except FileNotFoundError:
+                # The node did not return validator info
+                pass
             are_deleted += 1
 
         logger.debug("are_deleted: %s count: %i tried_to_delete: %i " \
@@ -1,23 +1,26 @@
 import json
 import shutil
 import tempfile
+import threading
 from enum import Enum
 from logzero import logger
-from os import makedirs
-from os.path import expanduser
+from os import environ, getpid, makedirs, stat
+from os.path import expanduser, isdir
 from psutil import Process, NoSuchProcess
 
 from typing import Union, Dict, List
 
-def get_chaos_temp_dir() -> str:
-    """
-    Create a temporary directory unique to each chaos experiment.
+# The chaos temp dir resolved by get_chaos_temp_dir, and the pid it was
+# resolved in
+_chaos_temp_dir = None
+_chaos_temp_dir_pid = None
 
-    The temporary directory will take the form <tempdir>/chaosindy.<pid>
-    The <pid> will be the chaos processe's pid iff it exists. Otherwise, the
-    subprocess's pid.
+def _find_chaos_pid() -> int:
+    """
+    Walk up the process tree to find the 'chaos' process.
 
-    :return: str
+    :return: int - The chaos processe's pid iff it exists. Otherwise, the
+        current processe's pid.
     """
     # Get current process info
     myp = Process()
@@ -42,10 +45,43 @@ def get_chaos_temp_dir() -> str:
             break
 
     logger.debug("subprocess pid: %s chaos pid: %s", subprocess_pid, chaos_pid)
-    tempdir_path = "{}/chaosindy.{}".format(tempfile.gettempdir(), chaos_pid)
-    tempdir = makedirs(tempdir_path, exist_ok=True)
-    logger.debug("tempdir: %s", tempdir_path)
-    return tempdir_path
+    return chaos_pid
+
+def get_chaos_temp_dir() -> str:
+    """
+    Create a temporary directory unique to each chaos experiment.
+
+    The temporary directory will take the form <tempdir>/chaosindy.<pid>
+    The <pid> will be the chaos processe's pid iff it exists. Otherwise, the
+    subprocess's pid.
+
+    The directory is resolved once per process. Set the CHAOS_TEMP_DIR
+    environment variable to use a given directory instead (i.e. a runner that
+    knows its job directory). Set CHAOS_TEMP_DIR_TMPFS to one of the values in
+    true_list to use DEFAULT_CHAOS_TMPFS_DIR (/dev/shm) as <tempdir>, keeping
+    the many small state files in memory. <tempdir> falls back to the system
+    temp dir if DEFAULT_CHAOS_TMPFS_DIR does not exist.
+
+    :return: str
+    """
+    global _chaos_temp_dir, _chaos_temp_dir_pid
+    if _chaos_temp_dir is None or _chaos_temp_dir_pid != getpid():
+        tempdir_path = environ.get('CHAOS_TEMP_DIR', None)
+        if not tempdir_path:
+            base_dir = tempfile.gettempdir()
+            tmpfs = environ.get('CHAOS_TEMP_DIR_TMPFS', '')
+            if tmpfs.lower() in true_list:
+                if isdir(DEFAULT_CHAOS_TMPFS_DIR):
+                    base_dir = DEFAULT_CHAOS_TMPFS_DIR
+                else:
+                    logger.info("%s does not exist. Defaulting to %s",
+                                DEFAULT_CHAOS_TMPFS_DIR, base_dir)
+            tempdir_path = "{}/chaosindy.{}".format(base_dir, _find_chaos_pid())
+        _chaos_temp_dir = expanduser(tempdir_path)
+        _chaos_temp_dir_pid = getpid()
+    # Recreate the directory if it has been removed (remove_chaos_temp_dir)
+    makedirs(_chaos_temp_dir, exist_ok=True)
+    return _chaos_temp_dir
 
 def remove_chaos_temp_dir(cleanup: bool = True) -> bool:
     """
@@ -70,6 +106,102 @@ def remove_chaos_temp_dir(cleanup: bool = True) -> bool:
         logger.info("Skip removal of %s.", temp_dir)
     return True
 
+class GenesisIndex(object):
+    """
+    An index of the node transactions in a pool genesis transaction file.
+
+    The file is parsed once. Use GenesisIndex.load to get the index for a
+    genesis file; it is reused until the file's modification time or size
+    changes. Treat the returned transactions as read-only.
+    """
+    _cache = {}
+    _lock = threading.Lock()
+
+    def __init__(self, genesis_file: str):
+        """
+        :param genesis_file: The relative or absolute path to a genesis
+            transaction file.
+            Required.
+        :type genesis_file: str
+        """
+        self.genesis_file = expanduser(genesis_file)
+        # Genesis transactions in the order they are defined (top down)
+        self.txns = []
+        # Aliases in the order they are defined (top down)
+        self.aliases = []
+        self._txn_by_alias = {}
+        with open(self.genesis_file, 'r') as genesisfile:
+            for line in genesisfile:
+                if not line.strip():
+                    continue
+                line_json = json.loads(line)
+                alias = line_json['txn']['data']['data']['alias']
+                self.txns.append(line_json)
+                self.aliases.append(alias)
+                # The first transaction for an alias wins
+                self._txn_by_alias.setdefault(alias, line_json)
+
+    @classmethod
+    def load(cls, genesis_file: str) -> 'GenesisIndex':
+        """
+        Return the index for a genesis file, parsing it only if it is new or
+        has changed since it was last parsed.
+
+        :param genesis_file: The relative or absolute path to a genesis
+            transaction file.
+            Required.
+        :type genesis_file: str
+        :return: GenesisIndex
+        """
+        path = expanduser(genesis_file)
+        file_stat = stat(path)
+        key = (file_stat.st_mtime_ns, file_stat.st_size)
+        with cls._lock:
+            cached = cls._cache.get(path, None)
+        if cached and cached[0] == key:
+            return cached[1]
+        index = cls(path)
+        with cls._lock:
+            cls._cache[path] = (key, index)
+        return index
+
+    def get_txn(self, alias: str) -> Union[Dict,None]:
+        """
+        Return an alias' complete genesis transaction.
+
+        :param alias: The node name/alias
+            Required.
+        :type alias: str
+        :return: Union[Dict,None]
+        """
+        return self._txn_by_alias.get(alias, None)
+
+    def get_node(self, alias: str) -> Union[Dict,None]:
+        """
+        Return an alias' node record (txn.data.data). It includes the node and
+        client IPs and ports, and the services.
+
+        :param alias: The node name/alias
+            Required.
+        :type alias: str
+        :return: Union[Dict,None]
+        """
+        txn = self.get_txn(alias)
+        return txn['txn']['data']['data'] if txn else None
+
+    def get_dest(self, alias: str) -> Union[str,None]:
+        """
+        Return an alias' dest DID (txn.data.dest).
+
+        :param alias: The node name/alias
+            Required.
+        :type alias: str
+        :return: Union[str,None]
+        """
+        txn = self.get_txn(alias)
+        return txn['txn']['data']['dest'] if txn else None
+
+
 def get_info_by_node_name(genesis_file: str, node: str,
                           path: str = None) -> Union[Dict,None]:
     """
@@ -88,21 +220,17 @@ def get_info_by_node_name(genesis_file: str, node: str,
     :type node: str
     :return: Union[Dict,None]
     """
-    # Open genesis_file and return a node's info based on a json path
-    with open(expanduser(genesis_file), 'r') as genesisfile:
-        for line in genesisfile:
-            line_json = json.loads(line)
-            alias = line_json['txn']['data']['data']['alias']
-            if (alias == node):
-                if not path:
-                    return line_json['txn']['data']['data']
-                else:
-                    filters = path.split(".")
-                    return_json = line_json
-                    for f in filters:
-                        return_json = return_json[f]
-                    return return_json
-    return None
+    # Return a node's info based on a json path
+    line_json = GenesisIndex.load(genesis_file).get_txn(node)
+    if line_json is None:
+        return None
+    if not path:
+        return line_json['txn']['data']['data']
+    filters = path.split(".")
+    return_json = line_json
+    for f in filters:
+        return_json = return_json[f]
+    return return_json
 
 
 def get_aliases(genesis_file: str) -> List[str]:
@@ -119,25 +247,37 @@ def get_aliases(genesis_file: str) -> List[str]:
 
     :return: List[str]
     """
-    aliases = []
-    # Open genesis_file and load all aliases into an array
-    with open(expanduser(genesis_file), 'r') as genesisfile:
-        for line in genesisfile:
-            line_json = json.loads(line)
-            alias = line_json['txn']['data']['data']['alias']
-            aliases.append(alias)
-    return aliases
+    return list(GenesisIndex.load(genesis_file).aliases)
+
+
+def get_quorum(quorum: Union[str,int], node_count: int) -> int:
+    """
+    Return how many of node_count nodes make up the given quorum.
+
+    :param quorum: A number of nodes, or 'n-f' for the number of nodes needed
+        to reach consensus in a pool of node_count nodes, where
+        f = (node_count - 1) // 3. None means all nodes.
+        Required.
+    :type quorum: Union[str,int]
+    :param node_count: The number of nodes in the pool.
+        Required.
+    :type node_count: int
+
+    :return: int
+    """
+    if quorum is None:
+        return int(node_count)
+    if str(quorum).strip().lower() == 'n-f':
+        return int(node_count) - ((int(node_count) - 1) // 3)
+    return min(int(quorum), int(node_count))
 
 class ValidatorInfoSource(Enum):
     """
     All possible sources (methods of retrieval) of validator info
-
-    The SDK option is not yet implemented. It is stubbed out in hopes that the
-    option will be available soon.
     """
     NODE = 1 # validator-info script executed on each node
     CLI = 2 # `ledger get-validator-info` executed via indy-cli
-    SDK = 3 # Not Yet Implemented - Use Indy SDK to get validator info
+    SDK = 3 # GET_VALIDATOR_INFO request sent using the Indy SDK
 
     @classmethod
     def has_value(cls, value):
@@ -191,22 +331,56 @@ false_list = [
    'false', '0', 'f', 'n', 'no'
 ]
 
+# The name of each ledger's transaction count in validator info metrics, keyed
+# by ledger id
+LEDGER_METRIC_NAMES = {
+    '0': 'pool',
+    '1': 'ledger',
+    '2': 'config',
+    '3': 'audit'
+}
+
 
 # Chaos defaults
 # Please keep defaults in lexically acending order by name
+DEFAULT_CHAOS_ASYNC_EXECUTOR_CONCURRENCY=100
+DEFAULT_CHAOS_BACKGROUND_LOAD_MAX_DURATION=3600
+DEFAULT_CHAOS_BACKGROUND_LOAD_RATE=10
+DEFAULT_CHAOS_CATCHUP_DEADLINE=300
+DEFAULT_CHAOS_CATCHUP_SAMPLE_INTERVAL=1
 DEFAULT_CHAOS_DID="V4SGRU86Z58d6TV7PBUe6f"
 DEFAULT_CHAOS_GET_VALIDATOR_INFO_TIMEOUT=20
 DEFAULT_CHAOS_LEDGER_TRANSACTION_TIMEOUT=20
+DEFAULT_CHAOS_LOAD_ARRIVAL="poisson"
+DEFAULT_CHAOS_LOAD_CONCURRENCY=10
 DEFAULT_CHAOS_LOAD_COMMAND="sudo python3 /home/ubuntu/indy-node/scripts/performance/perf_load/perf_processes.py -l 1 -c 2 -n 10 -b 200 -k nym -g /home/ubuntu/pool_transactions_genesis --load_time 10"
+DEFAULT_CHAOS_LOAD_DURATION=10
+DEFAULT_CHAOS_LOAD_FLEET_START_DELAY=15
+DEFAULT_CHAOS_LOAD_TIME_REPLY_COLUMN="time_reply"
+DEFAULT_CHAOS_LOAD_TIME_SENT_COLUMN="time_sent"
 DEFAULT_CHAOS_LOAD_TIMEOUT=60
+DEFAULT_CHAOS_MODE_SAMPLE_INTERVAL=1
+DEFAULT_CHAOS_MODE_TRACKER_MAX_DURATION=3600
 DEFAULT_CHAOS_NODE_SERVICES="VALIDATOR"
 DEFAULT_CHAOS_PAUSE=60
 DEFAULT_CHAOS_POOL="chaosindy"
+DEFAULT_CHAOS_POOL_LEDGER_CACHE_DIR="~/.chaosindy/pool-ledger"
+DEFAULT_CHAOS_POOL_LEDGER_WINDOW=32
 DEFAULT_CHAOS_TRUSTEE_SEED="000000000000000000000000Trustee1"
 DEFAULT_CHAOS_STEWARD_SEED="000000000000000000000000Steward1"
 DEFAULT_CHAOS_SEED=DEFAULT_CHAOS_TRUSTEE_SEED
 DEFAULT_CHAOS_SSH_CONFIG_FILE="~/.ssh/config"
+DEFAULT_CHAOS_SSH_CONNECTION_HEALTH_CHECK_INTERVAL=30
+DEFAULT_CHAOS_SSH_CONNECTION_MAX_IDLE=300
+DEFAULT_CHAOS_STOP_DEADLINE=60
+DEFAULT_CHAOS_SYNCHRONIZED_FAULT_RELEASE_DELAY=3
+DEFAULT_CHAOS_TMPFS_DIR="/dev/shm"
 DEFAULT_CHAOS_VALIDATOR_INFO_SOURCE=ValidatorInfoSource.CLI.value
+DEFAULT_CHAOS_VALIDATOR_INFO_TTL=0
+DEFAULT_CHAOS_VIEW_CHANGE_BACKOFF=2
+DEFAULT_CHAOS_VIEW_CHANGE_BENCHMARK_ITERATIONS=5
+DEFAULT_CHAOS_VIEW_CHANGE_BENCHMARK_PAUSE=30
+DEFAULT_CHAOS_VIEW_CHANGE_INITIAL_INTERVAL=0.5
 DEFAULT_CHAOS_WALLET_NAME="chaosindy"
 DEFAULT_CHAOS_MY_WALLET_NAME=DEFAULT_CHAOS_WALLET_NAME
 DEFAULT_CHAOS_THEIR_WALLET_NAME="their_"+DEFAULT_CHAOS_WALLET_NAME
@@ -1,23 +1,238 @@
 import abc
+import asyncio
+import atexit
+import functools
 import os
 import json
-
+import threading
+import time
+
+from chaosindy.common import (
+    DEFAULT_CHAOS_ASYNC_EXECUTOR_CONCURRENCY,
+    DEFAULT_CHAOS_SSH_CONNECTION_HEALTH_CHECK_INTERVAL,
+    DEFAULT_CHAOS_SSH_CONNECTION_MAX_IDLE
+)
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 
 from logzero import logger
-from multiprocessing import Pool, Process, Queue, Manager, cpu_count
+from multiprocessing import Process, Queue, Manager, cpu_count
 from queue import Empty
 
 from fabric import Connection, Config
 from paramiko import AuthenticationException
 
-from typing import List
+from typing import Callable, Dict, Iterator, List, Tuple, Union
 
 Result = namedtuple('Result', ['return_code', 'stdout', 'stderr'])
 ParallelResult = namedtuple('ParallelResult',
                             ['host', 'return_code', 'stdout', 'stderr'])
 
 
+class ConnectionPool(object):
+    """
+    A keyed pool of authenticated Python Fabric connections.
+
+    Connections are keyed by (host, user, identity file) and kept open between
+    remote executions so that repeated commands against the same host (i.e.
+    polling a node until a service stops) only pay for one SSH handshake.
+
+    Idle connections are closed after max_idle seconds. A connection that has
+    been idle longer than health_check_interval seconds is probed (SSH ignore
+    message) before it is handed out again. Connections that fail the health
+    check are closed and replaced.
+
+    Connections are never shared across processes. A forked child process
+    discards (without closing) the connections inherited from its parent.
+    """
+    def __init__(self,
+        max_idle: int = DEFAULT_CHAOS_SSH_CONNECTION_MAX_IDLE,
+        health_check_interval: int = DEFAULT_CHAOS_SSH_CONNECTION_HEALTH_CHECK_INTERVAL):
+        self._max_idle = max_idle
+        self._health_check_interval = health_check_interval
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        # key -> list of (connection, last_used) tuples
+        self._idle = {}
+
+    @staticmethod
+    def key(host: str, user: str = None,
+            connect_kwargs: dict = None) -> Tuple[str, str, str]:
+        """
+        Compute the pool key for a host, user and set of connect kwargs.
+
+        :param host: hostname
+        :type host: str
+        :param user: The user the connection authenticates as.
+        :type user: str
+        :param connect_kwargs: paramiko connect kwargs. Only key_filename
+            (identity file) is considered.
+        :type connect_kwargs: dict
+        :return: Tuple[str, str, str]
+        """
+        identity_file = None
+        if connect_kwargs:
+            identity_file = connect_kwargs.get('key_filename', None)
+        return (host, user, identity_file)
+
+    def _check_pid(self):
+        # Sockets inherited from a parent process belong to the parent. Drop
+        # them without sending an SSH disconnect.
+        if os.getpid() != self._pid:
+            self._pid = os.getpid()
+            self._idle = {}
+            self._lock = threading.Lock()
+
+    @staticmethod
+    def _close(connection):
+        try:
+            connection.close()
+        except Exception as e:
+            logger.debug("Failed to close connection to %s: %s",
+                         connection.host, e)
+
+    def _is_healthy(self, connection, last_used: float) -> bool:
+        if not connection.is_connected:
+            return False
+        if time.time() - last_used < self._health_check_interval:
+            return True
+        try:
+            connection.transport.send_ignore()
+        except Exception as e:
+            logger.debug("Health check failed for %s: %s", connection.host, e)
+            return False
+        return connection.is_connected
+
+    def evict_idle(self):
+        """
+        Close every connection that has been idle longer than max_idle seconds.
+        """
+        self._check_pid()
+        now = time.time()
+        expired = []
+        with self._lock:
+            for key, entries in self._idle.items():
+                keep = []
+                for connection, last_used in entries:
+                    if now - last_used > self._max_idle:
+                        expired.append(connection)
+                    else:
+                        keep.append((connection, last_used))
+                self._idle[key] = keep
+        for connection in expired:
+            logger.debug("Evicting idle connection to %s", connection.host)
+            self._close(connection)
+
+    def acquire(self, host: str, config: Config, user: str = None,
+                connect_kwargs: dict = None, connect_timeout: int = None):
+        """
+        Get an open connection to a host, creating one if none are idle.
+
+        The caller owns the connection until it is handed back by calling
+        release.
+
+        :param host: hostname
+        :type host: str
+        :param config: Fabric configuration (i.e. runtime SSH config file)
+        :type config: fabric.Config
+        :param user: The user to connect as.
+        :type user: str
+        :param connect_kwargs: paramiko connect kwargs
+        :type connect_kwargs: dict
+        :param connect_timeout: Seconds to wait for a new connection to open.
+        :type connect_timeout: int
+        :return: fabric.Connection
+        """
+        key = ConnectionPool.key(host, user=user, connect_kwargs=connect_kwargs)
+        self.evict_idle()
+        while True:
+            with self._lock:
+                entries = self._idle.get(key, [])
+                entry = entries.pop() if entries else None
+            if entry is None:
+                break
+            connection, last_used = entry
+            if self._is_healthy(connection, last_used):
+                logger.debug("Reusing connection to %s", host)
+                return connection
+            self._close(connection)
+
+        logger.debug("Opening new connection to %s", host)
+        connection = Connection(host, config=config, user=user,
+                                connect_timeout=connect_timeout,
+                                connect_kwargs=connect_kwargs)
+        connection.open()
+        return connection
+
+    def release(self, connection, user: str = None,
+                connect_kwargs: dict = None):
+        """
+        Hand a connection acquired by calling acquire back to the pool.
+
+        Connections that are no longer connected are closed instead.
+
+        :param connection: A connection returned by acquire.
+        :type connection: fabric.Connection
+        :param user: The user given to acquire.
+        :type user: str
+        :param connect_kwargs: The connect_kwargs given to acquire.
+        :type connect_kwargs: dict
+        """
+        self._check_pid()
+        if not connection.is_connected:
+            self._close(connection)
+            return
+        key = ConnectionPool.key(connection.host, user=user,
+                                 connect_kwargs=connect_kwargs)
+        with self._lock:
+            self._idle.setdefault(key, []).append((connection, time.time()))
+
+    @contextmanager
+    def connection(self, host: str, config: Config, user: str = None,
+                   connect_kwargs: dict = None, connect_timeout: int = None):
+        """
+        Context manager wrapping acquire and release.
+        """
+        connection = self.acquire(host, config, user=user,
+                                  connect_kwargs=connect_kwargs,
+                                  connect_timeout=connect_timeout)
+        try:
+            yield connection
+        finally:
+            self.release(connection, user=user, connect_kwargs=connect_kwargs)
+
+    def close_all(self):
+        """
+        Close every idle connection in the pool.
+        """
+        self._check_pid()
+        with self._lock:
+            entries = [entry for key in self._idle for entry in self._idle[key]]
+            self._idle = {}
+        for connection, last_used in entries:
+            self._close(connection)
+
+
+_connection_pool = None
+
+
+def get_connection_pool() -> ConnectionPool:
+    """
+    Get the process-wide ConnectionPool.
+
+    The pool is created on first use and all of its connections are closed
+    when the interpreter exits.
+
+    :return: ConnectionPool
+    """
+    global _connection_pool
+    if _connection_pool is None:
+        _connection_pool = ConnectionPool()
+        atexit.register(_connection_pool.close_all)
+    return _connection_pool
+
+
 class RemoteExecutor(object):
     """
     RemoteExecutor base class
@@ -74,11 +289,23 @@ class FabricExecutor(RemoteExecutor):
             q.put(Result(rtn.return_code, rtn.stdout, rtn.stderr))
 
     config = None
+    persistent = False
 
-    def __init__(self, ssh_config_file=None):
+    def __init__(self, ssh_config_file=None, persistent=False):
+        """
+        :param ssh_config_file: The path to the SSH config file.
+            Optional. (Default: None)
+        :type ssh_config_file: str
+        :param persistent: Keep connections open between executions? When True,
+            commands are executed in-process on a connection borrowed from the
+            process-wide ConnectionPool (see get_connection_pool). When False, a
+            new subprocess and connection is created for every execution.
+            Optional. (Default: False)
+        :type persistent: bool
+        """
         self.config = FabricExecutor._create_config(
             ssh_config_file=ssh_config_file)
-        pass
+        self.persistent = persistent
 
     # @staticmethod
     # def _format_rtn(rtn):
@@ -117,11 +344,29 @@ class FabricExecutor(RemoteExecutor):
 
         return connect_kwargs
 
+    def _persistent_execute_on_host(self, host, action, user=None,
+                                    as_sudo=False, connect_kwargs=None,
+                                    timeout=10):
+        pool = get_connection_pool()
+        with pool.connection(host, self.config, user=user,
+                             connect_kwargs=connect_kwargs,
+                             connect_timeout=timeout) as c:
+            if as_sudo:
+                rtn = c.sudo(action, hide=True, timeout=timeout)
+            else:
+                rtn = c.run(action, hide=True, timeout=timeout)
+        return Result(rtn.return_code, rtn.stdout, rtn.stderr)
+
     def _execute_on_host(self, host: str, action: str, user: str = None,
                          as_sudo: bool = False, identity_file: str = None,
                          timeout: int = 10) -> str:
         connect_kwargs = self._collect_connect_kwargs(identity_file)
 
+        if self.persistent:
+            return self._persistent_execute_on_host(host, action, user=user,
+                as_sudo=as_sudo, connect_kwargs=connect_kwargs,
+                timeout=timeout)
+
         p = None
         q = Queue()
         try:
@@ -158,6 +403,11 @@ class ParallelFabricExecutor(FabricExecutor):
     The number of processes that may run in parallel is limited by a client's
     CPU count. The more cpu cores, the more remote execution can happen in
     parallel.
+
+    Worker processes are started once, when the executor is created, and are
+    reused by every call to execute until shutdown is called. Use
+    get_parallel_executor to share one executor per SSH config file across
+    actions and probes instead of creating a new one for each call.
     """
     _processes = []
     config = None
@@ -181,7 +431,15 @@ class ParallelFabricExecutor(FabricExecutor):
     #    self.f.write("{}: {}".format(os.getpid(), text))
     #    self.flush_print()
 
-    def __init__(self, ssh_config_file=None):
+    def __init__(self, ssh_config_file=None, processes=None):
+        """
+        :param ssh_config_file: The path to the SSH config file.
+            Optional. (Default: None)
+        :type ssh_config_file: str
+        :param processes: The number of worker processes.
+            Optional. (Default: multiprocessing.cpu_count())
+        :type processes: int
+        """
         super().__init__(ssh_config_file=ssh_config_file)
 
         # DEBUG PARALLELIZATION
@@ -194,33 +452,32 @@ class ParallelFabricExecutor(FabricExecutor):
         self._tasks = self._manager.Queue()
         # A queue to hold task results
         self._results = self._manager.Queue()
-        # Create process pool with as many processes as there are cores
-        # TODO: make self._cpu_count configurable
+        # Each call to execute is a batch. Results from previous batches are
+        # discarded.
+        self._batch = 0
+        # The batch workers are currently serving. Tasks from any other batch
+        # are skipped.
+        self._active_batch = self._manager.Value('i', 0)
+        # Only one batch may be in flight at a time
+        self._lock = threading.Lock()
+        self._is_shutdown = False
+        # Create as many worker processes as there are cores
         #       On a 2 cpu client _cpu_count was set to 4 and 5 with nominal
         #       decrease (improvement) in runtime.
-        self._cpu_count = cpu_count()
-        self._pool = Pool(processes=self._cpu_count)
+        self._cpu_count = int(processes) if processes else cpu_count()
         self._processes = []
         # Initiate the worker processes
         for i in range(self._cpu_count):
-            # Set process name
-            process_name = 'P%i' % i
-            # Create the process, and connect it to the worker function
-            new_process = Process(target=self.do_work,
-                                  args=(process_name,self._tasks,self._results))
-            # Add new process to the list of processes
-            self._processes.append(new_process)
-            # Start the process
-            new_process.start()
+            # Set process name and add the new process to the list of
+            # processes
+            self._processes.append(self._start_worker('P%i' % i))
         # Worker processes are now waiting for work
 
         # DEBUG PARALLELIZATION
         #self.print("Leaving __init__\n")
 
     def __del__(self):
-        for process in self._processes:
-            # Gracefully send SIGTERM to each process
-            process.terminate()
+        self.shutdown()
 
         # DEBUG PARALLELIZATION
         #if self.f:
@@ -228,144 +485,518 @@ class ParallelFabricExecutor(FabricExecutor):
         #    self.close_print()
         #    self.f = None
 
-    def _parallel_execute_on_host(self, results, host, action, config,
-                                  user=None, as_sudo=False, **kwargs):
+    def _start_worker(self, process_name: str) -> Process:
+        # Create the process, and connect it to the worker function
+        new_process = Process(target=self.do_work, name=process_name,
+                              args=(process_name,self._tasks,self._results,
+                                    self._active_batch))
+        # Do not let a forgotten executor keep the interpreter alive
+        new_process.daemon = True
+        # Start the process
+        new_process.start()
+        return new_process
+
+    def _replace_worker(self, process_name: str, timeout: int = 5):
+        """
+        Terminate a worker process that is stuck on a host and start a new
+        worker in its place, so the pool does not shrink.
+
+        :param process_name: The name of the worker process.
+            Required.
+        :type process_name: str
+        :param timeout: Seconds to wait for the worker to exit once it has been
+            terminated.
+            Optional. (Default: 5)
+        :type timeout: int
+        """
+        for i, process in enumerate(self._processes):
+            if process.name != process_name:
+                continue
+            logger.debug('Replacing worker %s', process_name)
+            process.terminate()
+            process.join(timeout=timeout)
+            self._processes[i] = self._start_worker(process_name)
+            return
+
+    def shutdown(self, timeout: int = 5):
+        """
+        Stop the worker processes and the IPC manager.
+
+        Idempotent. The executor can not be used after it has been shut down.
+
+        :param timeout: Seconds to wait for each worker to exit before it is
+            terminated.
+            Optional. (Default: 5)
+        :type timeout: int
+        """
+        if self._is_shutdown or getattr(self, '_manager', None) is None:
+            return
+        self._is_shutdown = True
+        try:
+            # Signal the do_work worker function/process to exit. An empty
+            # tuple is the signal for a worker process to exit.
+            for process in self._processes:
+                self._tasks.put(())
+        except Exception as e:
+            logger.debug("Failed to signal workers to exit: %s", e)
+        for process in self._processes:
+            process.join(timeout=timeout)
+            if process.is_alive():
+                # Forcefully send SIGTERM to the process
+                process.terminate()
+                process.join(timeout=timeout)
+        try:
+            self._manager.shutdown()
+        except Exception as e:
+            logger.debug("Failed to shutdown manager: %s", e)
+
+    def _parallel_execute_on_host(self, host, action, config, user=None,
+                                  as_sudo=False, **kwargs) -> ParallelResult:
         if action == "pytest":
             # DEBUG PARALLELIZATION
             #self.print("Returning mocked ParallelResult\n")
-            results.put(ParallelResult(host, 0, "corin\n", ""))
-        else:
-            # DEBUG PARALLELIZATION
-            #self.print("In _parallel_execute_on_host...\n")
-            connect_timeout = kwargs.get('connect_timeout', 60)
-            connect_kwargs = kwargs.get('connect_kwargs', None)
+            return ParallelResult(host, 0, "corin\n", "")
+        # DEBUG PARALLELIZATION
+        #self.print("In _parallel_execute_on_host...\n")
+        connect_timeout = kwargs.get('connect_timeout', 60)
+        connect_kwargs = kwargs.get('connect_kwargs', None)
+        timeout = kwargs.get('timeout', None)
 
-            # DEBUG PARALLELIZATION
-            #self.print("connect_timeout: {}\n".format(connect_timeout))
-            #self.print("connect_kwargs: {}\n".format(connect_kwargs))
-            #self.print("Opening connection\n")
+        # DEBUG PARALLELIZATION
+        #self.print("connect_timeout: {}\n".format(connect_timeout))
+        #self.print("connect_kwargs: {}\n".format(connect_kwargs))
+        #self.print("Opening connection\n")
 
-            with Connection(host, config=config, user=user,
-                            connect_timeout=connect_timeout,
-                            connect_kwargs=connect_kwargs) as c:
-                # DEBUG PARALLELIZATION
-                #self.print("Connection open\n")
-                if as_sudo:
-                    rtn = c.sudo(action, hide=True)
-                    #rtn = c.sudo(action, hide=True, pty=True)
-                else:
-                    rtn = c.run(action, hide=True)
-                    #rtn = c.run(action, hide=True, pty=True)
-
-                results.put(ParallelResult(host, rtn.return_code, rtn.stdout,
-                                           rtn.stderr))
+        with Connection(host, config=config, user=user,
+                        connect_timeout=connect_timeout,
+                        connect_kwargs=connect_kwargs) as c:
             # DEBUG PARALLELIZATION
-            #self.print("Connection closed\n")
+            #self.print("Connection open\n")
+            if as_sudo:
+                rtn = c.sudo(action, hide=True, timeout=timeout)
+                #rtn = c.sudo(action, hide=True, pty=True)
+            else:
+                rtn = c.run(action, hide=True, timeout=timeout)
+                #rtn = c.run(action, hide=True, pty=True)
+        # DEBUG PARALLELIZATION
+        #self.print("Connection closed\n")
+        return ParallelResult(host, rtn.return_code, rtn.stdout, rtn.stderr)
 
     # Define worker function
-    def do_work(self, process_name, tasks, results):
+    def do_work(self, process_name, tasks, results, active_batch):
         logger.debug('[%s] routine starts', process_name)
 
-        with open('/tmp/corin.txt', 'a') as f:
-            while True:
-                # DEBUG PARALLELIZATION
-                #self.print("Before tasks.get()\n")
-                new_tuple = tasks.get()
+        while True:
+            # DEBUG PARALLELIZATION
+            #self.print("Before tasks.get()\n")
+            new_tuple = tasks.get()
+            # DEBUG PARALLELIZATION
+            #self.print("After tasks.get()\n")
+            if len(new_tuple) == 0:
                 # DEBUG PARALLELIZATION
-                #self.print("After tasks.get()\n")
-                if len(new_tuple) == 0:
-                    # DEBUG PARALLELIZATION
-                    #self.print('[{}] routine quits\n'.format(process_name))
-                    logger.debug('[%s] routine quits', process_name)
-
-                    # Indicate finished
-                    results.put(ParallelResult("", -999, "", ""))
-                    break
-                else:
-                    # Unpack tuple into variables. See self.tasks.put in
-                    # 'execute' member function
-                    host = new_tuple[0]
-                    action = new_tuple[1]
-                    user = new_tuple[2]
-                    as_sudo = new_tuple[3]
-                    kwargs_dict = new_tuple[4]
-                    # TODO: Execute remote command - _parallel_execute_on_host
-                    logger.debug('Execute on host...')
-                    logger.debug('host: %s', host)
-                    logger.debug('action: %s', action)
-                    logger.debug('user: %s', user)
-                    logger.debug('as_sudo: %s', as_sudo)
-                    logger.debug('kwargs: %s', json.dumps(kwargs_dict))
-
-                    # DEBUG PARALLELIZATION
-                    #self.print('Execute on host...\n')
-                    #self.print('host: {}\n'.format(host))
-                    #self.print('action: {}\n'.format(action))
-                    #self.print('user: {}\n'.format(user))
-                    #self.print('as_sudo: {}\n'.format(as_sudo))
-                    #self.print('kwargs: {}\n'.format(json.dumps(kwargs_dict)))
-                    #self.print('Before call to _parallel_execute_on_host\n')
-                    #self.print('Details about _parallel_execute_on_host: ' \
-                    #           '{}\n'.format(
-                    #           getattr(self, '_parallel_execute_on_host')))
-
-                    self._parallel_execute_on_host(results, host, action,
-                                                   self.config, user=user,
-                                                   as_sudo=as_sudo,
-                                                   **kwargs_dict)
-                    # DEBUG PARALLELIZATION
-                    #self.print('After call to _parallel_execute_on_host\n')
+                #self.print('[{}] routine quits\n'.format(process_name))
+                logger.debug('[%s] routine quits', process_name)
+                break
+
+            # Unpack tuple into variables. See self._tasks.put in 'execute'
+            # member function
+            batch = new_tuple[0]
+            host = new_tuple[1]
+            action = new_tuple[2]
+            user = new_tuple[3]
+            as_sudo = new_tuple[4]
+            kwargs_dict = new_tuple[5]
+            expires = new_tuple[6]
+            logger.debug('Execute on host...')
+            logger.debug('batch: %s', batch)
+            logger.debug('host: %s', host)
+            logger.debug('action: %s', action)
+            logger.debug('user: %s', user)
+            logger.debug('as_sudo: %s', as_sudo)
+            logger.debug('kwargs: %s', json.dumps(kwargs_dict))
+            if batch != active_batch.value:
+                # The caller is no longer waiting on this batch
+                logger.debug('[%s] skipping %s from batch %s', process_name,
+                             host, batch)
+                continue
+            if expires is not None and time.time() >= expires:
+                # The caller has already given up on this host
+                logger.debug('[%s] skipping expired %s', process_name, host)
+                continue
+            # Let the caller know which worker is executing on host
+            results.put((batch, host, process_name))
+
+            # DEBUG PARALLELIZATION
+            #self.print('Before call to _parallel_execute_on_host\n')
+            try:
+                result = self._parallel_execute_on_host(host, action,
+                                                        self.config, user=user,
+                                                        as_sudo=as_sudo,
+                                                        **kwargs_dict)
+            except Exception as e:
+                # Report the failure rather than losing the worker and leaving
+                # execute waiting for a result that will never come.
+                logger.debug('[%s] execution on %s failed: %s', process_name,
+                             host, e)
+                result = ParallelResult(host, -1, "", str(e))
+            # DEBUG PARALLELIZATION
+            #self.print('After call to _parallel_execute_on_host\n')
+            results.put((batch, host, result))
         return
 
-    def execute(self, hosts: List[str], action: str, user: str = None,
-                as_sudo: bool = False, **kwargs):
+    def execute_iter(self, hosts: List[str], action: Union[str,Dict[str,str]],
+                     user: str = None,
+                     as_sudo: bool = False, deadline: Union[int,float] = None,
+                     **kwargs) -> Iterator[ParallelResult]:
+        """
+        Execute an action on each host, yielding a ParallelResult per host as
+        soon as that host has finished.
+
+        Results are yielded in completion order, not in the order of hosts. A
+        host that has not reported a result within deadline seconds of being
+        submitted, including a host still queued behind busy workers, is
+        yielded with a return_code of -1. A worker still executing on an
+        expired host is terminated and replaced. If the caller stops iterating
+        early, hosts not yet started are skipped.
+
+        Only one call to execute/execute_iter may be in progress at a time. The
+        executor is held until the generator is exhausted or closed.
+
+        :param hosts: The hosts on which to execute the action.
+            Required.
+        :type hosts: List[str]
+        :param action: The command to execute, or a command per host keyed by
+            host.
+            Required.
+        :type action: Union[str,Dict[str,str]]
+        :param user: The user to connect as.
+            Optional. (Default: None)
+        :type user: str
+        :param as_sudo: Execute the action with sudo?
+            Optional. (Default: False)
+        :type as_sudo: bool
+        :param deadline: Seconds each host has to report a result once it has
+            been submitted. None waits indefinitely.
+            Optional. (Default: None)
+        :type deadline: Union[int,float]
+        :return: Iterator[ParallelResult]
+        """
         # DEBUG PARALLELIZATION
-        #self.print("In execute...\n")
-        #self.print("The instance's _parallel_execute_on_host function has " \
-        #           "been patched by pytest at this point...\n")
-        #self.print('Details about _parallel_execute_on_host: {}\n'.format(
-        #           getattr(self, '_parallel_execute_on_host')))
+        #self.print("In execute_iter...\n")
         identity_file = kwargs.pop('identity_file', None)
         connect_kwargs = self._collect_connect_kwargs(identity_file)
         kwargs['connect_kwargs'] = connect_kwargs
-        logger.debug('TODO: Execute on hosts...')
+        logger.debug('Execute on hosts...')
         logger.debug('hosts: %s', hosts)
         logger.debug('action: %s', action)
         logger.debug('user: %s', user)
         logger.debug('as_sudo: %s', as_sudo)
+        logger.debug('deadline: %s', deadline)
         logger.debug('kwargs: %s', json.dumps(kwargs))
-        # Fill task queue
-        for host in hosts:
-            self._tasks.put((host, action, user, as_sudo, kwargs))
-
-        # Signal the do_work worker function/process to exit. An empty tuple
-        # will be the signal for a worker process to exit.
-        for host in hosts:
-            self._tasks.put(())
+        if self._is_shutdown:
+            raise Exception("ParallelFabricExecutor has been shut down")
+
+        # Preserve order, drop duplicates
+        pending = list(dict.fromkeys(hosts))
+        # When each host must report a result by
+        expires = None
+        # The worker executing on each host
+        workers = {}
+        # Hosts that exceeded the deadline
+        expired = set()
+        with self._lock:
+            self._batch += 1
+            batch = self._batch
+            self._active_batch.value = batch
+            try:
+                if deadline is not None:
+                    expires = time.time() + float(deadline)
+                # Fill task queue
+                for host in pending:
+                    host_action = action[host] if isinstance(action, dict) \
+                                  else action
+                    self._tasks.put((batch, host, host_action, user, as_sudo,
+                                     kwargs, expires))
+
+                # Read results
+                while pending:
+                    try:
+                        if expires is None:
+                            result_batch, host, new_result = self._results.get()
+                        else:
+                            result_batch, host, new_result = self._results.get(
+                                timeout=max(expires - time.time(), 0))
+                    except Empty:
+                        for host in list(pending):
+                            logger.debug('%s exceeded deadline', host)
+                            pending.remove(host)
+                            expired.add(host)
+                            if host in workers:
+                                self._replace_worker(workers.pop(host))
+                            yield ParallelResult(
+                                host, -1, "",
+                                "Remote execution exceeded deadline")
+                        continue
+                    if result_batch != batch:
+                        # Left over from a previous batch
+                        continue
+                    if isinstance(new_result, str):
+                        # Execution on host has started
+                        if host in expired:
+                            # The worker picked the host up just as it expired
+                            self._replace_worker(new_result)
+                        else:
+                            workers[host] = new_result
+                        continue
+                    if host not in pending:
+                        # Left over from an expired host
+                        continue
+                    # Output result
+                    #logger.debug('host: %s rc: %d stdout: %s stderr: %s',
+                    #             new_result.host, new_result.return_code,
+                    #             new_result.stdout, new_result.stderr)
+                    pending.remove(host)
+                    workers.pop(host, None)
+                    yield new_result
+            finally:
+                # Workers skip whatever is left of this batch
+                self._active_batch.value = 0
+
+    def execute(self, hosts: List[str], action: Union[str,Dict[str,str]],
+                user: str = None, as_sudo: bool = False, **kwargs):
+        # DEBUG PARALLELIZATION
+        #self.print("In execute...\n")
+        rtn = {}
+        for new_result in self.execute_iter(hosts, action, user=user,
+                                            as_sudo=as_sudo, **kwargs):
+            rtn[new_result.host] = {
+               'return_code': new_result.return_code,
+               'stdout': new_result.stdout,
+               'stderr': new_result.stderr
+            }
+        # DEBUG PARALLELIZATION
+        #self.print("Returning {} from execute...\n".format(str(rtn)))
+        return rtn
 
-        # Read results
-        num_finished_processes = 0
+    def execute_quorum(self, hosts: List[str],
+                       action: Union[str,Dict[str,str]], user: str = None,
+                       as_sudo: bool = False, quorum: Union[str,int] = None,
+                       predicate: Callable[[Dict], bool] = None,
+                       **kwargs) -> Dict[str, Dict]:
+        """
+        Execute an action on each host, returning as soon as enough hosts have
+        answered.
+
+        Returns once quorum hosts have succeeded (return_code 0) or predicate
+        returns True, whichever comes first. Hosts that have not answered by
+        then are cancelled: those not yet started are skipped and late results
+        are discarded. A command already running on a host is not interrupted,
+        but is bounded by the timeout kwarg. Only hosts that answered are in
+        the returned dict. With neither quorum nor predicate this is the same
+        as execute.
+
+        :param hosts: The hosts on which to execute the action.
+            Required.
+        :type hosts: List[str]
+        :param action: The command to execute, or a command per host keyed by
+            host.
+            Required.
+        :type action: Union[str,Dict[str,str]]
+        :param user: The user to connect as.
+            Optional. (Default: None)
+        :type user: str
+        :param as_sudo: Execute the action with sudo?
+            Optional. (Default: False)
+        :type as_sudo: bool
+        :param quorum: How many hosts must succeed before returning.
+            Optional. (Default: None)
+        :type quorum: Union[str,int]
+        :param predicate: Called with a dict of the ParallelResult of each host
+            that has answered so far, keyed by host. Return True to stop
+            waiting on the remaining hosts.
+            Optional. (Default: None)
+        :type predicate: Callable[[Dict], bool]
+        :return: Dict[str, Dict]
+        """
         rtn = {}
-        while True:
-            # Read result
-            new_result = self._results.get()
-            # Have a look at the results
-            if new_result.return_code == -999:
-                # Process has finished
-                num_finished_processes += 1
-
-                if num_finished_processes == self._cpu_count:
-                    break
-            else:
-                # Output result
-                #logger.debug('host: %s rc: %d stdout: %s stderr: %s',
-                #             new_result.host, new_result.return_code,
-                #             new_result.stdout, new_result.stderr)
+        results = {}
+        succeeded = 0
+        iterator = self.execute_iter(hosts, action, user=user,
+                                     as_sudo=as_sudo, **kwargs)
+        try:
+            for new_result in iterator:
+                results[new_result.host] = new_result
                 rtn[new_result.host] = {
                    'return_code': new_result.return_code,
                    'stdout': new_result.stdout,
                    'stderr': new_result.stderr
                 }
-        # DEBUG PARALLELIZATION
-        #self.print("Returning {} from execute...\n".format(str(rtn)))
+                if new_result.return_code == 0:
+                    succeeded += 1
+                if quorum is not None and succeeded >= int(quorum):
+                    logger.debug("Quorum of %s reached", quorum)
+                    break
+                if predicate is not None and predicate(results):
+                    logger.debug("Predicate satisfied by %d hosts",
+                                 len(results))
+                    break
+        finally:
+            # Cancel the stragglers
+            iterator.close()
+        return rtn
+
+_parallel_executors = {}
+_parallel_executors_pid = None
+
+
+def get_parallel_executor(ssh_config_file: str = None) -> ParallelFabricExecutor:
+    """
+    Get the process-wide ParallelFabricExecutor for an SSH config file.
+
+    The executor (and its worker processes) is created on first use and reused
+    by every subsequent caller in the same process. All executors are shut down
+    when the interpreter exits. See shutdown_parallel_executors.
+
+    :param ssh_config_file: The path to the SSH config file.
+        Optional. (Default: None)
+    :type ssh_config_file: str
+    :return: ParallelFabricExecutor
+    """
+    global _parallel_executors, _parallel_executors_pid
+    if _parallel_executors_pid != os.getpid():
+        # Executors inherited from a parent process belong to the parent
+        if _parallel_executors_pid is None:
+            atexit.register(shutdown_parallel_executors)
+        _parallel_executors = {}
+        _parallel_executors_pid = os.getpid()
+    executor = _parallel_executors.get(ssh_config_file, None)
+    if executor is None:
+        executor = ParallelFabricExecutor(ssh_config_file=ssh_config_file)
+        _parallel_executors[ssh_config_file] = executor
+    return executor
+
+
+def shutdown_parallel_executors():
+    """
+    Shut down every executor created by get_parallel_executor.
+    """
+    global _parallel_executors
+    if _parallel_executors_pid != os.getpid():
+        return
+    executors = _parallel_executors
+    _parallel_executors = {}
+    for executor in executors.values():
+        executor.shutdown()
+
+
+class AsyncRemoteExecutor(FabricExecutor):
+    """
+    An asyncio-based remote executor capable of fanning out to hundreds of
+    hosts from a single event loop.
+
+    execute is a coroutine. Each host's command is awaited as a separate task,
+    bounded by a concurrency semaphore and a per-host timeout. Fabric/paramiko
+    calls block, so the commands themselves run on a thread pool sized to the
+    concurrency limit, using connections borrowed from the process-wide
+    ConnectionPool (see get_connection_pool). Unlike ParallelFabricExecutor,
+    the number of hosts handled at once is not limited by the client's CPU
+    count.
+
+    Call close when the executor is no longer needed.
+    """
+    def __init__(self, ssh_config_file=None,
+                 max_concurrency=DEFAULT_CHAOS_ASYNC_EXECUTOR_CONCURRENCY):
+        """
+        :param ssh_config_file: The path to the SSH config file.
+            Optional. (Default: None)
+        :type ssh_config_file: str
+        :param max_concurrency: Maximum number of hosts to execute on at once.
+            Optional.
+            (Default: chaosindy.common.DEFAULT_CHAOS_ASYNC_EXECUTOR_CONCURRENCY)
+        :type max_concurrency: int
+        """
+        super().__init__(ssh_config_file=ssh_config_file, persistent=True)
+        self._max_concurrency = int(max_concurrency)
+        self._threads = ThreadPoolExecutor(max_workers=self._max_concurrency)
+
+    def close(self):
+        """
+        Release the executor's worker threads.
+        """
+        self._threads.shutdown(wait=False)
+
+    async def _execute_on_host_async(self, semaphore, host, action, user=None,
+                                     as_sudo=False, connect_kwargs=None,
+                                     timeout=10):
+        async with semaphore:
+            loop = asyncio.get_running_loop()
+            call = functools.partial(self._persistent_execute_on_host, host,
+                                     action, user=user, as_sudo=as_sudo,
+                                     connect_kwargs=connect_kwargs,
+                                     timeout=timeout)
+            try:
+                rtn = await asyncio.wait_for(
+                    loop.run_in_executor(self._threads, call), timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.error("Remote execution on %s has exceeded timeout",
+                             host)
+                return ParallelResult(host, -1, "",
+                                      "Remote execution has exceeded timeout")
+            except Exception as e:
+                logger.error("Remote execution on %s failed: %s", host, e)
+                return ParallelResult(host, -1, "", str(e))
+            return ParallelResult(host, rtn.return_code, rtn.stdout,
+                                  rtn.stderr)
+
+    async def execute(self, hosts: List[str],
+                      action: Union[str,Dict[str,str]], user: str = None,
+                      as_sudo: bool = False, timeout: int = 10,
+                      **kwargs) -> Dict[str, Dict]:
+        """
+        Execute an action on a list of hosts concurrently.
+
+        Returns a dict keyed by host in the same form returned by
+        ParallelFabricExecutor.execute. Hosts that time out or fail to connect
+        are reported with a return_code of -1 and the reason in stderr.
+
+        :param hosts: hostnames
+            Required.
+        :type hosts: List[str]
+        :param action: A command to execute on each host, or a command per
+            host keyed by host.
+            Required.
+        :type action: Union[str,Dict[str,str]]
+        :param user: The user to execute the action.
+            Optional. (Default: None)
+        :type user: str
+        :param as_sudo: Should the user execute the action as sudo?
+            Optional. (Default: False)
+        :type as_sudo: bool
+        :param timeout: Seconds each host is given to connect and complete the
+            action.
+            Optional. (Default: 10)
+        :type timeout: int
+        :return: Dict[str, Dict]
+        """
+        identity_file = kwargs.pop('identity_file', None)
+        connect_kwargs = self._collect_connect_kwargs(identity_file)
+        logger.debug('Execute on hosts asynchronously...')
+        logger.debug('hosts: %s', hosts)
+        logger.debug('action: %s', action)
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+        tasks = [self._execute_on_host_async(semaphore, host,
+                                             action[host] \
+                                             if isinstance(action, dict) \
+                                             else action,
+                                             user=user, as_sudo=as_sudo,
+                                             connect_kwargs=connect_kwargs,
+                                             timeout=int(timeout))
+                 for host in hosts]
+        rtn = {}
+        for result in await asyncio.gather(*tasks):
+            rtn[result.host] = {
+               'return_code': result.return_code,
+               'stdout': result.stdout,
+               'stderr': result.stderr
+            }
         return rtn
@@ -1,4 +1,6 @@
 import asyncio
+import threading
+import time
 from logzero import logger
 
 def run(callable, timeout: int, *args, **kwargs) -> bool:
@@ -25,3 +27,66 @@ def run(callable, timeout: int, *args, **kwargs) -> bool:
     return True
     #loop.run_until_complete(callable(*args, **kwargs))
     #loop.close()
+
+
+class BackgroundTask(object):
+    """
+    Run a function in a daemon thread, so an experiment's actions can continue
+    while it runs, and keep its result (or exception).
+
+    If run_in_loop is True, the function is a coroutine function and is run on
+    a new event loop owned by the thread.
+    """
+    def __init__(self, name: str, target, *args, run_in_loop: bool = False,
+                 **kwargs):
+        self.name = name
+        self.result = None
+        self.exception = None
+        self.started_at = None
+        self.ended_at = None
+        self._target = target
+        self._args = args
+        self._kwargs = kwargs
+        self._run_in_loop = run_in_loop
+        self._thread = threading.Thread(target=self._run, name=name,
+                                        daemon=True)
+
+    def _run(self):
+        self.started_at = time.time()
+        try:
+            if self._run_in_loop:
+                loop = asyncio.new_event_loop()
+                # indy's wrappers use the current thread's event loop
+                asyncio.set_event_loop(loop)
+                try:
+                    self.result = loop.run_until_complete(
+                        self._target(*self._args, **self._kwargs))
+                finally:
+                    loop.close()
+            else:
+                self.result = self._target(*self._args, **self._kwargs)
+        except Exception as e:
+            logger.error("Background task %s failed", self.name)
+            logger.exception(e)
+            self.exception = e
+        finally:
+            self.ended_at = time.time()
+
+    def start(self) -> 'BackgroundTask':
+        self._thread.start()
+        return self
+
+    def is_alive(self) -> bool:
+        return self._thread.is_alive()
+
+    def join(self, timeout: float = None) -> bool:
+        """
+        Wait for the task to finish.
+
+        :param timeout: How long (in seconds) to wait.
+            Optional. (Default: Wait forever)
+        :type timeout: float
+        :return: bool - True if the task has finished
+        """
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
@@ -1,28 +1,43 @@
+import asyncio
+import atexit
+import copy
+import hashlib
 import json
+import threading
+import time
 from indy import ledger, did, wallet, pool
 from indy.error import IndyError, ErrorCode
+from os import getpid, makedirs, replace
 from os.path import expanduser, join
 from chaosindy.common import *
 from logzero import logger
 from datetime import datetime
+from typing import Dict, List, Union
 
 
 # NOTE: Workaround: Until https://jira.hyperledger.org/browse/IS-903 is
 #       completed, create, populate, use and then delete a new wallet each time
-#       write_nym_and_check is called.
+#       write_nym_and_check is called, unless reuse_session is True.
 async def write_nym_and_check(seed: str = None, pool_name: str = None,
                               my_wallet_name: str = None,
                               my_wallet_key: str = None,
                               their_wallet_name: str = None,
                               their_wallet_key: str = None,
                               genesis_file: str = None,
-                              cleanup=True) -> None:
+                              cleanup=True,
+                              reuse_session: bool = False) -> None:
     """
     Write a NYM to the ledger.
 
     Write a NYM to the ledger and confirm/check that it was successfull by
     reading the NYM from the ledger. Not idempotent.
 
+    By default, a pool ledger config and two wallets are created, opened,
+    closed and deleted on every call (see IS-903). If reuse_session is True,
+    the process-wide session for the seed (see get_session) is used instead,
+    so only the NYM and GET_NYM requests are sent. The session stays open
+    until close_sessions is called or the process exits.
+
     :param seed: 32 byte string used to generate did, verkey pair. The seed must
         be the seed for a Trustee, Steward, or Trust Anchor.
         Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SEED)
@@ -46,15 +61,47 @@ async def write_nym_and_check(seed: str = None, pool_name: str = None,
         transaction file.
         Optional. (Default: chaosindy.common.DEFAULT_CHAOS_GENESIS_FILE)
     :type genesis_file: str
-    :param cleanup: Delete wallets and pool configuration?
+    :param cleanup: Delete wallets and pool configuration? Ignored if
+        reuse_session is True.
         Optional. (Default: True)
     :type cleanup: bool
+    :param reuse_session: Use the process-wide session for the seed instead
+        of creating and deleting wallets?
+        Optional. (Default: False)
+    :type reuse_session: bool
     :return: None
     """
     # TODO: validate inputs
     if seed is None:
         seed = DEFAULT_CHAOS_SEED
 
+    if reuse_session:
+        session = await get_session(genesis_file=genesis_file, seed=seed,
+                                    pool_name=pool_name,
+                                    wallet_name=their_wallet_name,
+                                    wallet_key=their_wallet_key)
+
+        logger.debug('Create a DID to write to the ledger')
+        (my_did, my_verkey) = await did.create_and_store_my_did(
+            session.wallet_handle, "{}")
+
+        logger.debug('Prepare and send NYM transaction')
+        nym_txn_req = await ledger.build_nym_request(session.did, my_did,
+                                                     None, None, None)
+        await ledger.sign_and_submit_request(session.pool_handle,
+                                             session.wallet_handle,
+                                             session.did, nym_txn_req)
+
+        logger.debug('Prepare and send GET_NYM request')
+        get_nym_txn_req = await ledger.build_get_nym_request(session.did,
+                                                             my_did)
+        get_nym_txn_resp = await ledger.submit_request(session.pool_handle,
+                                                       get_nym_txn_req)
+        get_nym_txn_resp = json.loads(get_nym_txn_resp)
+
+        assert get_nym_txn_resp['result']['dest'] == my_did
+        return
+
     if pool_name is None:
         pool_name = DEFAULT_CHAOS_POOL
 
@@ -78,7 +125,7 @@ async def write_nym_and_check(seed: str = None, pool_name: str = None,
         their_wallet_key = DEFAULT_CHAOS_WALLET_KEY
 
     if genesis_file is None:
-        genesis_file = DEFAULT_CHAOS_GENEIS_FILE
+        genesis_file = DEFAULT_CHAOS_GENESIS_FILE
 
     logger.debug('# 0. Set protocol version to 2')
     try:
@@ -199,18 +246,212 @@ async def write_nym_and_check(seed: str = None, pool_name: str = None,
             pass
 
 
-# NOTE: Workaround: Until https://jira.hyperledger.org/browse/IS-903 is
-#       completed, create, populate, use and then delete a new wallet each time
-#       write_nym_and_check is called.
+# The last seq_no read from, and the folded validator state of, each pool
+# ledger traversed by get_validator_state in this process, keyed by the
+# sha256 of the pool's genesis file
+_pool_ledger_cache = {}
+
+
+def get_genesis_hash(genesis_file: str) -> str:
+    """
+    Get the sha256 (hex digest) of a pool genesis transaction file. Used to key
+    the pool ledger cache, so pools that share a genesis file name (i.e.
+    /home/ubuntu/pool_transactions_genesis) do not share a cache.
+
+    :param genesis_file: Relative or absolute path to the pool's genesis
+        transaction file.
+    :type genesis_file: str
+    :return: str
+    """
+    with open(expanduser(genesis_file), 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _read_pool_txn_log(txn_log: str) -> Union[List[Dict],None]:
+    """
+    Read the 'result' of each entry in a pool ledger replica's transaction
+    log, stopping at the first missing or truncated entry. None if there is no
+    transaction log.
+    """
+    results = []
+    try:
+        with open(txn_log, 'r') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A partial write. Ignore it and everything after it.
+                    logger.info("Truncated entry after seq_no %d in %s",
+                                len(results), txn_log)
+                    break
+                if entry['seq_no'] != len(results) + 1:
+                    logger.info("Gap after seq_no %d in %s", len(results),
+                                txn_log)
+                    break
+                results.append(entry['result'])
+    except FileNotFoundError:
+        return None
+    return results
+
+
+def load_pool_ledger_cache(genesis_hash: str, cache_dir: str) -> Dict:
+    """
+    Load the local replica of a pool ledger written by save_pool_ledger_cache.
+
+    The folded state (<genesis_hash>.json) is used if it is present and
+    agrees with the transaction log (<genesis_hash>.jsonl). Otherwise the
+    state is rebuilt by folding the transaction log, stopping at the first
+    missing or truncated entry.
+
+    :param genesis_hash: See get_genesis_hash
+    :type genesis_hash: str
+    :param cache_dir: The directory holding the replica.
+    :type cache_dir: str
+    :return: Dict - {'seq_no': <last seq_no>, 'validators': {...}}. seq_no is
+        0 if there is no replica.
+    """
+    cache_dir = expanduser(cache_dir)
+    txn_log = join(cache_dir, "{}.jsonl".format(genesis_hash))
+    state_file = join(cache_dir, "{}.json".format(genesis_hash))
+
+    seq_no = 0
+    validators = {}
+    results = _read_pool_txn_log(txn_log)
+    if results is None:
+        return {'seq_no': seq_no, 'validators': validators}
+
+    try:
+        with open(state_file, 'r') as f:
+            state = json.load(f)
+        if state['seq_no'] == len(results):
+            return state
+    except (FileNotFoundError, ValueError, KeyError):
+        pass
+
+    logger.info("Rebuilding pool ledger state from %s", txn_log)
+    for result in results:
+        fold_pool_txn(validators, result)
+    return {'seq_no': len(results), 'validators': validators}
+
+
+def save_pool_ledger_cache(genesis_hash: str, cache_dir: str,
+                           first_seq_no: int, results: List[Dict],
+                           validators: Dict[str, Dict]) -> None:
+    """
+    Add newly read transactions to the local replica of a pool ledger and
+    replace its folded state.
+
+    The transaction log is rewritten, from its valid entries (see
+    load_pool_ledger_cache) followed by results, and renamed into place. So a
+    truncated entry left by an interrupted write is dropped instead of having
+    every later entry appended after it, and processes saving at the same time
+    do not interleave their entries.
+
+    :param genesis_hash: See get_genesis_hash
+    :type genesis_hash: str
+    :param cache_dir: The directory holding the replica.
+    :type cache_dir: str
+    :param first_seq_no: The seq_no of results[0]
+    :type first_seq_no: int
+    :param results: The 'result' element of each GET_TXN reply read, in
+        seq_no order.
+    :type results: List[Dict]
+    :param validators: The folded state as of the last of results.
+    :type validators: Dict[str, Dict]
+    :return: None
+    """
+    cache_dir = expanduser(cache_dir)
+    makedirs(cache_dir, exist_ok=True)
+    txn_log = join(cache_dir, "{}.jsonl".format(genesis_hash))
+    state_file = join(cache_dir, "{}.json".format(genesis_hash))
+
+    if results:
+        logged = (_read_pool_txn_log(txn_log) or [])[:first_seq_no - 1]
+        if len(logged) < first_seq_no - 1:
+            logger.info("Missing entries before seq_no %d in %s. Not adding " \
+                        "the transactions read.", first_seq_no, txn_log)
+            results = []
+        tmp_txn_log = "{}.{}".format(txn_log, getpid())
+        with open(tmp_txn_log, 'w') as f:
+            for offset, result in enumerate(logged + results):
+                f.write(json.dumps({'seq_no': offset + 1, 'result': result},
+                                   sort_keys=True))
+                f.write("\n")
+        replace(tmp_txn_log, txn_log)
+
+    # Write then rename, so readers never see a partially written state
+    tmp_state_file = "{}.{}".format(state_file, getpid())
+    with open(tmp_state_file, 'w') as f:
+        json.dump({'seq_no': first_seq_no + len(results) - 1,
+                   'validators': validators}, f, sort_keys=True)
+    replace(tmp_state_file, state_file)
+
+
+def fold_pool_txn(validators: Dict[str, Dict], result: Dict) -> None:
+    """
+    Apply a POOL ledger transaction (the result of a GET_TXN request) to the
+    per-alias validator state built by get_validator_state.
+
+    :param validators: Maps each alias to the current values of its
+        attributes. Updated in place.
+    :type validators: Dict[str, Dict]
+    :param result: The 'result' element of a GET_TXN reply.
+    :type result: Dict
+    :return: None
+    """
+    result_data = result['data']
+    result_data_txn_data = result_data['txn']['data']
+    result_data_txn_data_data = result_data_txn_data['data']
+
+    # Get destination field from the JSON dump of the current transaction
+    #current_dest = result_data_txn_data['dest']
+    current_dest = result_data_txn_data_data['alias']
+
+    # Add destination to the dictionary if it does not exist
+    if not( current_dest in validators.keys() ):
+        validators[current_dest] = {}
+
+    for key in result_data_txn_data_data.keys():
+        # Update attribute value of the destination if the attributes exists
+        # in the current transaction dump
+        try:
+            validators[current_dest][key]  = result_data_txn_data_data[key]
+        except KeyError:
+            pass
+
+    try:
+        validators[current_dest]['dest']  = result_data_txn_data['dest']
+    except KeyError:
+        pass
+
+    try:
+        validators[current_dest]['identifier']  = result['identifier']
+    except KeyError:
+        pass
+
+
 async def get_validator_state(genesis_file: str = None, seed: str = None,
                               pool_name: str = None, wallet_name: str = None,
-                              wallet_key: str = None, cleanup=True) -> None:
+                              wallet_key: str = None, cleanup=None,
+                              window: int = DEFAULT_CHAOS_POOL_LEDGER_WINDOW,
+                              cache_dir: str = DEFAULT_CHAOS_POOL_LEDGER_CACHE_DIR
+                              ) -> None:
     """
     Not to be confused with the validator-info script or the indy-cli
     `ledger get-validator-info`.
 
     This version of validator info is extracted from the pool ledger.
 
+    The seq_no after the last transaction read is requested first, on its
+    own, so a call finding no new transactions sends a single GET_TXN request.
+    If it has a transaction, GET_TXN requests are then sent window at a time,
+    concurrently, until the first seq_no with no transaction. Every transaction read, and the resulting
+    state, are kept in a local replica of the pool ledger in cache_dir (keyed
+    by the sha256 of the genesis file), so later calls (in this or any later
+    process) only read new transactions.
+
+    The pool and wallet are opened once per process (see get_session).
+
     :param genesis_file: Relative or absolute path to the pool's genesis
         transaction file.
         Optional. (Default: chaosindy.common.DEFAULT_CHAOS_GENESIS_FILE)
@@ -227,9 +468,19 @@ async def get_validator_state(genesis_file: str = None, seed: str = None,
     :param wallet_key: Wallet key
         Optional. (Default: chaosindy.common.DEFAULT_CHAOS_WALLET_KEY)
     :type wallet_key: str
-    :param cleanup: Delete the wallet and pool configuration?
-        Optional. (Default: True)
+    :param cleanup: Deprecated and ignored. A warning is logged if it is
+        given. The session's wallet is deleted by close_sessions.
+        Optional. (Default: None)
     :type cleanup: bool
+    :param window: How many GET_TXN requests to have in flight at once.
+        Optional.
+        (Default: chaosindy.common.DEFAULT_CHAOS_POOL_LEDGER_WINDOW)
+    :type window: int
+    :param cache_dir: Where to keep the local replica of the pool ledger. The
+        replica is only kept in memory if None.
+        Optional.
+        (Default: chaosindy.common.DEFAULT_CHAOS_POOL_LEDGER_CACHE_DIR)
+    :type cache_dir: str
     :return: None
     """
     output_dir = get_chaos_temp_dir()
@@ -251,15 +502,197 @@ async def get_validator_state(genesis_file: str = None, seed: str = None,
     if wallet_name is None:
         wallet_name = DEFAULT_CHAOS_WALLET_NAME
 
-    now = datetime.now()
-    wallet_name = "{}-{}".format(wallet_name,
-                                 now.strftime("%Y%m%dT%H%M%S"))
+    if wallet_key is None:
+        wallet_key = DEFAULT_CHAOS_WALLET_KEY
+
+    if genesis_file is None:
+        genesis_file = DEFAULT_CHAOS_GENESIS_FILE
+
+    if cleanup is not None:
+        logger.warning("The cleanup parameter of get_validator_state is " \
+                       "deprecated and ignored. Use close_sessions to " \
+                       "delete the session's wallet.")
+
+    session = await get_session(genesis_file=genesis_file, seed=seed,
+                                pool_name=pool_name, wallet_name=wallet_name,
+                                wallet_key=wallet_key)
+
+    # Start from the high-water mark of the last traversal of this pool ledger
+    genesis_hash = get_genesis_hash(genesis_file)
+    cached = _pool_ledger_cache.get(genesis_hash, None)
+    if cached is None and cache_dir:
+        cached = load_pool_ledger_cache(genesis_hash, cache_dir)
+    if cached:
+        current_txn = cached['seq_no']
+        validators = copy.deepcopy(cached['validators'])
+    else:
+        current_txn = 0
+    first_new_txn = current_txn + 1
+    new_results = []
+
+    logger.info("Traversing through transactions in the pool ledger " \
+                "starting after seq_no %d", current_txn)
+
+    async def get_txn(seq_no):
+        request = await ledger.build_get_txn_request(
+            submitter_did=session.did, seq_no=seq_no, ledger_type="POOL")
+        response = await ledger.sign_and_submit_request(
+            pool_handle=session.pool_handle,
+            wallet_handle=session.wallet_handle, submitter_did=session.did,
+            request_json=request)
+        return json.loads(response)
+
+    # Probe the next seq_no on its own, so an up to date replica costs one
+    # request. Then request a window of transactions at a time, stopping at
+    # the first gap.
+    window = max(int(window), 1)
+    batch_size = 1
+    end_of_ledger = False
+    while (not (end_of_ledger)):
+        seq_nos = range(current_txn + 1, current_txn + batch_size + 1)
+        txn_json_dumps = await asyncio.gather(
+            *[get_txn(seq_no) for seq_no in seq_nos])
+        batch_size = window
+        for txn_json_dump in txn_json_dumps:
+            # No more transactions?
+            # TODO: Determine if 'result' will always be present.
+            result = txn_json_dump.get('result', None)
+            if (result is None ) :
+                end_of_ledger = True
+                break
+            if (result.get('data', None) is None ) :
+                end_of_ledger = True
+                break
+            fold_pool_txn(validators, result)
+            new_results.append(result)
+            current_txn = current_txn + 1
+
+    _pool_ledger_cache[genesis_hash] = {
+        'seq_no': current_txn,
+        'validators': copy.deepcopy(validators)
+    }
+    if cache_dir and (new_results or not cached):
+        try:
+            save_pool_ledger_cache(genesis_hash, cache_dir, first_new_txn,
+                                   new_results, validators)
+        except OSError as e:
+            logger.info("Failed to update the pool ledger cache in %s: %s",
+                        cache_dir, e)
+
+    logger.debug("Dumping data to validator-state state file")
+    with open(join(output_dir, 'validator-state'), 'w') as json_file:
+        json.dump(validators, json_file, sort_keys=True, indent=4)
+
+
+class LedgerSession(object):
+    """
+    An open pool handle, plus a wallet holding the DID derived from a seed.
+
+    See get_session.
+    """
+    def __init__(self, pool_name: str, pool_handle: int, wallet_name: str,
+                 wallet_config: str, wallet_credentials: str,
+                 wallet_handle: int, did: str, verkey: str):
+        self.pool_name = pool_name
+        self.pool_handle = pool_handle
+        self.wallet_name = wallet_name
+        self.wallet_config = wallet_config
+        self.wallet_credentials = wallet_credentials
+        self.wallet_handle = wallet_handle
+        self.did = did
+        self.verkey = verkey
+
+
+# Sessions opened by get_session, keyed by (pool_name, seed), and the pid they
+# were opened in. Sessions are shared by every thread (i.e. background load
+# running its own event loop), so they are created under _sessions_lock.
+_sessions = {}
+_sessions_pid = None
+_sessions_lock = threading.Lock()
+
+
+async def get_session(genesis_file: str = None, seed: str = None,
+                      pool_name: str = None, wallet_name: str = None,
+                      wallet_key: str = None) -> LedgerSession:
+    """
+    Get the process-wide ledger session for a pool and seed.
+
+    The pool ledger is opened, and a wallet created, opened and populated with
+    the seed's DID, the first time a session is requested. Subsequent calls in
+    the same process reuse the open pool handle and wallet. Concurrent first
+    calls, from any thread or event loop, wait for a single session to be
+    created. Sessions are closed (and their wallets deleted) by
+    close_sessions, which is called when the interpreter exits.
+
+    :param genesis_file: Relative or absolute path to the pool's genesis
+        transaction file.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_GENESIS_FILE)
+    :type genesis_file: str
+    :param seed: 32 byte string used to generate did, verkey pair.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SEED)
+    :type seed: str
+    :param pool_name: Pool name.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_POOL)
+    :type pool_name: str
+    :param wallet_name: Wallet name. A timestamp is appended.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_WALLET_NAME)
+    :type wallet_name: str
+    :param wallet_key: Wallet key
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_WALLET_KEY)
+    :type wallet_key: str
+    :return: LedgerSession
+    """
+    if seed is None:
+        seed = DEFAULT_CHAOS_SEED
+
+    if pool_name is None:
+        pool_name = DEFAULT_CHAOS_POOL
+
+    if wallet_name is None:
+        wallet_name = DEFAULT_CHAOS_WALLET_NAME
 
     if wallet_key is None:
         wallet_key = DEFAULT_CHAOS_WALLET_KEY
 
     if genesis_file is None:
-        genesis_file = DEFAULT_CHAOS_GENEIS_FILE
+        genesis_file = DEFAULT_CHAOS_GENESIS_FILE
+
+    key = (pool_name, seed)
+    if _sessions_pid == getpid():
+        session = _sessions.get(key, None)
+        if session is not None:
+            return session
+
+    # Do not block the event loop while another coroutine, possibly on the
+    # same loop, creates the session
+    while not _sessions_lock.acquire(blocking=False):
+        await asyncio.sleep(0.01)
+    try:
+        return await _create_session(key, genesis_file, wallet_name,
+                                     wallet_key)
+    finally:
+        _sessions_lock.release()
+
+
+async def _create_session(key: tuple, genesis_file: str, wallet_name: str,
+                          wallet_key: str) -> LedgerSession:
+    """
+    Create the session for key, unless another call already has. Called by
+    get_session with _sessions_lock held.
+    """
+    global _sessions, _sessions_pid
+    (pool_name, seed) = key
+
+    if _sessions_pid != getpid():
+        # Handles inherited from a parent process can not be used
+        if _sessions_pid is None:
+            atexit.register(_close_sessions_at_exit)
+        _sessions = {}
+        _sessions_pid = getpid()
+
+    session = _sessions.get(key, None)
+    if session is not None:
+        return session
 
     logger.debug('# 0. Set protocol version to 2')
     try:
@@ -267,10 +700,9 @@ async def get_validator_state(genesis_file: str = None, seed: str = None,
     except IndyError as e:
         logger.info("Handled IndyError")
         logger.exception(e)
-        pass
 
     logger.debug('# 1. Create ledger config from genesis txn file')
-    pool_config = json.dumps({"genesis_txn": str(genesis_file)})
+    pool_config = json.dumps({"genesis_txn": str(expanduser(genesis_file))})
     logger.debug("pool_name: %s", pool_name)
     logger.debug("pool_config: %s", pool_config)
     try:
@@ -284,11 +716,14 @@ async def get_validator_state(genesis_file: str = None, seed: str = None,
     pool_handle = await pool.open_pool_ledger(pool_name, "{}")
     logger.debug("pool_handle is set")
 
+    now = datetime.now()
+    wallet_name = "{}-{}-{}".format(wallet_name, getpid(),
+                                    now.strftime("%Y%m%dT%H%M%S"))
     wallet_config = json.dumps({'id': wallet_name})
     wallet_credentials = json.dumps({'key': wallet_key})
     try:
-        logger.debug("# 3. Create wallet %s with config %s credentials %s",
-                     wallet_name, wallet_config, wallet_credentials)
+        logger.debug("# 3. Create wallet %s with config %s", wallet_name,
+                     wallet_config)
         await wallet.create_wallet(wallet_config, wallet_credentials)
     except IndyError as e:
         logger.info("Handled IndyError")
@@ -297,97 +732,194 @@ async def get_validator_state(genesis_file: str = None, seed: str = None,
 
     wallet_handle = await wallet.open_wallet(wallet_config, wallet_credentials)
 
-    try:
-        logger.debug('# 4. Create My DID')
-        did_json = json.dumps({'seed': seed})
-        (my_did, my_verkey) = await did.create_and_store_my_did(wallet_handle,
-                                                                did_json)
-    except IndyError as e:
-        if e.error_code == ErrorCode.DidAlreadyExistsError:
-            # TODO: Generate (their_did, their_verkey) tuple from seed (like
-            #       DidUtils::create_my_did)
-            #my_did = "Th7MpTaRZVRYnPiabds81Y"
-            logger.info("Handled DidAlreadyExistsError exception...")
-            pass
-        else:
-            logger.exception(e)
-            raise e
-        pass
+    logger.debug('# 4. Create My DID')
+    did_json = json.dumps({'seed': seed})
+    (my_did, my_verkey) = await did.create_and_store_my_did(wallet_handle,
+                                                            did_json)
 
-    end_of_ledger = False
-    current_txn = 0
+    session = LedgerSession(pool_name, pool_handle, wallet_name, wallet_config,
+                            wallet_credentials, wallet_handle, my_did,
+                            my_verkey)
+    _sessions[key] = session
+    return session
 
-    logger.info("Traversing through transactions in the pool ledger")
 
-    while (not (end_of_ledger)):
-        current_txn = current_txn + 1
-        nym_transaction_request = await ledger.build_get_txn_request(
-            submitter_did=my_did, seq_no=current_txn, ledger_type="POOL")
-
-        nym_transaction_response = await ledger.sign_and_submit_request(
-            pool_handle=pool_handle, wallet_handle=wallet_handle,
-            submitter_did=my_did, request_json=nym_transaction_request)
-        txn_json_dump = json.loads(nym_transaction_response)
-
-        # No more transactions?
-        # TODO: Determine if 'result' will always be present.
-        result = txn_json_dump.get('result', None)
-        if (result is None ) :
-            break
-        result_data = result.get('data', None)
-        if (result_data is None ) :
-            break
-
-        result_data_txn_data = result_data['txn']['data']
-        result_data_txn_data_data = result_data_txn_data['data']
-
-        # Get destination field from the JSON dump of the current transaction
-        #current_dest = result_data_txn_data['dest']
-        current_dest = result_data_txn_data_data['alias']
-
-        # Add destination to the dictionary if it does not exist
-        if not( current_dest in validators.keys() ):
-            validators[current_dest] = {}
-
-        for key in result_data_txn_data_data.keys():
-            # Update attribute value of the destination if the attributes exists
-            # in the current transaction dump
+async def close_sessions(cleanup: bool = True) -> None:
+    """
+    Close every session opened by get_session in this process.
+
+    :param cleanup: Delete each session's wallet?
+        Optional. (Default: True)
+    :type cleanup: bool
+    :return: None
+    """
+    global _sessions
+    if _sessions_pid != getpid():
+        return
+    sessions = _sessions
+    _sessions = {}
+    for session in sessions.values():
+        logger.debug('Close wallet %s and pool %s', session.wallet_name,
+                     session.pool_name)
+        try:
+            await wallet.close_wallet(session.wallet_handle)
+            await pool.close_pool_ledger(session.pool_handle)
+        except IndyError:
+            logger.info("Best-effort close of wallet %s and pool %s failed.",
+                        session.wallet_name, session.pool_name)
+        if cleanup:
             try:
-                validators[current_dest][key]  = result_data_txn_data_data[key]
-            except KeyError:
+                await wallet.delete_wallet(session.wallet_config,
+                                           session.wallet_credentials)
+            except Exception as e:
+                logger.info("Best-effort deletion of wallet %s failed.",
+                            session.wallet_name)
+                #logger.exception(e)
                 pass
 
-        try:
-            validators[current_dest]['dest']  = result_data_txn_data['dest']
-        except KeyError:
-            pass
 
-        try:
-            validators[current_dest]['identifier']  = result['identifier']
-        except KeyError:
-            pass
+def _close_sessions_at_exit():
+    if not _sessions or _sessions_pid != getpid():
+        return
+    try:
+        loop = asyncio.get_event_loop()
+        if not loop.is_closed() and not loop.is_running():
+            loop.run_until_complete(close_sessions())
+    except Exception as e:
+        logger.info("Best-effort close of ledger sessions failed: %s", e)
 
-    logger.debug("Dumping data to validator-state state file")
-    with open(join(output_dir, 'validator-state'), 'w') as json_file:
-        json.dump(validators, json_file, sort_keys=True, indent=4)
 
-    logger.debug('# 5. Close wallet and pool')
-    await wallet.close_wallet(wallet_handle)
-    await pool.close_pool_ledger(pool_handle)
+async def build_node_services_request(session: LedgerSession, alias: str,
+                                      alias_did: str,
+                                      services: List[str]) -> str:
+    """
+    Build and sign a NODE transaction that sets a node's services.
+
+    :param session: The session to sign with (see get_session). Its DID must
+        be a Trustee or Steward DID.
+        Required.
+    :type session: LedgerSession
+    :param alias: The node name/alias.
+        Required.
+    :type alias: str
+    :param alias_did: The 'dest' DID associated with the alias/node.
+        Required.
+    :type alias_did: str
+    :param services: The node's services (i.e. ["VALIDATOR"]). An empty list
+        demotes the node.
+        Required.
+    :type services: List[str]
+    :return: str - The signed request
+    """
+    request = await ledger.build_node_request(session.did, alias_did,
+        json.dumps({"alias": alias, "services": services}))
+    return await ledger.sign_request(session.wallet_handle, session.did,
+                                     request)
 
-    if cleanup:
+
+async def submit_requests_at(session: LedgerSession, requests: Dict[str,str],
+                             release_at: float, timeout: int = None
+                             ) -> Dict[str,Dict]:
+    """
+    Submit signed requests at the same instant.
+
+    Waits until release_at and then submits every request at once, recording
+    the time each was submitted.
+
+    :param session: The session the requests were signed with (see
+        get_session).
+        Required.
+    :type session: LedgerSession
+    :param requests: Signed requests, keyed by any name (i.e. node alias).
+        Required.
+    :type requests: Dict[str,str]
+    :param release_at: When to submit the requests.
+        Required.
+    :type release_at: float
+    :param timeout: How long (in seconds) to wait for each reply.
+        Optional. (Default: None - wait indefinitely)
+    :type timeout: int
+    :return: Dict[str,Dict] - For each request, keyed by name, the time it was
+        submitted (submitted_at) and whether the ledger replied with a REPLY
+        (success).
+    """
+    async def submit(name, request):
+        await asyncio.sleep(max(0, release_at - time.time()))
+        submitted_at = time.time()
         try:
-            await wallet.delete_wallet(wallet_config, wallet_credentials)
-        except Exception as e:
-            logger.info("Best-effort deletion of wallet %s failed.",
-                        wallet_name)
-            #logger.exception(e)
-            pass
+            response = await asyncio.wait_for(
+                ledger.submit_request(session.pool_handle, request),
+                timeout=int(timeout) if timeout else None)
+            success = json.loads(response).get('op', None) == 'REPLY'
+            if not success:
+                logger.error("Request %s was not accepted: %s", name, response)
+        except (IndyError, asyncio.TimeoutError, ValueError) as e:
+            logger.error("Request %s failed: %s", name, e)
+            success = False
+        return name, {"submitted_at": submitted_at, "success": success}
+
+    return dict(await asyncio.gather(*[submit(name, request)
+                                       for (name, request) in requests.items()]))
+
+
+async def get_validator_info_from_ledger(genesis_file: str = None,
+                                         seed: str = None,
+                                         pool_name: str = None,
+                                         wallet_name: str = None,
+                                         wallet_key: str = None,
+                                         timeout: int = None,
+                                         nodes: List[str] = None
+                                         ) -> Dict[str, Union[Dict,None]]:
+    """
+    Get validator info from each node using a GET_VALIDATOR_INFO request.
+
+    Uses the process-wide session (see get_session), so no pool, wallet or DID
+    is created after the first call. The seed must be a Trustee or Steward
+    seed.
 
+    :param genesis_file: Relative or absolute path to the pool's genesis
+        transaction file.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_GENESIS_FILE)
+    :type genesis_file: str
+    :param seed: 32 byte string used to generate did, verkey pair.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SEED)
+    :type seed: str
+    :param pool_name: Pool name.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_POOL)
+    :type pool_name: str
+    :param wallet_name: Wallet name
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_WALLET_NAME)
+    :type wallet_name: str
+    :param wallet_key: Wallet key
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_WALLET_KEY)
+    :type wallet_key: str
+    :param timeout: How long (in seconds) to wait on the nodes to respond.
+        Optional. (Default: the SDK's default)
+    :type timeout: int
+    :param nodes: The aliases of the nodes to query.
+        Optional. (Default: All nodes)
+    :type nodes: List[str]
+    :return: Dict[str, Union[Dict,None]] - Each node's validator info (in the
+        form returned by the validator-info script), keyed by alias. None for
+        nodes that did not respond.
+    """
+    session = await get_session(genesis_file=genesis_file, seed=seed,
+                                pool_name=pool_name, wallet_name=wallet_name,
+                                wallet_key=wallet_key)
+    request = await ledger.build_get_validator_info_request(session.did)
+    request = await ledger.sign_request(session.wallet_handle, session.did,
+                                        request)
+    responses = await ledger.submit_action(
+        session.pool_handle, request, json.dumps(nodes) if nodes else None,
+        int(timeout) if timeout else None)
+
+    validator_info = {}
+    for alias, response in json.loads(responses).items():
         try:
-            await pool.delete_pool_ledger_config(pool_name)
-        except Exception as e:
-            logger.info("Best-effort deletion of %s pool ledger config failed.",
-                        pool_name)
-            #logger.exception(e)
-            pass
+            reply = json.loads(response)
+            validator_info[alias] = reply['result']['data']
+        except (ValueError, KeyError, TypeError):
+            # i.e. 'timeout'
+            logger.info("No validator info from %s: %s", alias, response)
+            validator_info[alias] = None
+    return validator_info
@@ -0,0 +1,930 @@
+"""
+In-process load generation.
+
+Drives NYM writes at an indy-node pool from the chaos process itself, using
+the ledger and did calls wrapped by chaosindy.ledger_interaction, and reports
+achieved throughput and latency. Unlike the generate_load actions, which run
+DEFAULT_CHAOS_LOAD_COMMAND on a remote client, the results are returned (and
+written to the experiment's temp dir) as structured data.
+
+A client is anything with two coroutines:
+
+- prepare() -> request: Build (and sign) the next request. Not timed.
+- submit(request) -> bool: Send the request and wait for the reply. Timed.
+  True iff the pool accepted the request.
+
+NymLoadClient sends NYMs to a real pool, building and signing each one just
+before it is sent. PresignedNymClient sends NYMs built and signed ahead of time
+(see presign_nym_requests). MockPoolClient simulates a pool, so the load
+generator can be exercised without one.
+
+Three load shapes are supported:
+
+- Closed loop (run_load): a fixed number of requests, at most concurrency in
+  flight. Clients slow down when the pool slows down.
+- Open loop (run_open_loop_load): requests arrive at a target rate regardless
+  of how the pool responds. Latency is measured from when each request was
+  due to be sent, not when it was sent, so a stalled pool (i.e. during a view
+  change) shows up as latency instead of being hidden by a lower send rate
+  (coordinated omission).
+- Burst (run_burst_load): every request is prepared first, then all are
+  submitted at once, so the measured throughput is the pool's, not the
+  client's.
+"""
+import asyncio
+import csv
+import json
+import math
+import random
+import threading
+import time
+
+from chaosindy.common import *
+from chaosindy.ledger_interaction import get_session, ledger, did, pool, wallet
+from datetime import datetime
+from logzero import logger
+from multiprocessing import Pool, cpu_count
+from os import getpid
+from os.path import join
+
+from typing import Dict, List, Union
+
+
+class NymLoadClient(object):
+    """
+    Writes a NYM for a new DID per request, as the DID of a ledger session.
+    See chaosindy.ledger_interaction.get_session
+    """
+    def __init__(self, session):
+        self.session = session
+
+    async def prepare(self) -> str:
+        (nym_did, nym_verkey) = await did.create_and_store_my_did(
+            self.session.wallet_handle, "{}")
+        request = await ledger.build_nym_request(self.session.did, nym_did,
+                                                 nym_verkey, None, None)
+        return await ledger.sign_request(self.session.wallet_handle,
+                                         self.session.did, request)
+
+    async def submit(self, request: str) -> bool:
+        response = json.loads(await ledger.submit_request(
+            self.session.pool_handle, request))
+        if response.get('op', None) != 'REPLY':
+            logger.debug("NYM rejected: %s", response)
+            return False
+        return True
+
+
+class PresignedNymClient(NymLoadClient):
+    """
+    Sends NYM requests built and signed ahead of time, in order. See
+    presign_nym_requests
+    """
+    def __init__(self, session, requests: List[str]):
+        super(PresignedNymClient, self).__init__(session)
+        self.requests = list(requests)
+        self._next = 0
+
+    async def prepare(self) -> str:
+        if self._next >= len(self.requests):
+            raise IndexError("All {} presigned requests have been " \
+                             "used".format(len(self.requests)))
+        request = self.requests[self._next]
+        self._next += 1
+        return request
+
+
+class MockPoolClient(object):
+    """
+    A stand-in for a pool, for testing the load generator offline. Each
+    request takes latency seconds, plus up to jitter seconds, and fails with
+    probability failure_rate. At most capacity requests are processed at once;
+    others queue, as they would on a saturated pool.
+    """
+    def __init__(self, latency: float = 0.01, jitter: float = 0,
+                 failure_rate: float = 0, capacity: int = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.capacity = capacity
+        self._semaphore = None
+        self.prepared = 0
+        self.submitted = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def prepare(self) -> str:
+        self.prepared += 1
+        return json.dumps({'reqId': self.prepared})
+
+    async def submit(self, request: str) -> bool:
+        if self.capacity and self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.capacity)
+        self.submitted += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self._semaphore:
+                async with self._semaphore:
+                    await self._process()
+            else:
+                await self._process()
+        finally:
+            self.in_flight -= 1
+        return random.random() >= self.failure_rate
+
+    async def _process(self):
+        await asyncio.sleep(self.latency + random.uniform(0, self.jitter))
+
+
+def percentile(values: List[float], percent: float) -> Union[float,None]:
+    """
+    Nearest-rank percentile.
+
+    :param values: Sorted values
+    :type values: List[float]
+    :param percent: 0 - 100
+    :type percent: float
+    :return: Union[float,None] - None if values is empty
+    """
+    if not values:
+        return None
+    rank = max(int(math.ceil(percent / 100.0 * len(values))), 1)
+    return values[min(rank, len(values)) - 1]
+
+
+def summarize(latencies: List[float], failed: int,
+              duration: float) -> Dict:
+    """
+    Summarize a load run.
+
+    :param latencies: Latency (in seconds) of each successful request.
+    :type latencies: List[float]
+    :param failed: Number of failed requests.
+    :type failed: int
+    :param duration: Wall clock duration (in seconds) of the run.
+    :type duration: float
+    :return: Dict - count, succeeded, failed, duration, tps (successful
+        requests per second) and latency (min, mean, p50, p95, p99 and max, in
+        seconds)
+    """
+    latencies = sorted(latencies)
+    succeeded = len(latencies)
+    return {
+        'count': succeeded + failed,
+        'succeeded': succeeded,
+        'failed': failed,
+        'duration': duration,
+        'tps': succeeded / duration if duration > 0 else 0,
+        'latency': {
+            'min': latencies[0] if latencies else None,
+            'mean': sum(latencies) / succeeded if latencies else None,
+            'p50': percentile(latencies, 50),
+            'p95': percentile(latencies, 95),
+            'p99': percentile(latencies, 99),
+            'max': latencies[-1] if latencies else None
+        }
+    }
+
+
+def read_request_records(path: str,
+    time_sent_column: str = DEFAULT_CHAOS_LOAD_TIME_SENT_COLUMN,
+    time_reply_column: str = DEFAULT_CHAOS_LOAD_TIME_REPLY_COLUMN
+    ) -> List[tuple]:
+    """
+    Read per-request records from a CSV file written by a load client.
+
+    :param path: Path to a CSV file with a header row.
+    :type path: str
+    :param time_sent_column: Column holding when each request was sent (epoch
+        seconds).
+        Optional.
+        (Default: chaosindy.common.DEFAULT_CHAOS_LOAD_TIME_SENT_COLUMN)
+    :type time_sent_column: str
+    :param time_reply_column: Column holding when each reply was received
+        (epoch seconds). Empty if the request failed.
+        Optional.
+        (Default: chaosindy.common.DEFAULT_CHAOS_LOAD_TIME_REPLY_COLUMN)
+    :type time_reply_column: str
+    :return: List[tuple] - (sent, replied) for each request. replied is None if
+        the request failed. Empty if the file does not have both columns.
+    """
+    records = []
+    with open(path, 'r', newline='') as f:
+        reader = csv.DictReader(f)
+        if not reader.fieldnames or \
+           time_sent_column not in reader.fieldnames or \
+           time_reply_column not in reader.fieldnames:
+            logger.debug("%s does not have %s and %s columns", path,
+                         time_sent_column, time_reply_column)
+            return records
+        for row in reader:
+            try:
+                sent = float(row[time_sent_column])
+            except (TypeError, ValueError):
+                continue
+            try:
+                replied = float(row[time_reply_column])
+            except (TypeError, ValueError):
+                replied = None
+            records.append((sent, replied))
+    return records
+
+
+def merge_request_records(records: Dict[str, List[tuple]],
+                          interval: float = 1) -> Dict:
+    """
+    Merge per-request records from several load clients into one time-aligned
+    series. Clients must have synchronized clocks (i.e. NTP).
+
+    :param records: (sent, replied) tuples (see read_request_records), keyed by
+        client.
+    :type records: Dict[str, List[tuple]]
+    :param interval: Bucket size in seconds.
+        Optional. (Default: 1)
+    :type interval: float
+    :return: Dict - started_at (epoch seconds of the first request), summary
+        (see summarize) and series. Each entry in series has time (epoch
+        seconds of the start of the bucket), sent, completed and failed
+        (requests per second; requests are counted as completed when the
+        reply was received, and as sent or failed when they were sent), p50
+        and p99 latency of the requests completed in the bucket, and the
+        completed rate of each client. skewed is the number of records
+        dropped because their reply was earlier than their request.
+    """
+    # A reply received before its request was sent means the client's clock
+    # was stepped (i.e. by NTP) mid-run. Drop the record, so it is not
+    # counted in the wrong bucket.
+    skewed = dict([(client, [r for r in client_records
+                             if r[1] is not None and r[1] < r[0]])
+                   for (client, client_records) in records.items()])
+    records = dict([(client, [r for r in client_records
+                              if r[1] is None or r[1] >= r[0]])
+                    for (client, client_records) in records.items()])
+    for client, client_records in skewed.items():
+        if client_records:
+            logger.warning("Dropped %d records from client %s with a reply " \
+                           "earlier than the request", len(client_records),
+                           client)
+    skewed_count = sum([len(r) for r in skewed.values()])
+    all_records = [r for client_records in records.values()
+                   for r in client_records]
+    if not all_records:
+        return {'started_at': None, 'summary': summarize([], 0, 0),
+                'series': [], 'skewed': skewed_count}
+    started_at = min([r[0] for r in all_records])
+    ended_at = max([r[1] if r[1] is not None else r[0] for r in all_records])
+
+    buckets = [{'sent': 0, 'completed': 0, 'failed': 0, 'latencies': [],
+                'clients': dict([(client, 0) for client in records])}
+               for i in range(int((ended_at - started_at) // interval) + 1)]
+    latencies = []
+    failed = 0
+    for client, client_records in records.items():
+        for (sent, replied) in client_records:
+            buckets[int((sent - started_at) // interval)]['sent'] += 1
+            if replied is None:
+                buckets[int((sent - started_at) // interval)]['failed'] += 1
+                failed += 1
+                continue
+            bucket = buckets[int((replied - started_at) // interval)]
+            bucket['completed'] += 1
+            bucket['clients'][client] += 1
+            bucket['latencies'].append(replied - sent)
+            latencies.append(replied - sent)
+
+    series = []
+    for i, bucket in enumerate(buckets):
+        bucket_latencies = sorted(bucket['latencies'])
+        series.append({
+            'time': started_at + i * interval,
+            'sent': bucket['sent'] / interval,
+            'completed': bucket['completed'] / interval,
+            'failed': bucket['failed'] / interval,
+            'p50': percentile(bucket_latencies, 50),
+            'p99': percentile(bucket_latencies, 99),
+            'clients': dict([(client, count / interval) for (client, count)
+                             in bucket['clients'].items()])
+        })
+    return {
+        'started_at': started_at,
+        'summary': summarize(latencies, failed, ended_at - started_at),
+        'series': series,
+        'skewed': skewed_count
+    }
+
+
+async def run_load(client, count: int,
+                   concurrency: int = DEFAULT_CHAOS_LOAD_CONCURRENCY,
+                   deadline: float = None) -> Dict:
+    """
+    Send count requests using client, with at most concurrency requests in
+    flight at once (closed loop: a request is sent when another completes).
+
+    :param client: See the module docstring. i.e. NymLoadClient,
+        MockPoolClient
+    :type client: object
+    :param count: How many requests to send.
+    :type count: int
+    :param concurrency: Maximum number of requests in flight.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_LOAD_CONCURRENCY)
+    :type concurrency: int
+    :param deadline: Stop sending requests after this many seconds. Requests
+        still in flight are cancelled and counted as failed.
+        Optional. (Default: None - no deadline)
+    :type deadline: float
+    :return: Dict - See summarize. Also includes timed_out (True if the
+        deadline passed before every request completed).
+    """
+    count = int(count)
+    concurrency = max(min(int(concurrency), count), 1)
+    latencies = []
+    failures = [0]
+    remaining = [count]
+
+    async def worker():
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            try:
+                request = await client.prepare()
+                start = time.perf_counter()
+                ok = await client.submit(request)
+            except asyncio.CancelledError:
+                failures[0] += 1
+                raise
+            except Exception as e:
+                logger.debug("Request failed: %s", e)
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - start)
+            else:
+                failures[0] += 1
+
+    started = time.perf_counter()
+    workers = [asyncio.ensure_future(worker()) for i in range(concurrency)]
+    (done, pending) = await asyncio.wait(
+        workers, timeout=float(deadline) if deadline is not None else None)
+    if pending:
+        logger.info("Cancelling requests in flight after %s seconds",
+                    deadline)
+        for task in pending:
+            task.cancel()
+        await asyncio.wait(pending)
+    for task in done:
+        # Re-raise anything unexpected
+        task.result()
+    stats = summarize(latencies, failures[0], time.perf_counter() - started)
+    stats['timed_out'] = len(pending) > 0
+    return stats
+
+
+def arrival_times(rate: float, duration: float,
+                  arrival: str = DEFAULT_CHAOS_LOAD_ARRIVAL) -> List[float]:
+    """
+    When (in seconds from the start of a run) each request is due to be sent.
+
+    :param rate: Target requests per second.
+    :type rate: float
+    :param duration: Length of the run in seconds.
+    :type duration: float
+    :param arrival: 'poisson' (exponentially distributed gaps, as independent
+        clients would produce) or 'uniform' (evenly spaced).
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_LOAD_ARRIVAL)
+    :type arrival: str
+    :return: List[float]
+    """
+    if rate <= 0:
+        raise ValueError("rate must be greater than 0")
+    if arrival not in ('poisson', 'uniform'):
+        raise ValueError("Unknown arrival distribution {}".format(arrival))
+    times = []
+    t = 0
+    while True:
+        if arrival == 'poisson':
+            t += random.expovariate(rate)
+        else:
+            t = len(times) / rate
+        if t >= duration:
+            return times
+        times.append(t)
+
+
+def time_series(offered: List[float], completed: List[tuple],
+                interval: float = 1) -> List[Dict]:
+    """
+    Bucket an open loop run into intervals.
+
+    :param offered: When (in seconds from the start of the run) each request
+        was due to be sent.
+    :type offered: List[float]
+    :param completed: (when, latency, ok) for each request, in seconds from the
+        start of the run.
+    :type completed: List[tuple]
+    :param interval: Bucket size in seconds.
+        Optional. (Default: 1)
+    :type interval: float
+    :return: List[Dict] - time (start of the bucket, in seconds from the start
+        of the run), offered, completed and failed (requests per second), and
+        the p50 and p99 latency of the requests completed in the bucket.
+    """
+    last = max([t for t in offered] + [c[0] for c in completed] + [0])
+    buckets = [{'offered': 0, 'completed': 0, 'failed': 0, 'latencies': []}
+               for i in range(int(last // interval) + 1)]
+    for t in offered:
+        buckets[int(t // interval)]['offered'] += 1
+    for (t, latency, ok) in completed:
+        bucket = buckets[int(t // interval)]
+        if ok:
+            bucket['completed'] += 1
+            bucket['latencies'].append(latency)
+        else:
+            bucket['failed'] += 1
+
+    series = []
+    for i, bucket in enumerate(buckets):
+        latencies = sorted(bucket['latencies'])
+        series.append({
+            'time': i * interval,
+            'offered': bucket['offered'] / interval,
+            'completed': bucket['completed'] / interval,
+            'failed': bucket['failed'] / interval,
+            'p50': percentile(latencies, 50),
+            'p99': percentile(latencies, 99)
+        })
+    return series
+
+
+async def run_open_loop_load(client, rate: float, duration: float,
+    arrival: str = DEFAULT_CHAOS_LOAD_ARRIVAL,
+    max_in_flight: int = None, stop: threading.Event = None,
+    deadline: float = None) -> Dict:
+    """
+    Send requests using client at a target rate for duration seconds (or until
+    stop is set), without waiting for earlier requests to complete (open
+    loop).
+
+    Each request's latency is measured from the time it was due to be sent. If
+    max_in_flight requests are already outstanding when a request is due, the
+    request is counted as failed instead of being sent.
+
+    :param client: See the module docstring. i.e. NymLoadClient,
+        MockPoolClient
+    :type client: object
+    :param rate: Target requests per second.
+    :type rate: float
+    :param duration: How long (in seconds) to offer load.
+    :type duration: float
+    :param arrival: 'poisson' or 'uniform'. See arrival_times.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_LOAD_ARRIVAL)
+    :type arrival: str
+    :param max_in_flight: Maximum number of outstanding requests.
+        Optional. (Default: No limit)
+    :type max_in_flight: int
+    :param stop: Stop offering load once set. Requests already sent are
+        waited on.
+        Optional. (Default: None)
+    :type stop: threading.Event
+    :param deadline: Stop offering load after this many seconds, and cancel
+        requests still in flight, counting them as failed. Unlike stop,
+        requests already sent are not waited on, so a stalled pool can not
+        keep the run from ending.
+        Optional. (Default: None - no deadline)
+    :type deadline: float
+    :return: Dict - See summarize. Also includes started_at (epoch seconds),
+        rate (the target), offered_tps, dropped (requests not sent because of
+        max_in_flight), series (see time_series) and timed_out (True if the
+        deadline passed before every request completed).
+    """
+    loop = asyncio.get_event_loop()
+    offered = arrival_times(float(rate), float(duration), arrival)
+    latencies = []
+    completed = []
+    dropped = [0]
+    in_flight = set()
+
+    async def send(due):
+        ok = False
+        try:
+            request = await client.prepare()
+            ok = await client.submit(request)
+        except Exception as e:
+            logger.debug("Request failed: %s", e)
+        now = loop.time() - started
+        completed.append((now, now - due, ok))
+        if ok:
+            latencies.append(now - due)
+
+    started_at = time.time()
+    started = loop.time()
+    deadline_at = started + float(deadline) if deadline is not None else None
+    timed_out = False
+    for (index, due) in enumerate(offered):
+        if deadline_at is not None and started + due >= deadline_at:
+            logger.info("Stopped offering load after %d requests, at the " \
+                        "%s second deadline", index, deadline)
+            offered = offered[:index]
+            timed_out = True
+            break
+        delay = started + due - loop.time()
+        while delay > 0 and not (stop and stop.is_set()):
+            await asyncio.sleep(min(delay, 0.5))
+            delay = started + due - loop.time()
+        if stop and stop.is_set():
+            logger.debug("Stopped offering load after %d requests", index)
+            offered = offered[:index]
+            break
+        if max_in_flight and len(in_flight) >= int(max_in_flight):
+            dropped[0] += 1
+            completed.append((loop.time() - started, None, False))
+            continue
+        task = asyncio.ensure_future(send(due))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+    if in_flight:
+        timeout = None
+        if deadline_at is not None:
+            timeout = max(deadline_at - loop.time(), 0)
+        (done, pending) = await asyncio.wait(list(in_flight), timeout=timeout)
+        if pending:
+            logger.info("Cancelling %d requests in flight at the %s second " \
+                        "deadline", len(pending), deadline)
+            timed_out = True
+            for task in pending:
+                task.cancel()
+            await asyncio.wait(pending)
+            now = loop.time() - started
+            completed.extend([(now, None, False) for task in pending])
+
+    offered_duration = min(loop.time() - started, float(duration))
+    stats = summarize(latencies, len(completed) - len(latencies),
+                      loop.time() - started)
+    stats.update({
+        'started_at': started_at,
+        'rate': float(rate),
+        'offered_tps': len(offered) / offered_duration \
+                       if offered_duration > 0 else 0,
+        'dropped': dropped[0],
+        'series': time_series(offered, completed),
+        'timed_out': timed_out
+    })
+    return stats
+
+
+async def run_burst_load(client, count: int, max_in_flight: int = None
+                         ) -> Dict:
+    """
+    Prepare count requests using client, then submit them all at once (or at
+    most max_in_flight at a time). Only the submission is timed.
+
+    :param client: See the module docstring. i.e. PresignedNymClient,
+        MockPoolClient
+    :type client: object
+    :param count: How many requests to send.
+    :type count: int
+    :param max_in_flight: Maximum number of outstanding requests.
+        Optional. (Default: No limit)
+    :type max_in_flight: int
+    :return: Dict - See summarize
+    """
+    count = int(count)
+    latencies = []
+    failures = [0]
+    requests = []
+    for i in range(count):
+        try:
+            requests.append(await client.prepare())
+        except Exception as e:
+            logger.debug("Failed to prepare request: %s", e)
+            failures[0] += 1
+    semaphore = asyncio.Semaphore(int(max_in_flight)) if max_in_flight \
+        else None
+
+    async def send(request):
+        start = time.perf_counter()
+        try:
+            if semaphore:
+                async with semaphore:
+                    ok = await client.submit(request)
+            else:
+                ok = await client.submit(request)
+        except Exception as e:
+            logger.debug("Request failed: %s", e)
+            ok = False
+        if ok:
+            latencies.append(time.perf_counter() - start)
+        else:
+            failures[0] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*[send(request) for request in requests])
+    return summarize(latencies, failures[0], time.perf_counter() - started)
+
+
+def _presign_nym_batch(args: tuple) -> List[str]:
+    """
+    Build and sign a batch of NYM requests in a process pool worker. Each
+    worker uses its own, temporary, wallet holding the submitter's DID.
+
+    :param args: (count, seed, wallet_key)
+    :type args: tuple
+    :return: List[str] - Signed NYM requests
+    """
+    (count, seed, wallet_key) = args
+
+    async def presign():
+        await pool.set_protocol_version(2)
+        wallet_name = "{}-presign-{}-{}".format(
+            DEFAULT_CHAOS_WALLET_NAME, getpid(),
+            datetime.now().strftime("%Y%m%dT%H%M%S%f"))
+        wallet_config = json.dumps({'id': wallet_name})
+        wallet_credentials = json.dumps({'key': wallet_key})
+        await wallet.create_wallet(wallet_config, wallet_credentials)
+        wallet_handle = await wallet.open_wallet(wallet_config,
+                                                 wallet_credentials)
+        try:
+            (submitter_did, submitter_verkey) = \
+                await did.create_and_store_my_did(
+                    wallet_handle, json.dumps({'seed': seed}))
+            requests = []
+            for i in range(count):
+                (nym_did, nym_verkey) = await did.create_and_store_my_did(
+                    wallet_handle, "{}")
+                request = await ledger.build_nym_request(
+                    submitter_did, nym_did, nym_verkey, None, None)
+                requests.append(await ledger.sign_request(
+                    wallet_handle, submitter_did, request))
+            return requests
+        finally:
+            await wallet.close_wallet(wallet_handle)
+            await wallet.delete_wallet(wallet_config, wallet_credentials)
+
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(presign())
+    finally:
+        loop.close()
+
+
+def presign_nym_requests(count: int, seed: str = None,
+                         wallet_key: str = None,
+                         processes: int = None) -> List[str]:
+    """
+    Build and sign count NYM requests (each for a new DID) ahead of time,
+    spreading the key generation and signing across a process pool.
+
+    :param count: How many requests to build.
+    :type count: int
+    :param seed: 32 byte string used to generate the submitter's did, verkey
+        pair. The seed must be the seed for a Trustee, Steward, or Trust
+        Anchor.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SEED)
+    :type seed: str
+    :param wallet_key: Key for the workers' temporary wallets.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_WALLET_KEY)
+    :type wallet_key: str
+    :param processes: Number of worker processes.
+        Optional. (Default: multiprocessing.cpu_count())
+    :type processes: int
+    :return: List[str]
+    """
+    if seed is None:
+        seed = DEFAULT_CHAOS_SEED
+
+    if wallet_key is None:
+        wallet_key = DEFAULT_CHAOS_WALLET_KEY
+
+    count = int(count)
+    processes = int(processes) if processes else cpu_count()
+    # Split count into one batch per worker
+    batches = [count // processes] * processes
+    for i in range(count % processes):
+        batches[i] += 1
+    with Pool(processes) as workers:
+        results = workers.map(_presign_nym_batch,
+                              [(batch, seed, wallet_key)
+                               for batch in batches if batch])
+    return [request for result in results for request in result]
+
+
+async def generate_nym_load_async(count: int,
+    concurrency: int = DEFAULT_CHAOS_LOAD_CONCURRENCY,
+    genesis_file: str = None, seed: str = None, pool_name: str = None,
+    wallet_name: str = None, wallet_key: str = None, rate: float = None,
+    duration: float = DEFAULT_CHAOS_LOAD_DURATION,
+    arrival: str = DEFAULT_CHAOS_LOAD_ARRIVAL,
+    stop: threading.Event = None, timeout: float = None) -> Dict:
+    """
+    Write count NYMs to the pool, with at most concurrency in flight at once.
+    If rate is given, write NYMs at rate per second for duration seconds, or
+    until stop is set (open loop) instead. The load stops timeout seconds
+    after the call (see the deadline of run_load and run_open_loop_load),
+    and asyncio.TimeoutError is raised if no ledger session could be opened
+    by then. See generate_nym_load.
+    """
+    started = time.perf_counter()
+    session = await asyncio.wait_for(
+        get_session(genesis_file=genesis_file, seed=seed, pool_name=pool_name,
+                    wallet_name=wallet_name, wallet_key=wallet_key),
+        timeout=timeout)
+    deadline = None
+    if timeout is not None:
+        deadline = max(float(timeout) - (time.perf_counter() - started), 0)
+    if rate:
+        return await run_open_loop_load(NymLoadClient(session), rate,
+                                        duration, arrival=arrival, stop=stop,
+                                        deadline=deadline)
+    return await run_load(NymLoadClient(session), count,
+                          concurrency=concurrency, deadline=deadline)
+
+
+def generate_nym_load(genesis_file: str, count: Union[str,int] = 100,
+    concurrency: Union[str,int] = DEFAULT_CHAOS_LOAD_CONCURRENCY,
+    seed: str = DEFAULT_CHAOS_SEED, pool_name: str = DEFAULT_CHAOS_POOL,
+    wallet_name: str = DEFAULT_CHAOS_WALLET_NAME,
+    wallet_key: str = DEFAULT_CHAOS_WALLET_KEY,
+    timeout: Union[str,int] = DEFAULT_CHAOS_LOAD_TIMEOUT,
+    rate: Union[str,float] = None,
+    duration: Union[str,float] = DEFAULT_CHAOS_LOAD_DURATION,
+    arrival: str = DEFAULT_CHAOS_LOAD_ARRIVAL) -> Dict:
+    """
+    Write NYMs to the pool from the chaos process and measure throughput and
+    latency.
+
+    By default, count NYMs are written with at most concurrency in flight
+    (closed loop). If rate is given, NYMs are written at that rate for duration
+    seconds regardless of how the pool responds (open loop). See the
+    chaosindy.load module docstring.
+
+    The results are also written to the nym-load file in the experiment's temp
+    dir.
+
+    :param genesis_file: Relative or absolute path to the pool's genesis
+        transaction file.
+        Required.
+    :type genesis_file: str
+    :param count: How many NYMs to write.
+        Optional. (Default: 100)
+    :type count: Union[str,int]
+    :param concurrency: Maximum number of NYM requests in flight (closed
+        loop only).
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_LOAD_CONCURRENCY)
+    :type concurrency: Union[str,int]
+    :param rate: Target NYMs per second (open loop). count is ignored if rate
+        is given.
+        Optional. (Default: None - closed loop)
+    :type rate: Union[str,float]
+    :param duration: How long (in seconds) to offer open loop load.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_LOAD_DURATION)
+    :type duration: Union[str,float]
+    :param arrival: Open loop arrivals: 'poisson' or 'uniform'.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_LOAD_ARRIVAL)
+    :type arrival: str
+    :param seed: 32 byte string used to generate did, verkey pair. The seed must
+        be the seed for a Trustee, Steward, or Trust Anchor.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SEED)
+    :type seed: str
+    :param pool_name: Pool name
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_POOL)
+    :type pool_name: str
+    :param wallet_name: Wallet name
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_WALLET_NAME)
+    :type wallet_name: str
+    :param wallet_key: Wallet key
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_WALLET_KEY)
+    :type wallet_key: str
+    :param timeout: How long (in seconds) the load is allowed to run. Once
+        it passes, no more NYMs are sent and those still in flight are counted
+        as failed. The stats gathered until then are returned with timed_out
+        set.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_LOAD_TIMEOUT)
+    :type timeout: Union[str,int]
+    :return: Dict - See summarize (closed loop) or run_open_loop_load (open
+        loop). Empty if no ledger session could be opened before the timeout.
+    """
+    logger.debug("genesis_file: %s count: %s concurrency: %s pool_name: %s " \
+                 "timeout: %s rate: %s duration: %s arrival: %s", genesis_file,
+                 count, concurrency, pool_name, timeout, rate, duration,
+                 arrival)
+    loop = asyncio.get_event_loop()
+    try:
+        stats = loop.run_until_complete(
+            generate_nym_load_async(int(count), concurrency=int(concurrency),
+                                    genesis_file=genesis_file, seed=seed,
+                                    pool_name=pool_name,
+                                    wallet_name=wallet_name,
+                                    wallet_key=wallet_key,
+                                    rate=float(rate) if rate else None,
+                                    duration=float(duration),
+                                    arrival=arrival, timeout=int(timeout)))
+    except asyncio.TimeoutError:
+        logger.error("Failed to open a ledger session within %s seconds",
+                     timeout)
+        return {}
+
+    if stats['timed_out']:
+        logger.error("NYM load timed out after %s seconds. Requests still " \
+                     "in flight were counted as failed.", timeout)
+    logger.info("NYM load: %d/%d succeeded, %.2f tps, p50 %s p95 %s p99 %s",
+                stats['succeeded'], stats['count'], stats['tps'],
+                stats['latency']['p50'], stats['latency']['p95'],
+                stats['latency']['p99'])
+    with open(join(get_chaos_temp_dir(), 'nym-load'), 'w') as f:
+        json.dump(stats, f, sort_keys=True, indent=4)
+    return stats
+
+
+async def generate_nym_burst_async(requests: List[str],
+    max_in_flight: int = None, genesis_file: str = None, seed: str = None,
+    pool_name: str = None, wallet_name: str = None,
+    wallet_key: str = None) -> Dict:
+    """
+    Submit presigned NYM requests in a burst. See generate_nym_burst.
+    """
+    session = await get_session(genesis_file=genesis_file, seed=seed,
+                                pool_name=pool_name, wallet_name=wallet_name,
+                                wallet_key=wallet_key)
+    return await run_burst_load(PresignedNymClient(session, requests),
+                                len(requests), max_in_flight=max_in_flight)
+
+
+def generate_nym_burst(genesis_file: str, count: Union[str,int] = 1000,
+    max_in_flight: Union[str,int] = None,
+    processes: Union[str,int] = None,
+    seed: str = DEFAULT_CHAOS_SEED, pool_name: str = DEFAULT_CHAOS_POOL,
+    wallet_name: str = DEFAULT_CHAOS_WALLET_NAME,
+    wallet_key: str = DEFAULT_CHAOS_WALLET_KEY,
+    timeout: Union[str,int] = DEFAULT_CHAOS_LOAD_TIMEOUT) -> Dict:
+    """
+    Measure how fast the pool orders NYMs.
+
+    count NYM requests are built and signed up front (see
+    presign_nym_requests), then submitted as fast as the pool accepts them (see
+    run_burst_load), so client side crypto is not part of the measurement.
+
+    The results are also written to the nym-burst file in the experiment's
+    temp dir.
+
+    :param genesis_file: Relative or absolute path to the pool's genesis
+        transaction file.
+        Required.
+    :type genesis_file: str
+    :param count: How many NYMs to write.
+        Optional. (Default: 1000)
+    :type count: Union[str,int]
+    :param max_in_flight: Maximum number of outstanding NYM requests.
+        Optional. (Default: No limit)
+    :type max_in_flight: Union[str,int]
+    :param processes: Number of processes used to sign requests.
+        Optional. (Default: multiprocessing.cpu_count())
+    :type processes: Union[str,int]
+    :param seed: 32 byte string used to generate did, verkey pair. The seed must
+        be the seed for a Trustee, Steward, or Trust Anchor.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SEED)
+    :type seed: str
+    :param pool_name: Pool name
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_POOL)
+    :type pool_name: str
+    :param wallet_name: Wallet name
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_WALLET_NAME)
+    :type wallet_name: str
+    :param wallet_key: Wallet key
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_WALLET_KEY)
+    :type wallet_key: str
+    :param timeout: How long (in seconds) the burst is allowed to run, not
+        including signing.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_LOAD_TIMEOUT)
+    :type timeout: Union[str,int]
+    :return: Dict - See summarize. Also includes presign_duration (seconds).
+        Empty if the burst timed out.
+    """
+    logger.debug("genesis_file: %s count: %s max_in_flight: %s processes: %s " \
+                 "pool_name: %s timeout: %s", genesis_file, count,
+                 max_in_flight, processes, pool_name, timeout)
+    started = time.perf_counter()
+    requests = presign_nym_requests(int(count), seed=seed,
+                                    wallet_key=wallet_key,
+                                    processes=processes)
+    presign_duration = time.perf_counter() - started
+    logger.info("Signed %d NYM requests in %.2f seconds", len(requests),
+                presign_duration)
+
+    loop = asyncio.get_event_loop()
+    try:
+        stats = loop.run_until_complete(asyncio.wait_for(
+            generate_nym_burst_async(requests,
+                max_in_flight=int(max_in_flight) if max_in_flight else None,
+                genesis_file=genesis_file, seed=seed, pool_name=pool_name,
+                wallet_name=wallet_name, wallet_key=wallet_key),
+            timeout=int(timeout)))
+    except asyncio.TimeoutError:
+        logger.error("NYM burst timed out after %s seconds", timeout)
+        return {}
+    stats['presign_duration'] = presign_duration
+
+    logger.info("NYM burst: %d/%d succeeded, %.2f tps, p50 %s p95 %s p99 %s",
+                stats['succeeded'], stats['count'], stats['tps'],
+                stats['latency']['p50'], stats['latency']['p95'],
+                stats['latency']['p99'])
+    with open(join(get_chaos_temp_dir(), 'nym-burst'), 'w') as f:
+        json.dump(stats, f, sort_keys=True, indent=4)
+    return stats
@@ -0,0 +1,398 @@
+import json
+import time
+from chaosindy.common import *
+from chaosindy.probes.validator_info import ValidatorInfoSnapshot
+from logzero import logger
+from os.path import join
+from time import sleep
+from typing import Dict, List, Union
+
+
+def _ledger_catchup(snapshot: ValidatorInfoSnapshot,
+                    alias: str) -> Union[Dict[str,Dict],None]:
+    """
+    Return the status and number of transactions in catchup of each ledger a
+    node reports, keyed by ledger id. None if the node did not return
+    validator info.
+    """
+    catchup_status = snapshot.catchup_status(alias)
+    if not catchup_status:
+        return None
+    statuses = catchup_status.get('Ledger_statuses', {})
+    txns = catchup_status.get('Number_txns_in_catchup', {})
+    return dict([(ledger, {
+        "status": status,
+        "txns_in_catchup": txns.get(ledger, 0)
+    }) for (ledger, status) in statuses.items()])
+
+
+def track_catchup(genesis_file: str, aliases: Union[str,List[str]],
+    deadline: Union[str,int,float] = DEFAULT_CHAOS_CATCHUP_DEADLINE,
+    interval: Union[str,int,float] = DEFAULT_CHAOS_CATCHUP_SAMPLE_INTERVAL,
+    started_at: float = None, did: str = DEFAULT_CHAOS_DID,
+    seed: str = DEFAULT_CHAOS_SEED,
+    wallet_name: str = DEFAULT_CHAOS_WALLET_NAME,
+    wallet_key: str = DEFAULT_CHAOS_WALLET_KEY, pool: str = DEFAULT_CHAOS_POOL,
+    timeout: Union[str,int] = DEFAULT_CHAOS_GET_VALIDATOR_INFO_TIMEOUT,
+    ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE,
+    source: int = DEFAULT_CHAOS_VALIDATOR_INFO_SOURCE) -> Dict:
+    """
+    Sample the catchup status of nodes until every ledger on every node is
+    synced or the deadline passes.
+
+    Intended to be called right after nodes are started or unblocked (i.e.
+    resurrect_random_nodes or unblock_node_port_random) instead of sleeping
+    for a fixed time before checking if they are caught up. Validator info is
+    collected every interval seconds (see
+    chaosindy.probes.validator_info.ValidatorInfoSnapshot). A node is synced
+    once it reports a 'synced' status for every ledger. Nodes are no longer
+    waited on once they are synced.
+
+    For each node and ledger, the time from started_at to the first sample on
+    which the ledger was synced (time_to_synced) and the rate at which
+    transactions were caught up (txns_per_sec, the number of transactions in
+    catchup over time_to_synced) are reported. Both are only as precise as the
+    sample interval and the freshness of the validator info source.
+
+    The result is written to a 'catchup' file in the chaos temp dir.
+
+    :param genesis_file: The relative or absolute path to a genesis file.
+        Required.
+    :type genesis_file: str
+    :param aliases: The nodes to track. A list or a JSON list of node aliases.
+        Required.
+    :type aliases: Union[str,List[str]]
+    :param deadline: How long (in seconds) after started_at to wait for nodes
+        to sync.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_CATCHUP_DEADLINE)
+    :type deadline: Union[str,int,float]
+    :param interval: How long (in seconds) to wait between samples.
+        Optional.
+        (Default: chaosindy.common.DEFAULT_CHAOS_CATCHUP_SAMPLE_INTERVAL)
+    :type interval: Union[str,int,float]
+    :param started_at: When catchup started (i.e. when the nodes were started
+        or unblocked).
+        Optional. (Default: now)
+    :type started_at: float
+    :param did: A steward or trustee DID. A did OR a seed is required, but not
+        both. The did will be used if both are given. Needed to get validator
+        info.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_DID)
+    :type did: str
+    :param seed : A steward or trustee seed. A did OR a seed is required, but
+        not both. The did will be used if both are given. Needed to get
+        validator info.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SEED)
+    :type seed: str
+    :param wallet_name: The name of the wallet to use when getting validator
+        info.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_WALLET_NAME)
+    :type wallet_name: str
+    :param wallet_key: The key to use when opening the wallet designated by
+        wallet_name.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_WALLET_KEY)
+    :type wallet_key: str
+    :param pool: The pool to connect to when getting validator info.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_POOL)
+    :type pool: str
+    :param timeout: How long getting validator info can take before timing
+        out.
+        Optional.
+        (Default: chaosindy.common.DEFAULT_CHAOS_GET_VALIDATOR_INFO_TIMEOUT)
+    :type timeout: Union[str,int]
+    :param ssh_config_file: The relative or absolute path to the SSH config
+        file.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SSH_CONFIG_FILE)
+    :type ssh_config_file: str
+    :param source: The source of validator info. See
+        chaosindy.probes.validator_info.get_validator_info.
+        Optional. (Default: chaosindy.common.DEFAULT_VALIDATOR_INFO_SOURCE)
+    :type source: int
+    :return: Dict - synced (True if every node synced before the deadline),
+        started_at, samples and, keyed by alias in nodes, whether each node
+        synced, its time_to_synced and, keyed by ledger id in ledgers, each
+        ledger's status, synced_at, time_to_synced, txns_in_catchup and
+        txns_per_sec.
+    """
+    if isinstance(aliases, str):
+        aliases = json.loads(aliases)
+    if started_at is None:
+        started_at = time.time()
+    deadline_at = started_at + float(deadline)
+    result = {
+        "synced": False,
+        "started_at": started_at,
+        "samples": 0,
+        "nodes": dict([(alias, {
+            "synced": False,
+            "time_to_synced": None,
+            "ledgers": {}
+        }) for alias in aliases])
+    }
+    pending = list(aliases)
+    while pending:
+        snapshot = ValidatorInfoSnapshot.collect(genesis_file, ttl=0, did=did,
+            seed=seed, wallet_name=wallet_name, wallet_key=wallet_key,
+            pool=pool, timeout=timeout, ssh_config_file=ssh_config_file,
+            source=source)
+        sampled_at = time.time()
+        result['samples'] += 1
+        for alias in list(pending):
+            ledgers = _ledger_catchup(snapshot, alias)
+            if not ledgers:
+                logger.debug("No catchup status for %s", alias)
+                continue
+            node = result['nodes'][alias]
+            for ledger, catchup in ledgers.items():
+                tracked = node['ledgers'].setdefault(ledger, {
+                    "synced_at": None,
+                    "time_to_synced": None,
+                    "txns_per_sec": None
+                })
+                tracked['status'] = catchup['status']
+                tracked['txns_in_catchup'] = catchup['txns_in_catchup']
+                if catchup['status'] != 'synced':
+                    tracked['synced_at'] = None
+                    tracked['time_to_synced'] = None
+                    tracked['txns_per_sec'] = None
+                elif tracked['synced_at'] is None:
+                    tracked['synced_at'] = sampled_at
+                    tracked['time_to_synced'] = sampled_at - started_at
+                    if tracked['time_to_synced'] > 0:
+                        tracked['txns_per_sec'] = \
+                            catchup['txns_in_catchup'] / \
+                            tracked['time_to_synced']
+            if all([ledger['status'] == 'synced'
+                    for ledger in node['ledgers'].values()]):
+                node['synced'] = True
+                node['time_to_synced'] = sampled_at - started_at
+                logger.info("%s synced after %f seconds", alias,
+                            node['time_to_synced'])
+                pending.remove(alias)
+        if not pending:
+            result['synced'] = True
+            break
+        remaining = deadline_at - time.time()
+        if remaining <= 0:
+            logger.error("%s not synced after %s seconds", pending, deadline)
+            break
+        sleep(min(float(interval), remaining))
+
+    with open(join(get_chaos_temp_dir(), "catchup"), 'w') as f:
+        f.write(json.dumps(result))
+    return result
+
+
+def get_ledger_consistency(genesis_file: str,
+    aliases: Union[str,List[str]] = None,
+    ledgers: Union[str,List[str]] = None, did: str = DEFAULT_CHAOS_DID,
+    seed: str = DEFAULT_CHAOS_SEED,
+    wallet_name: str = DEFAULT_CHAOS_WALLET_NAME,
+    wallet_key: str = DEFAULT_CHAOS_WALLET_KEY, pool: str = DEFAULT_CHAOS_POOL,
+    timeout: Union[str,int] = DEFAULT_CHAOS_GET_VALIDATOR_INFO_TIMEOUT,
+    ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE,
+    source: int = DEFAULT_CHAOS_VALIDATOR_INFO_SOURCE) -> Dict:
+    """
+    Compare the size and committed merkle root of each ledger across nodes,
+    using a single validator info snapshot.
+
+    For each ledger, the largest size any node reports is taken as the size of
+    the ledger. Nodes reporting fewer transactions are lagging. Nodes that
+    report the same size as other nodes, but a different root, have diverged.
+    The root most nodes of a given size report is taken as the correct one.
+
+    The result is written to a 'ledger_consistency' file in the chaos temp dir.
+
+    :param genesis_file: The relative or absolute path to a genesis file.
+        Required.
+    :type genesis_file: str
+    :param aliases: The nodes to compare. A list or a JSON list of node
+        aliases.
+        Optional. (Default: all nodes in the genesis file)
+    :type aliases: Union[str,List[str]]
+    :param ledgers: The ledger ids to compare. A list or a JSON list.
+        Optional. (Default: pool (0), domain (1), config (2) and audit (3))
+    :type ledgers: Union[str,List[str]]
+    :param did: A steward or trustee DID. A did OR a seed is required, but not
+        both. The did will be used if both are given. Needed to get validator
+        info.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_DID)
+    :type did: str
+    :param seed : A steward or trustee seed. A did OR a seed is required, but
+        not both. The did will be used if both are given. Needed to get
+        validator info.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SEED)
+    :type seed: str
+    :param wallet_name: The name of the wallet to use when getting validator
+        info.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_WALLET_NAME)
+    :type wallet_name: str
+    :param wallet_key: The key to use when opening the wallet designated by
+        wallet_name.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_WALLET_KEY)
+    :type wallet_key: str
+    :param pool: The pool to connect to when getting validator info.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_POOL)
+    :type pool: str
+    :param timeout: How long getting validator info can take before timing
+        out.
+        Optional.
+        (Default: chaosindy.common.DEFAULT_CHAOS_GET_VALIDATOR_INFO_TIMEOUT)
+    :type timeout: Union[str,int]
+    :param ssh_config_file: The relative or absolute path to the SSH config
+        file.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SSH_CONFIG_FILE)
+    :type ssh_config_file: str
+    :param source: The source of validator info. See
+        chaosindy.probes.validator_info.get_validator_info.
+        Optional. (Default: chaosindy.common.DEFAULT_VALIDATOR_INFO_SOURCE)
+    :type source: int
+    :return: Dict - consistent (True if every node returned validator info
+        for every ledger and none are lagging or divergent on any ledger),
+        unreachable (nodes that did not return validator info) and, keyed by
+        ledger id in ledgers, the ledger's size and root, each node's size and
+        the lagging, divergent and missing (returned validator info, but not
+        for this ledger) nodes.
+    """
+    if isinstance(aliases, str):
+        aliases = json.loads(aliases)
+    if isinstance(ledgers, str):
+        ledgers = json.loads(ledgers)
+    snapshot = ValidatorInfoSnapshot.collect(genesis_file, did=did, seed=seed,
+        wallet_name=wallet_name, wallet_key=wallet_key, pool=pool,
+        timeout=timeout, ssh_config_file=ssh_config_file, source=source)
+    if aliases is None:
+        aliases = snapshot.aliases
+    if ledgers is None:
+        ledgers = sorted(LEDGER_METRIC_NAMES.keys())
+    ledgers = [str(ledger) for ledger in ledgers]
+
+    result = {
+        "consistent": True,
+        "unreachable": [],
+        "ledgers": dict([(ledger, {
+            "size": None,
+            "root": None,
+            "sizes": {},
+            "lagging": [],
+            "divergent": [],
+            "missing": []
+        }) for ledger in ledgers])
+    }
+    for alias in aliases:
+        if snapshot.get(alias) is None:
+            result['unreachable'].append(alias)
+            continue
+        sizes = snapshot.ledger_sizes(alias)
+        root_hashes = snapshot.ledger_root_hashes(alias)
+        for ledger in ledgers:
+            if ledger not in sizes:
+                result['ledgers'][ledger]['missing'].append(alias)
+                continue
+            result['ledgers'][ledger]['sizes'][alias] = \
+                (sizes[ledger], root_hashes.get(ledger, None))
+
+    for ledger, report in result['ledgers'].items():
+        if report['missing']:
+            result['consistent'] = False
+            logger.error("Ledger %s: not reported by %s", ledger,
+                         report['missing'])
+        # Group nodes by size, then by root
+        by_size = {}
+        for alias, (size, root_hash) in report['sizes'].items():
+            by_size.setdefault(size, {}).setdefault(root_hash, []).append(
+                alias)
+        if not by_size:
+            continue
+        report['size'] = max(by_size.keys())
+        for size, by_root in by_size.items():
+            roots = sorted(by_root.items(),
+                           key=lambda item: len(item[1]), reverse=True)
+            if size == report['size']:
+                report['root'] = roots[0][0]
+            else:
+                for root_hash, nodes in roots:
+                    report['lagging'].extend(nodes)
+            for root_hash, nodes in roots[1:]:
+                report['divergent'].extend(nodes)
+        report['sizes'] = dict([(alias, size) for (alias, (size, root_hash))
+                                in report['sizes'].items()])
+        report['lagging'].sort()
+        report['divergent'].sort()
+        if report['lagging'] or report['divergent']:
+            result['consistent'] = False
+            logger.error("Ledger %s: %s lagging and %s divergent at size %s",
+                         ledger, report['lagging'], report['divergent'],
+                         report['size'])
+    if result['unreachable']:
+        result['consistent'] = False
+        logger.error("No validator info from %s", result['unreachable'])
+
+    with open(join(get_chaos_temp_dir(), "ledger_consistency"), 'w') as f:
+        f.write(json.dumps(result))
+    return result
+
+
+def ledgers_are_consistent(genesis_file: str,
+    aliases: Union[str,List[str]] = None,
+    ledgers: Union[str,List[str]] = None, did: str = DEFAULT_CHAOS_DID,
+    seed: str = DEFAULT_CHAOS_SEED,
+    wallet_name: str = DEFAULT_CHAOS_WALLET_NAME,
+    wallet_key: str = DEFAULT_CHAOS_WALLET_KEY, pool: str = DEFAULT_CHAOS_POOL,
+    timeout: Union[str,int] = DEFAULT_CHAOS_GET_VALIDATOR_INFO_TIMEOUT,
+    ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE,
+    source: int = DEFAULT_CHAOS_VALIDATOR_INFO_SOURCE) -> bool:
+    """
+    Do all nodes report the same size and committed merkle root for every
+    ledger? See get_ledger_consistency.
+
+    :param genesis_file: The relative or absolute path to a genesis file.
+        Required.
+    :type genesis_file: str
+    :param aliases: The nodes to compare. A list or a JSON list of node
+        aliases.
+        Optional. (Default: all nodes in the genesis file)
+    :type aliases: Union[str,List[str]]
+    :param ledgers: The ledger ids to compare. A list or a JSON list.
+        Optional. (Default: pool (0), domain (1), config (2) and audit (3))
+    :type ledgers: Union[str,List[str]]
+    :param did: A steward or trustee DID. A did OR a seed is required, but not
+        both. The did will be used if both are given. Needed to get validator
+        info.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_DID)
+    :type did: str
+    :param seed : A steward or trustee seed. A did OR a seed is required, but
+        not both. The did will be used if both are given. Needed to get
+        validator info.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SEED)
+    :type seed: str
+    :param wallet_name: The name of the wallet to use when getting validator
+        info.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_WALLET_NAME)
+    :type wallet_name: str
+    :param wallet_key: The key to use when opening the wallet designated by
+        wallet_name.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_WALLET_KEY)
+    :type wallet_key: str
+    :param pool: The pool to connect to when getting validator info.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_POOL)
+    :type pool: str
+    :param timeout: How long getting validator info can take before timing
+        out.
+        Optional.
+        (Default: chaosindy.common.DEFAULT_CHAOS_GET_VALIDATOR_INFO_TIMEOUT)
+    :type timeout: Union[str,int]
+    :param ssh_config_file: The relative or absolute path to the SSH config
+        file.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SSH_CONFIG_FILE)
+    :type ssh_config_file: str
+    :param source: The source of validator info. See
+        chaosindy.probes.validator_info.get_validator_info.
+        Optional. (Default: chaosindy.common.DEFAULT_VALIDATOR_INFO_SOURCE)
+    :type source: int
+    :return: bool
+    """
+    return get_ledger_consistency(genesis_file, aliases=aliases,
+        ledgers=ledgers, did=did, seed=seed, wallet_name=wallet_name,
+        wallet_key=wallet_key, pool=pool, timeout=timeout,
+        ssh_config_file=ssh_config_file, source=source)['consistent']
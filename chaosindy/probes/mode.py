@@ -0,0 +1,260 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from chaosindy.common import *
+from chaosindy.helpers import BackgroundTask
+from chaosindy.probes.validator_info import ValidatorInfoSnapshot
+from logzero import logger
+from os.path import join
+from typing import Dict, List, Union
+
+# Mode trackers started by start_mode_tracker, keyed by name
+_mode_trackers = {}
+
+
+def summarize_mode_timeline(timeline: Dict[str,List], ended_at: float) -> Dict:
+    """
+    Summarize the mode transitions recorded by sample_modes.
+
+    :param timeline: For each node, keyed by alias, a list of [time, mode]
+        transitions in the order they were observed.
+        Required.
+    :type timeline: Dict[str,List]
+    :param ended_at: When sampling ended. The last mode of each node is
+        assumed to have lasted until then.
+        Required.
+    :type ended_at: float
+    :return: Dict - For each node, keyed by alias, the total seconds spent in
+        each mode (phases), the order modes were entered in (modes) and how
+        long after it was first seen in another mode the node reached
+        'participating' (recovery_time, None if it never did).
+    """
+    summary = {}
+    for alias, transitions in timeline.items():
+        phases = {}
+        left_participating_at = None
+        recovery_time = None
+        for i, (entered_at, mode) in enumerate(transitions):
+            left_at = transitions[i + 1][0] if i + 1 < len(transitions) \
+                else ended_at
+            phases[mode] = phases.get(mode, 0) + (left_at - entered_at)
+            if mode == 'participating':
+                if left_participating_at is not None and recovery_time is None:
+                    recovery_time = entered_at - left_participating_at
+            elif left_participating_at is None:
+                left_participating_at = entered_at
+        summary[alias] = {
+            "phases": phases,
+            "modes": [mode for (entered_at, mode) in transitions],
+            "recovery_time": recovery_time
+        }
+    return summary
+
+
+def sample_modes(genesis_file: str, aliases: List[str] = None,
+    interval: Union[str,int,float] = DEFAULT_CHAOS_MODE_SAMPLE_INTERVAL,
+    max_duration: Union[str,int] = DEFAULT_CHAOS_MODE_TRACKER_MAX_DURATION,
+    stop: threading.Event = None, **kwargs) -> Dict:
+    """
+    Sample the mode of each node until stop is set or max_duration seconds
+    pass, recording only the samples on which a node's mode changed.
+
+    Modes are defined in indy-plenum (see nodes_in_mode). A node that did not
+    return validator info (i.e. a node that is down) is in mode 'Unknown'.
+
+    :param genesis_file: The relative or absolute path to a genesis file.
+        Required.
+    :type genesis_file: str
+    :param aliases: The nodes to track.
+        Optional. (Default: all nodes in the genesis file)
+    :type aliases: List[str]
+    :param interval: How long (in seconds) to wait between samples.
+        Optional.
+        (Default: chaosindy.common.DEFAULT_CHAOS_MODE_SAMPLE_INTERVAL)
+    :type interval: Union[str,int,float]
+    :param max_duration: Stop sampling after this many seconds.
+        Optional.
+        (Default: chaosindy.common.DEFAULT_CHAOS_MODE_TRACKER_MAX_DURATION)
+    :type max_duration: Union[str,int]
+    :param stop: Stop sampling once set.
+        Optional. (Default: None)
+    :type stop: threading.Event
+    :param kwargs: Passed to
+        chaosindy.probes.validator_info.ValidatorInfoSnapshot.collect (i.e.
+        ssh_config_file, source).
+    :return: Dict - started_at, ended_at, samples, timeline (for each node,
+        keyed by alias, a list of [time, mode] transitions) and summary (see
+        summarize_mode_timeline).
+    """
+    if stop is None:
+        stop = threading.Event()
+    started_at = time.time()
+    stop_at = started_at + float(max_duration)
+    timeline = {}
+    samples = 0
+    while True:
+        # Keep the snapshot private, so callers of ValidatorInfoSnapshot.latest
+        # on other threads (i.e. stop_n_nodes) do not read the tracker's
+        snapshot = ValidatorInfoSnapshot.collect(genesis_file, ttl=0,
+                                                 cache=False, **kwargs)
+        sampled_at = time.time()
+        samples += 1
+        for alias in (aliases if aliases else snapshot.aliases):
+            mode = snapshot.mode(alias)
+            transitions = timeline.setdefault(alias, [])
+            if not transitions or transitions[-1][1] != mode:
+                logger.debug("%s is %s", alias, mode)
+                transitions.append([sampled_at, mode])
+        remaining = stop_at - time.time()
+        if remaining <= 0 or stop.wait(min(float(interval), remaining)):
+            break
+    ended_at = time.time()
+    return {
+        "started_at": started_at,
+        "ended_at": ended_at,
+        "samples": samples,
+        "timeline": timeline,
+        "summary": summarize_mode_timeline(timeline, ended_at)
+    }
+
+
+def _sample_modes_on_own_loop(*args, **kwargs) -> Dict:
+    # Getting validator info from the ledger (source SDK) runs indy's
+    # wrappers on the current thread's event loop, and a background thread has
+    # none.
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return sample_modes(*args, **kwargs)
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+
+def _write_mode_tracker_state(name: str, state: Dict) -> None:
+    output_dir = get_chaos_temp_dir()
+    with open(join(output_dir, "mode-timeline-{}".format(name)), 'w') as f:
+        json.dump(state, f, sort_keys=True, indent=4)
+
+
+def start_mode_tracker(genesis_file: str, name: str = "mode",
+    aliases: Union[str,List[str]] = None,
+    interval: Union[str,int,float] = DEFAULT_CHAOS_MODE_SAMPLE_INTERVAL,
+    max_duration: Union[str,int] = DEFAULT_CHAOS_MODE_TRACKER_MAX_DURATION,
+    ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE,
+    source: int = DEFAULT_CHAOS_VALIDATOR_INFO_SOURCE) -> bool:
+    """
+    Start sampling the mode of each node in the background (see sample_modes),
+    so the actions that follow (i.e. restart_node or promote_by_node_name) run
+    while mode transitions are recorded. Use stop_mode_tracker, with the same
+    name, to stop sampling and get the timeline.
+
+    The tracker's state is written to the mode-timeline-<name> file in the
+    experiment's temp dir.
+
+    :param genesis_file: The relative or absolute path to a genesis file.
+        Required.
+    :type genesis_file: str
+    :param name: Names the tracker, so more than one can run at once.
+        Optional. (Default: "mode")
+    :type name: str
+    :param aliases: The nodes to track. A list or a JSON list of node aliases.
+        Optional. (Default: all nodes in the genesis file)
+    :type aliases: Union[str,List[str]]
+    :param interval: How long (in seconds) to wait between samples.
+        Optional.
+        (Default: chaosindy.common.DEFAULT_CHAOS_MODE_SAMPLE_INTERVAL)
+    :type interval: Union[str,int,float]
+    :param max_duration: Stop sampling after this many seconds, even if
+        stop_mode_tracker is never called.
+        Optional.
+        (Default: chaosindy.common.DEFAULT_CHAOS_MODE_TRACKER_MAX_DURATION)
+    :type max_duration: Union[str,int]
+    :param ssh_config_file: The relative or absolute path to the SSH config
+        file.
+        Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SSH_CONFIG_FILE)
+    :type ssh_config_file: str
+    :param source: The source of validator info. See
+        chaosindy.probes.validator_info.get_validator_info.
+        Optional. (Default: chaosindy.common.DEFAULT_VALIDATOR_INFO_SOURCE)
+    :type source: int
+    :return: bool - False if a tracker with the same name is already running
+    """
+    logger.info("Starting mode tracker %s", name)
+    if name in _mode_trackers and _mode_trackers[name][0].is_alive():
+        logger.error("Mode tracker %s is already running", name)
+        return False
+    if isinstance(aliases, str):
+        aliases = json.loads(aliases)
+
+    stop = threading.Event()
+    task = BackgroundTask("mode-tracker-{}".format(name),
+                          _sample_modes_on_own_loop,
+                          genesis_file, aliases=aliases, interval=interval,
+                          max_duration=max_duration, stop=stop,
+                          ssh_config_file=ssh_config_file,
+                          source=int(source)).start()
+    _mode_trackers[name] = (task, stop)
+    _write_mode_tracker_state(name, {
+        'name': name,
+        'pid': os.getpid(),
+        'started_at': time.time(),
+        'status': 'running'
+    })
+    return True
+
+
+def stop_mode_tracker(name: str = "mode",
+    timeout: Union[str,int] = DEFAULT_CHAOS_GET_VALIDATOR_INFO_TIMEOUT) -> Dict:
+    """
+    Stop a tracker started by start_mode_tracker, wait (up to timeout seconds)
+    for its last sample, and summarize the time each node spent in each mode.
+
+    The result is also written to the mode-timeline-<name> file in the
+    experiment's temp dir.
+
+    :param name: The name given to start_mode_tracker.
+        Optional. (Default: "mode")
+    :type name: str
+    :param timeout: How long (in seconds) to wait for the last sample.
+        Optional.
+        (Default: chaosindy.common.DEFAULT_CHAOS_GET_VALIDATOR_INFO_TIMEOUT)
+    :type timeout: Union[str,int]
+    :return: Dict - See sample_modes. Empty if the tracker is not running in
+        this process, failed, or did not stop in time.
+    """
+    logger.info("Stopping mode tracker %s", name)
+    if name not in _mode_trackers:
+        logger.error("Mode tracker %s was not started by this process", name)
+        return {}
+    (task, stop) = _mode_trackers.pop(name)
+    stop.set()
+    state = {
+        'name': name,
+        'pid': os.getpid(),
+        'started_at': task.started_at,
+        'stopped_at': time.time()
+    }
+    if not task.join(int(timeout)):
+        logger.error("Mode tracker %s did not stop within %s seconds", name,
+                     timeout)
+        state['status'] = 'timeout'
+        _write_mode_tracker_state(name, state)
+        return {}
+    if task.exception is not None or not task.result:
+        state['status'] = 'failed'
+        state['error'] = str(task.exception)
+        _write_mode_tracker_state(name, state)
+        return {}
+
+    result = task.result
+    for alias, summary in result['summary'].items():
+        logger.info("%s modes: %s phases: %s recovery time: %s", alias,
+                    summary['modes'], summary['phases'],
+                    summary['recovery_time'])
+    state['status'] = 'stopped'
+    state.update(result)
+    _write_mode_tracker_state(name, state)
+    return result
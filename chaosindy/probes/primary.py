@@ -2,7 +2,7 @@ import json
 from chaosindy.execute.execute import FabricExecutor
 from chaosindy.common import *
 from chaosindy.probes.node import node_ports_are_reachable
-from chaosindy.probes.validator_info import detect_mode
+from chaosindy.probes.validator_info import ValidatorInfoSnapshot, detect_mode
 from chaosindy.actions.node import get_primary
 from logzero import logger
 from time import sleep
@@ -25,11 +25,8 @@ def primary_and_replicas_are_reachable(genesis_file: str,
     primary = get_primary(genesis_file, compile_stats=True,
                           ssh_config_file=ssh_config_file)
     if primary:
-        output_dir = get_chaos_temp_dir()
-        vif = "{}/{}-validator-info".format(output_dir, primary)
-        with open(vif, 'r') as vifh:
-            validator_info = json.load(vifh)
-        n = validator_info['Node_info']['Count_of_replicas']
+        snapshot = ValidatorInfoSnapshot.latest(genesis_file)
+        n = snapshot.replica_count(primary)
 
         logger.debug("Check if client and node ports are reachable for " \
                      "primary %s", primary)
@@ -37,9 +34,7 @@ def primary_and_replicas_are_reachable(genesis_file: str,
             return False
 
         for i in range(1, n):
-            replica_status = validator_info['Node_info']['Replicas_status']
-            primary = replica_status["{}:{}".format(primary, i)]['Primary']
-            replica = primary.split(":")[0]
+            replica = snapshot.primary(primary, i)
             logger.debug("Check if client and node ports are reachable for " \
                          "replica %s", replica)
             if not node_ports_are_reachable(genesis_file, replica):
@@ -66,12 +61,10 @@ def demoted_backup_primaries_are_excluded(genesis_file: str,
     output_dir = get_chaos_temp_dir()
     primary = get_primary(genesis_file, compile_stats=True,
                           ssh_config_file=ssh_config_file)
-    validator_info = {}
+    reachable_nodes = []
     if primary:
-        vif = "{}/{}-validator-info".format(output_dir, primary)
-        with open(vif, 'r') as vifh:
-            validator_info = json.load(vifh)
-    reachable_nodes = validator_info['Pool_info']['Reachable_nodes']
+        snapshot = ValidatorInfoSnapshot.latest(genesis_file)
+        reachable_nodes = snapshot.reachable_nodes(primary)
 
     stopped_nodes_file = "{}/stopped_nodes".format(output_dir)
     stopped_nodes_dict = {}
@@ -1,18 +1,70 @@
 import argparse
+import asyncio
 import json
 import subprocess
 import sys
+import threading
+import time
 from chaosindy.common import *
-from chaosindy.execute.execute import FabricExecutor, ParallelFabricExecutor
+from chaosindy.execute.execute import (
+    AsyncRemoteExecutor, FabricExecutor, ParallelResult, get_parallel_executor
+)
 from chaosindy.probes.validator_state import get_current_validator_list
-from os.path import expanduser, join
+from os import environ, remove, replace
+from os.path import expanduser, getmtime, join
 from logzero import logger
 from multiprocessing import Pool
 
 from chaosindy.helpers import run
-from chaosindy.ledger_interaction import get_validator_state
+from chaosindy.ledger_interaction import (
+    get_validator_info_from_ledger, get_validator_state
+)
 
-from typing import Union
+from typing import Callable, Dict, List, Union
+
+
+def primary_quorum(quorum: int) -> Callable[[Dict], bool]:
+    """
+    Return a predicate, suitable for ParallelFabricExecutor.execute_quorum,
+    that is satisfied once quorum nodes report the same primary in the output
+    of `validator-info -v --json`.
+
+    :param quorum: How many nodes must agree on the primary.
+        Required.
+    :type quorum: int
+    :return: Callable[[Dict], bool]
+    """
+    def predicate(results: Dict) -> bool:
+        primaries = {}
+        for alias, result in results.items():
+            if result.return_code != 0:
+                continue
+            try:
+                node_info = json.loads(result.stdout)
+                replica_status = node_info['Node_info']['Replicas_status']
+                primary = replica_status["{}:0".format(alias)]['Primary']
+            except (ValueError, KeyError, TypeError):
+                continue
+            if not primary:
+                continue
+            primary = primary.split(":", 1)[0]
+            primaries[primary] = primaries.get(primary, 0) + 1
+            if primaries[primary] >= int(quorum):
+                return True
+        return False
+    return predicate
+
+
+def _write_validator_info(output_dir: str, alias: str, contents: str) -> None:
+    """
+    Write a node's validator info to the '<alias>-validator-info' file in
+    output_dir. The file is replaced in one step, so a reader (i.e. a mode
+    tracker running in the background) never sees a partly written file.
+    """
+    node_info_file = join(output_dir, "{}-validator-info".format(alias))
+    with open(node_info_file + ".tmp", "w") as f:
+        f.write(contents)
+    replace(node_info_file + ".tmp", node_info_file)
 
 
 def get_validator_info_from_node_serial(genesis_file: str,
@@ -45,14 +97,12 @@ def get_validator_info_from_node_serial(genesis_file: str,
     output_dir = get_chaos_temp_dir()
     logger.debug("genesis_file: %s ssh_config_file: %s", genesis_file,
                  ssh_config_file)
-    # 1. Open genesis_file and load all aliases into an array
-    aliases = []
-    with open(expanduser(genesis_file), 'r') as genesisfile:
-        for line in genesisfile:
-            aliases.append(json.loads(line)['txn']['data']['data']['alias'])
+    # 1. Load all aliases from genesis_file
+    aliases = get_aliases(genesis_file)
     logger.debug(str(aliases))
 
-    executor = FabricExecutor(ssh_config_file=expanduser(ssh_config_file))
+    executor = FabricExecutor(ssh_config_file=expanduser(ssh_config_file),
+                              persistent=True)
 
     # Get get validator info from each alias
     count = len(aliases)
@@ -67,9 +117,7 @@ def get_validator_info_from_node_serial(genesis_file: str,
             are_queried += 1
             # Write JSON output to temp directory output_dir, creating a unique
             # file name using the alias
-            fname = "{}-validator-info".format(alias)
-            with open(join(output_dir, fname), "w") as f:
-                f.write(result.stdout)
+            _write_validator_info(output_dir, alias, result.stdout)
         tried_to_query += 1
 
     logger.debug("are_queried: %s count: %i tried_to_query: %i len-aliases: %i",
@@ -82,12 +130,22 @@ def get_validator_info_from_node_serial(genesis_file: str,
 
 def get_validator_info_from_node_parallel(genesis_file: str,
     timeout: Union[str,int] = DEFAULT_CHAOS_GET_VALIDATOR_INFO_TIMEOUT,
-    ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE) -> bool:
+    ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE,
+    use_asyncio: Union[str,bool] = False, quorum: Union[str,int] = None,
+    predicate: Callable[[Dict], bool] = None) -> bool:
     """
     Get validator info for each node in the genesis file in parallel.
 
     The more cores your client has the faster validator info is collected from
-    a pool.
+    a pool. Set use_asyncio to query every node at once from a single event
+    loop (see chaosindy.execute.execute.AsyncRemoteExecutor) instead.
+
+    Set quorum and/or predicate to stop waiting on the remaining nodes once
+    enough nodes have answered (see
+    chaosindy.execute.execute.ParallelFabricExecutor.execute_quorum). Validator
+    info files left over from a previous call are removed for nodes that did
+    not answer, so stale data is not mistaken for current data. Not supported
+    with use_asyncio.
 
     The validator info is written to a file in the Chaos temp dir (see
     chaosindy.common.get_chaos_temp_dir). Each file is named in the following
@@ -105,20 +163,28 @@ def get_validator_info_from_node_parallel(genesis_file: str,
         file.
         Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SSH_CONFIG_FILE)
     :type ssh_config_file: str
+    :param use_asyncio: Use the asyncio-based remote executor?
+        Optional. (Default: False)
+    :type use_asyncio: Union[str,bool]
+    :param quorum: How many nodes must return validator info. Either a number
+        or 'n-f'. See chaosindy.common.get_quorum.
+        Optional. (Default: None - all nodes)
+    :type quorum: Union[str,int]
+    :param predicate: Called with a dict of the ParallelResult of each node
+        that has answered so far, keyed by alias. Return True to stop waiting
+        on the remaining nodes. See primary_quorum.
+        Optional. (Default: None)
+    :type predicate: Callable[[Dict], bool]
     :return: bool
     """
     output_dir = get_chaos_temp_dir()
     logger.debug("genesis_file: %s ssh_config_file: %s", genesis_file,
                  ssh_config_file)
-    # 1. Open genesis_file and load all aliases into an array
-    aliases = []
-    with open(expanduser(genesis_file), 'r') as genesisfile:
-        for line in genesisfile:
-            aliases.append(json.loads(line)['txn']['data']['data']['alias'])
+    # 1. Load all aliases from genesis_file
+    aliases = get_aliases(genesis_file)
     logger.debug(str(aliases))
 
     expanded_ssh_config_file = expanduser(ssh_config_file)
-    executor = ParallelFabricExecutor(ssh_config_file=expanded_ssh_config_file)
 
     # Get get validator info from each alias
     count = len(aliases)
@@ -126,17 +192,65 @@ def get_validator_info_from_node_parallel(genesis_file: str,
     tried_to_query = 0
     are_queried = 0
     logger.debug("alias to query validator info from: %s", str(aliases))
-    result = executor.execute(aliases, "validator-info -v --json",
-                              connect_timeout=int(timeout), as_sudo=True)
-
-    for alias in aliases:
-        if result[alias]['return_code'] == 0:
+    if str(use_asyncio).lower() in true_list:
+        executor = AsyncRemoteExecutor(ssh_config_file=expanded_ssh_config_file)
+        loop = asyncio.new_event_loop()
+        try:
+            result = loop.run_until_complete(
+                executor.execute(aliases, "validator-info -v --json",
+                                 timeout=int(timeout), as_sudo=True))
+        finally:
+            loop.close()
+            executor.close()
+        results = [ParallelResult(alias, result[alias]['return_code'],
+                                  result[alias]['stdout'],
+                                  result[alias]['stderr'])
+                   for alias in aliases]
+    elif quorum is not None or predicate is not None:
+        executor = get_parallel_executor(
+            ssh_config_file=expanded_ssh_config_file)
+        required = None
+        if quorum is not None:
+            # Only a quorum of nodes must answer
+            required = get_quorum(quorum, count)
+        result = executor.execute_quorum(aliases, "validator-info -v --json",
+                                         quorum=required, predicate=predicate,
+                                         connect_timeout=int(timeout),
+                                         timeout=int(timeout),
+                                         deadline=int(timeout), as_sudo=True)
+        results = [ParallelResult(alias, result[alias]['return_code'],
+                                  result[alias]['stdout'],
+                                  result[alias]['stderr'])
+                   for alias in aliases if alias in result]
+        # Validator info from a previous call is stale for nodes that did not
+        # answer this time
+        for alias in aliases:
+            if result.get(alias, {}).get('return_code', -1) != 0:
+                try:
+                    remove(join(output_dir, "{}-validator-info".format(alias)))
+                except FileNotFoundError:
+                    pass
+        if required is not None:
+            count = required
+        elif predicate({r.host: r for r in results}):
+            # Satisfying the predicate is sufficient
+            count = 0
+    else:
+        executor = get_parallel_executor(
+            ssh_config_file=expanded_ssh_config_file)
+        # Results are yielded as each node finishes, so validator info from
+        # healthy nodes is written without waiting on the slowest node.
+        results = executor.execute_iter(aliases, "validator-info -v --json",
+                                        connect_timeout=int(timeout),
+                                        timeout=int(timeout),
+                                        deadline=int(timeout), as_sudo=True)
+
+    for result in results:
+        if result.return_code == 0:
             are_queried += 1
             # Write JSON output to temp directory output_dir, creating a unique
             # file name using the alias
-            fname = "{}-validator-info".format(alias)
-            with open(join(output_dir, fname), "w") as f:
-                f.write(result[alias]['stdout'])
+            _write_validator_info(output_dir, result.host, result.stdout)
         tried_to_query += 1
 
     logger.debug("are_queried: %s count: %i tried_to_query: %i len-aliases: %i",
@@ -147,36 +261,33 @@ def get_validator_info_from_node_parallel(genesis_file: str,
     return True
 
 
-def get_validator_info_from_sdk(genesis_file: str, did: str,
-    seed: str = DEFAULT_CHAOS_SEED,
+def get_validator_info_from_sdk(genesis_file: str,
+    did: str = DEFAULT_CHAOS_DID, seed: str = DEFAULT_CHAOS_SEED,
     wallet_name: str = DEFAULT_CHAOS_WALLET_NAME,
     wallet_key: str = DEFAULT_CHAOS_WALLET_KEY, pool: str = DEFAULT_CHAOS_POOL,
     timeout: Union[str,int] = DEFAULT_CHAOS_GET_VALIDATOR_INFO_TIMEOUT,
     ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE) -> bool:
     """
-    *NYI*
-
     Get validator info using Indy SDK
 
-    Perhaps enhancing chaosindy.ledger_intaraction.get_validator_state
-    would be a good idea? It currently returns the latest pool ledger
-    transaction for each node, but could be enhanced to include a superset of
-    data for:
-    1. What is currently included when calling get_validator_state
-    2. Everything in the response from the 'validator-info' script or
-       `ledger get-validator-info` indy-cli command
+    A GET_VALIDATOR_INFO request is signed and sent to every node using the
+    process-wide pool handle and wallet (see
+    chaosindy.ledger_interaction.get_session). Unlike the CLI source, no
+    processes are spawned and no pool, wallet or DID is created after the first
+    call.
+
+    The validator info is written to a file in the Chaos temp dir (see
+    chaosindy.common.get_chaos_temp_dir). Each file is named in the following
+    manner: '<node>-validator-info'.
 
     :param genesis_file: The relative or absolute path to a genesis file.
         Required.
     :type genesis_file: str
-    :param did: A steward or trustee DID. A did OR a seed is required, but not
-        both. The did will be used if both are given. Needed to get validator
-        info.
+    :param did: Unused. The DID is derived from the seed, which is needed to
+        sign the request.
         Optional. (Default: chaosindy.common.DEFAULT_CHAOS_DID)
     :type did: str
-    :param seed : A steward or trustee seed. A did OR a seed is required, but
-        not both. The did will be used if both are given. Needed to get
-        validator info.
+    :param seed : A steward or trustee seed. Needed to get validator info.
         Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SEED)
     :type seed: str
     :param wallet_name: The name of the wallet to use when getting validator
@@ -190,21 +301,53 @@ def get_validator_info_from_sdk(genesis_file: str, did: str,
     :param pool: The pool to connect to when getting validator info.
         Optional. (Default: chaosindy.common.DEFAULT_CHAOS_POOL)
     :type pool: str
-    :param timeout: How long indy-cli can take to perform the operation before
-        timing out.
+    :param timeout: How long nodes have to respond before timing out.
         Optional.
         (Default: chaosindy.common.DEFAULT_CHAOS_GET_VALIDATOR_INFO_TIMEOUT)
     :type timeout: Union[str,int]
-    :param ssh_config_file: The relative or absolute path to the SSH config
-        file.
+    :param ssh_config_file: Unused.
         Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SSH_CONFIG_FILE)
     :type ssh_config_file: str
     :return: bool
     """
-    #output_dir = get_chaos_temp_dir()
-    #return True
-    logger.error("NYI - get_validator_info_from_sdk is not yet implemented.")
-    return False
+    output_dir = get_chaos_temp_dir()
+    aliases = get_aliases(genesis_file)
+
+    # NOTE: Allow the request to execute 5 seconds longer than the nodes are
+    #       given to respond
+    loop = asyncio.get_event_loop()
+    try:
+        validator_info = loop.run_until_complete(asyncio.wait_for(
+            get_validator_info_from_ledger(genesis_file=genesis_file,
+                                           seed=seed, pool_name=pool,
+                                           wallet_name=wallet_name,
+                                           wallet_key=wallet_key,
+                                           timeout=int(timeout)),
+            timeout=int(timeout) + 5))
+    except asyncio.TimeoutError:
+        logger.error("Failed to get validator info from the ledger in %s " \
+                     "seconds", timeout)
+        return False
+
+    are_queried = 0
+    for alias in aliases:
+        node_info_file = join(output_dir, "{}-validator-info".format(alias))
+        if validator_info.get(alias, None) is None:
+            # Do not mistake validator info from a previous call for current
+            try:
+                remove(node_info_file)
+            except FileNotFoundError:
+                pass
+            continue
+        _write_validator_info(output_dir, alias,
+                              json.dumps(validator_info[alias]))
+        are_queried += 1
+
+    logger.debug("are_queried: %s len-aliases: %i", are_queried, len(aliases))
+    if are_queried < len(aliases):
+        return False
+
+    return True
 
 
 def get_validator_info_from_cli(genesis_file: str, did: str,
@@ -382,18 +525,22 @@ def get_validator_info_from_cli(genesis_file: str, did: str,
     validator_info = json.loads(json_output)
 
     for k, v in validator_info.items():
-        node_info_file = join(output_dir,
-                              "{}-validator-info".format(k))
         if v != 'Timeout':
-            with open(node_info_file, "w") as f:
-                f.write(json.dumps(v['data']))
+            _write_validator_info(output_dir, k, json.dumps(v['data']))
+            continue
+        # Do not mistake validator info from a previous call for current
+        try:
+            remove(join(output_dir, "{}-validator-info".format(k)))
+        except FileNotFoundError:
+            pass
     return True
 
 
 def get_validator_info_from_node(genesis_file: str,
     timeout: Union[str,int] = DEFAULT_CHAOS_GET_VALIDATOR_INFO_TIMEOUT,
     ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE,
-    parallel: bool = True) -> bool:
+    parallel: bool = True, quorum: Union[str,int] = None,
+    predicate: Callable[[Dict], bool] = None) -> bool:
     """
     :param genesis_file: The relative or absolute path to a genesis file.
         Required.
@@ -409,11 +556,21 @@ def get_validator_info_from_node(genesis_file: str,
     :param parallel: Parallelize the retrieval of validator info?
     :type parallel: bool
         Optional (Default: True)
+    :param quorum: How many nodes must return validator info. Either a number
+        or 'n-f'. Ignored unless parallel.
+        Optional. (Default: None - all nodes)
+    :type quorum: Union[str,int]
+    :param predicate: Stop waiting on the remaining nodes once predicate
+        returns True. Ignored unless parallel. See
+        get_validator_info_from_node_parallel.
+        Optional. (Default: None)
+    :type predicate: Callable[[Dict], bool]
     :return: bool
     """
     if parallel:
         return get_validator_info_from_node_parallel(genesis_file,
-            timeout=timeout, ssh_config_file=ssh_config_file)
+            timeout=timeout, ssh_config_file=ssh_config_file, quorum=quorum,
+            predicate=predicate)
     else:
         return get_validator_info_from_node_serial(genesis_file,
             timeout=timeout, ssh_config_file=ssh_config_file)
@@ -425,7 +582,9 @@ def get_validator_info(genesis_file: str, did: str = DEFAULT_CHAOS_DID,
     wallet_key: str = DEFAULT_CHAOS_WALLET_KEY, pool: str = DEFAULT_CHAOS_POOL,
     timeout: Union[str,int] = DEFAULT_CHAOS_GET_VALIDATOR_INFO_TIMEOUT,
     ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE,
-    source: int = DEFAULT_CHAOS_VALIDATOR_INFO_SOURCE) -> bool:
+    source: int = DEFAULT_CHAOS_VALIDATOR_INFO_SOURCE,
+    quorum: Union[str,int] = None,
+    predicate: Callable[[Dict], bool] = None) -> bool:
     """
     Get validator info
 
@@ -438,7 +597,10 @@ def get_validator_info(genesis_file: str, did: str = DEFAULT_CHAOS_DID,
         This option provides quicker results, but the data may be up to 60
         seconds stale/out-of-date.  See ValidatorInfoSource.NODE in
         chaosindy/common.
-      - Possibly Indy SDK - TBD
+      - A client that has the Indy SDK (python3-indy) installed, sending a
+        GET_VALIDATOR_INFO request directly. Like the CLI option, but without
+        spawning indy-cli or creating a pool, wallet and DID on every call.
+        See ValidatorInfoSource.SDK in chaosindy/common.
 
     :param genesis_file: The relative or absolute path to a genesis file.
         Required.
@@ -478,13 +640,24 @@ def get_validator_info(genesis_file: str, did: str = DEFAULT_CHAOS_DID,
         Options: see chaosindy.common.ValidatorInfoSource
         - NODE (1) - validator-info script executed on each node
         - CLI (2) - Indy CLI
-        - SDK (3) - Not Yet Implemented - Use Indy SDK
+        - SDK (3) - Use Indy SDK
     :type source: int
+    :param quorum: Return once this many nodes have returned validator info
+        instead of waiting on all of them. Either a number or 'n-f'. Only
+        applies to ValidatorInfoSource.NODE.
+        Optional. (Default: None - all nodes)
+    :type quorum: Union[str,int]
+    :param predicate: Return once predicate is satisfied by the validator info
+        returned so far. Only applies to ValidatorInfoSource.NODE. See
+        get_validator_info_from_node_parallel.
+        Optional. (Default: None)
+    :type predicate: Callable[[Dict], bool]
     :return: bool
     """
     if source == ValidatorInfoSource.NODE.value:
         return get_validator_info_from_node(genesis_file, timeout=timeout,
-                                            ssh_config_file=ssh_config_file)
+                                            ssh_config_file=ssh_config_file,
+                                            quorum=quorum, predicate=predicate)
     elif source == ValidatorInfoSource.CLI.value:
         return get_validator_info_from_cli(genesis_file, did=did, seed=seed,
                                            wallet_name=wallet_name,
@@ -502,15 +675,348 @@ def get_validator_info(genesis_file: str, did: str = DEFAULT_CHAOS_DID,
         return False
 
 
+def get_validator_info_ttl(ttl: Union[str,int,float] = None) -> float:
+    """
+    Return how long (in seconds) a ValidatorInfoSnapshot may be reused.
+
+    :param ttl: The TTL. None resolves to the CHAOS_VALIDATOR_INFO_TTL
+        environment variable if set, otherwise
+        chaosindy.common.DEFAULT_CHAOS_VALIDATOR_INFO_TTL.
+        Optional. (Default: None)
+    :type ttl: Union[str,int,float]
+    :return: float
+    """
+    if ttl is None:
+        ttl = environ.get('CHAOS_VALIDATOR_INFO_TTL',
+                          DEFAULT_CHAOS_VALIDATOR_INFO_TTL)
+    return float(ttl)
+
+
+class ValidatorInfoSnapshot(object):
+    """
+    Validator info for each node in the genesis file, collected and parsed
+    once.
+
+    Use ValidatorInfoSnapshot.collect to get validator info (see
+    get_validator_info) and ValidatorInfoSnapshot.latest to reuse the last
+    snapshot collected. A collected snapshot is reused by collect for up to ttl
+    seconds (see get_validator_info_ttl) when collect is called with the same
+    arguments, so consecutive probes in one experiment step can share the same
+    data. The default ttl of 0 collects validator info on every call.
+
+    The 'data' element indy-cli wraps each node's validator info in is
+    removed, so validator info from all sources has the same form. Accessors
+    return 'Unknown' (or None) for nodes that did not return validator info.
+    collect removes the validator info files before getting validator info, so
+    a node that does not answer (i.e. one that is down) is never read from the
+    file written when it last answered.
+    """
+    _snapshots = {}
+    _lock = threading.Lock()
+    # Validator info files are shared by all threads (i.e. a mode tracker
+    # running in the background), so collect one snapshot at a time
+    _collect_lock = threading.Lock()
+
+    def __init__(self, genesis_file: str, collected_at: float = None,
+                 collected_with: Dict = None):
+        """
+        Load the '<alias>-validator-info' files in the chaos temp dir.
+
+        :param genesis_file: The relative or absolute path to a genesis file.
+            Required.
+        :type genesis_file: str
+        :param collected_at: When validator info was collected.
+            Optional. (Default: now)
+        :type collected_at: float
+        :param collected_with: The kwargs collect passed to get_validator_info.
+            None if the snapshot was not collected by this process.
+            Optional. (Default: None)
+        :type collected_with: Dict
+        """
+        self.genesis_file = genesis_file
+        self.collected_at = collected_at if collected_at is not None \
+            else time.time()
+        self.collected_with = collected_with
+        self.aliases = get_aliases(genesis_file)
+        self._node_info = {}
+        output_dir = get_chaos_temp_dir()
+        for alias in self.aliases:
+            validator_info = join(output_dir, "{}-validator-info".format(alias))
+            try:
+                with open(validator_info, 'r') as f:
+                    node_info = json.load(f)
+                # For each node, Indy CLI returns json in a 'data' element
+                if 'data' in node_info:
+                    node_info = node_info['data']
+            except (FileNotFoundError, json.decoder.JSONDecodeError):
+                logger.info("Failed to load validator info for alias %s",
+                            alias)
+                node_info = None
+            self._node_info[alias] = node_info
+
+    @classmethod
+    def _key(cls, genesis_file: str):
+        return (expanduser(genesis_file), get_chaos_temp_dir())
+
+    @classmethod
+    def collect(cls, genesis_file: str, ttl: Union[str,int,float] = None,
+                cache: bool = True, **kwargs) -> 'ValidatorInfoSnapshot':
+        """
+        Get validator info and return a snapshot of it.
+
+        :param genesis_file: The relative or absolute path to a genesis file.
+            Required.
+        :type genesis_file: str
+        :param ttl: Reuse the last snapshot if it was collected less than ttl
+            seconds ago. See get_validator_info_ttl.
+            Optional. (Default: None)
+        :type ttl: Union[str,int,float]
+        :param cache: Reuse and keep the snapshot for later calls to collect
+            and latest? A background sampler (i.e. a mode tracker) passes False
+            so the snapshot it collects is not mistaken for the caller's.
+            Optional. (Default: True)
+        :type cache: bool
+        :param kwargs: Passed to get_validator_info.
+        :return: ValidatorInfoSnapshot
+        """
+        key = cls._key(genesis_file)
+        ttl = get_validator_info_ttl(ttl)
+        snapshot = None
+        if cache:
+            with cls._lock:
+                snapshot = cls._snapshots.get(key, None)
+        if snapshot and snapshot.collected_with == kwargs and \
+           time.time() - snapshot.collected_at < ttl:
+            logger.debug("Reusing validator info collected %f seconds ago",
+                         time.time() - snapshot.collected_at)
+            return snapshot
+        with cls._collect_lock:
+            # Not every source removes the files of nodes that did not answer
+            # (i.e. indy-cli skips nodes that time out)
+            output_dir = get_chaos_temp_dir()
+            for alias in get_aliases(genesis_file):
+                try:
+                    remove(join(output_dir, "{}-validator-info".format(alias)))
+                except FileNotFoundError:
+                    pass
+            collected_at = time.time()
+            get_validator_info(genesis_file, **kwargs)
+            snapshot = cls(genesis_file, collected_at=collected_at,
+                           collected_with=kwargs)
+        if cache:
+            with cls._lock:
+                cls._snapshots[key] = snapshot
+        return snapshot
+
+    @classmethod
+    def latest(cls, genesis_file: str) -> 'ValidatorInfoSnapshot':
+        """
+        Return the last snapshot collected, without collecting validator info.
+
+        Falls back to the validator info files in the chaos temp dir if no
+        snapshot has been collected by this process. The fallback is stamped
+        with the time the newest file was written and is never reused by
+        collect.
+
+        :param genesis_file: The relative or absolute path to a genesis file.
+            Required.
+        :type genesis_file: str
+        :return: ValidatorInfoSnapshot
+        """
+        key = cls._key(genesis_file)
+        with cls._lock:
+            snapshot = cls._snapshots.get(key, None)
+        if snapshot is None:
+            # Do not read the files while collect is rewriting them
+            with cls._collect_lock:
+                output_dir = get_chaos_temp_dir()
+                written_at = 0.0
+                for alias in get_aliases(genesis_file):
+                    try:
+                        written_at = max(written_at, getmtime(
+                            join(output_dir, "{}-validator-info".format(alias))))
+                    except FileNotFoundError:
+                        pass
+                snapshot = cls(genesis_file, collected_at=written_at)
+            with cls._lock:
+                cls._snapshots[key] = snapshot
+        return snapshot
+
+    @classmethod
+    def invalidate(cls):
+        """
+        Forget all snapshots, forcing the next collect to get validator info.
+        """
+        with cls._lock:
+            cls._snapshots = {}
+
+    def get(self, alias: str) -> Union[Dict,None]:
+        """
+        Return a node's parsed validator info.
+
+        :param alias: The node name/alias
+            Required.
+        :type alias: str
+        :return: Union[Dict,None]
+        """
+        return self._node_info.get(alias, None)
+
+    def mode(self, alias: str) -> str:
+        """
+        Return a node's mode (i.e. 'participating').
+
+        :param alias: The node name/alias
+            Required.
+        :type alias: str
+        :return: str
+        """
+        node_info = self.get(alias)
+        if node_info is None:
+            return "Unknown"
+        return node_info['Node_info']['Mode']
+
+    def replicas(self, alias: str) -> Dict:
+        """
+        Return a node's replica status, keyed by '<alias>:<instance>'.
+
+        :param alias: The node name/alias
+            Required.
+        :type alias: str
+        :return: Dict
+        """
+        node_info = self.get(alias)
+        if node_info is None:
+            return {}
+        return node_info['Node_info']['Replicas_status']
+
+    def replica_count(self, alias: str) -> Union[int,None]:
+        """
+        Return the number of protocol instances a node reports.
+
+        :param alias: The node name/alias
+            Required.
+        :type alias: str
+        :return: Union[int,None]
+        """
+        node_info = self.get(alias)
+        if node_info is None:
+            return None
+        return node_info['Node_info']['Count_of_replicas']
+
+    def primary(self, alias: str, instance: int = 0) -> Union[str,None]:
+        """
+        Return the alias of the primary a node reports for a protocol instance.
+
+        :param alias: The node name/alias
+            Required.
+        :type alias: str
+        :param instance: The protocol instance. 0 is the master.
+            Optional. (Default: 0)
+        :type instance: int
+        :return: Union[str,None] - 'Unknown' if the node did not return
+            validator info. None if the node has no primary.
+        """
+        if self.get(alias) is None:
+            return "Unknown"
+        primary = self.replicas(alias)["{}:{}".format(alias, instance)]
+        primary = primary['Primary']
+        return primary.split(":", 1)[0] if primary else None
+
+    def catchup_status(self, alias: str) -> Union[Dict,None]:
+        """
+        Return a node's catchup status.
+
+        :param alias: The node name/alias
+            Required.
+        :type alias: str
+        :return: Union[Dict,None]
+        """
+        node_info = self.get(alias)
+        if node_info is None:
+            return None
+        return node_info['Node_info']['Catchup_status']
+
+    def ledger_sizes(self, alias: str) -> Dict[str,int]:
+        """
+        Return the number of transactions in each ledger a node reports, keyed
+        by ledger id ('0' pool, '1' domain, '2' config, '3' audit).
+
+        :param alias: The node name/alias
+            Required.
+        :type alias: str
+        :return: Dict[str,int]
+        """
+        node_info = self.get(alias)
+        if node_info is None:
+            return {}
+        counts = node_info['Node_info'].get('Metrics', {}).get(
+            'transaction-count', {})
+        return dict([(ledger, counts[name]) for (ledger, name)
+                     in LEDGER_METRIC_NAMES.items() if name in counts])
+
+    def ledger_root_hashes(self, alias: str) -> Dict[str,str]:
+        """
+        Return the committed merkle root hash of each ledger a node reports,
+        keyed by ledger id.
+
+        :param alias: The node name/alias
+            Required.
+        :type alias: str
+        :return: Dict[str,str]
+        """
+        node_info = self.get(alias)
+        if node_info is None:
+            return {}
+        root_hashes = node_info['Node_info'].get(
+            'Committed_ledger_root_hashes', {})
+        return dict([(str(ledger), root_hash) for (ledger, root_hash)
+                     in root_hashes.items()])
+
+    def f_value(self, alias: str) -> Union[int,None]:
+        """
+        Return the f_value (number of faulty nodes tolerated) a node reports.
+
+        :param alias: The node name/alias
+            Required.
+        :type alias: str
+        :return: Union[int,None]
+        """
+        node_info = self.get(alias)
+        if node_info is None:
+            return None
+        return node_info['Pool_info']['f_value']
+
+    def reachable_nodes(self, alias: str) -> List:
+        """
+        Return the nodes a node reports as reachable.
+
+        :param alias: The node name/alias
+            Required.
+        :type alias: str
+        :return: List
+        """
+        node_info = self.get(alias)
+        if node_info is None:
+            return []
+        return node_info['Pool_info']['Reachable_nodes']
+
+
 def detect_primary(genesis_file: str, did: str = DEFAULT_CHAOS_DID,
     seed: str = DEFAULT_CHAOS_SEED,
     wallet_name: str = DEFAULT_CHAOS_WALLET_NAME,
     wallet_key: str = DEFAULT_CHAOS_WALLET_KEY, pool: str = DEFAULT_CHAOS_POOL,
     timeout: Union[str,int] = DEFAULT_CHAOS_GET_VALIDATOR_INFO_TIMEOUT,
-    ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE) -> bool:
+    ssh_config_file: str = DEFAULT_CHAOS_SSH_CONFIG_FILE,
+    source: int = DEFAULT_CHAOS_VALIDATOR_INFO_SOURCE,
+    quorum: Union[str,int] = None) -> bool:
     """
     Get the primary reported by each participating validator node.
 
+    When quorum is given and validator info is retrieved from the nodes
+    (ValidatorInfoSource.NODE), stop waiting on the remaining nodes once quorum
+    nodes agree on the primary. Nodes that did not answer are reported with an
+    'Unknown' primary.
+
     :param genesis_file: The relative or absolute path to a genesis file.
         Required.
     :type genesis_file: str
@@ -544,22 +1050,33 @@ def detect_primary(genesis_file: str, did: str = DEFAULT_CHAOS_DID,
         file.
         Optional. (Default: chaosindy.common.DEFAULT_CHAOS_SSH_CONFIG_FILE)
     :type ssh_config_file: str
+    :param source: The source of validator info. See get_validator_info.
+        Optional. (Default: chaosindy.common.DEFAULT_VALIDATOR_INFO_SOURCE)
+    :type source: int
+    :param quorum: How many nodes must agree on the primary. Either a number or
+        'n-f'.
+        Optional. (Default: None - wait on all nodes)
+    :type quorum: Union[str,int]
     :return: bool
     """
     # 1. Get validator info from all nodes
-    get_validator_info(genesis_file, did=did, seed=seed,
-                       wallet_name=wallet_name,
-                       wallet_key=wallet_key, pool=pool, timeout=timeout,
-                       ssh_config_file=ssh_config_file)
+    predicate = None
+    if quorum is not None:
+        predicate = primary_quorum(get_quorum(quorum,
+                                              len(get_aliases(genesis_file))))
+    snapshot = ValidatorInfoSnapshot.collect(genesis_file, did=did, seed=seed,
+                                             wallet_name=wallet_name,
+                                             wallet_key=wallet_key, pool=pool,
+                                             timeout=timeout,
+                                             ssh_config_file=ssh_config_file,
+                                             source=source,
+                                             predicate=predicate)
     output_dir = get_chaos_temp_dir()
 
     logger.debug("genesis_file: %s ssh_config_file: %s", genesis_file,
                  ssh_config_file)
-    # 2. Open genesis_file and load all aliases into an array
-    aliases = []
-    with open(expanduser(genesis_file), 'r') as genesisfile:
-        for line in genesisfile:
-            aliases.append(json.loads(line)['txn']['data']['data']['alias'])
+    # 2. Load all aliases from genesis_file
+    aliases = snapshot.aliases
     logger.debug(str(aliases))
 
     # Get the list of currently participating validator nodes
@@ -585,35 +1102,11 @@ def detect_primary(genesis_file: str, did: str = DEFAULT_CHAOS_DID,
             continue
         count_participating += 1
         logger.debug("alias to query primary from validator info: %s", alias)
-        validator_info = join(output_dir, "{}-validator-info".format(alias))
-        logger.debug("Extract primary from %s", validator_info)
 
         try:
-            with open(validator_info, 'r') as f:
-                node_info = json.load(f)
-
-            # For each node, Indy CLI returns json in a 'data' element
-            if 'data' in node_info:
-                data_node_info = node_info['data']['Node_info']
-                replica_status = data_node_info['Replicas_status']
-                primary = replica_status["{}:0".format(alias)]['Primary']
-                primary = primary.split(":", 1)[0] if primary else None
-                mode = data_node_info['Mode']
-            else:
-                # For each node, validator-info script does NOT return json in a
-                # 'data' element
-                replica_status = node_info['Node_info']['Replicas_status']
-                primary = replica_status["{}:0".format(alias)]['Primary']
-                primary = primary.split(":", 1)[0] if primary else None
-                mode = node_info['Node_info']['Mode']
-        except (FileNotFoundError, json.decoder.JSONDecodeError) as e:
-            #logger.exception(e)
-            logger.info("Failed to load validator info for alias " \
-                        "{}".format(alias))
-            logger.info("Setting primary to Unknown for alias {}".format(alias))
-            primary = "Unknown"
-            logger.info("Setting mode to Unknown for alias {}".format(alias))
-            mode = "Unknown"
+            # Unknown if the node did not return validator info
+            primary = snapshot.primary(alias)
+            mode = snapshot.mode(alias)
         except Exception as e:
             logger.error("Failed to load validator info for alias " \
                          "{}".format(alias))
@@ -712,19 +1205,17 @@ def detect_mode(genesis_file: str, did: str = DEFAULT_CHAOS_DID,
     :return: bool
     """
     # 1. Get validator info from all nodes
-    get_validator_info(genesis_file, did=did, seed=seed,
-                       wallet_name=wallet_name,
-                       wallet_key=wallet_key, pool=pool, timeout=timeout,
-                       ssh_config_file=ssh_config_file)
+    snapshot = ValidatorInfoSnapshot.collect(genesis_file, did=did, seed=seed,
+                                             wallet_name=wallet_name,
+                                             wallet_key=wallet_key, pool=pool,
+                                             timeout=timeout,
+                                             ssh_config_file=ssh_config_file)
     output_dir = get_chaos_temp_dir()
 
     logger.debug("genesis_file: %s ssh_config_file: %s", genesis_file,
                  ssh_config_file)
-    # 2. Open genesis_file and load all aliases into an array
-    aliases = []
-    with open(expanduser(genesis_file), 'r') as genesisfile:
-        for line in genesisfile:
-            aliases.append(json.loads(line)['txn']['data']['data']['alias'])
+    # 2. Load all aliases from genesis_file
+    aliases = snapshot.aliases
     logger.debug(str(aliases))
 
     # 3. Get mode from each nodes validator-info
@@ -735,21 +1226,10 @@ def detect_mode(genesis_file: str, did: str = DEFAULT_CHAOS_DID,
     tried_to_query= 0
     for alias in aliases:
         logger.debug("alias to query mode from validator info: %s", alias)
-        validator_info = join(output_dir, "{}-validator-info".format(alias))
-        logger.debug("Extract mode from %s", validator_info)
 
         try:
-            with open(validator_info, 'r') as f:
-                node_info = json.load(f)
-            if 'data' in node_info:
-                mode = node_info['data']['Node_info']['Mode']
-            else:
-                mode = node_info['Node_info']['Mode']
-        except FileNotFoundError:
-            logger.info("Failed to load validator info for alias " \
-                        "{}".format(alias))
-            logger.info("Setting mode to Unknown for alias {}".format(alias))
-            mode = "Unknown"
+            # Unknown if the node did not return validator info
+            mode = snapshot.mode(alias)
         except Exception as e:
             logger.error("Failed to load validator info for alias " \
                          "{}".format(alias))
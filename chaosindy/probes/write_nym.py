@@ -1,6 +1,7 @@
 import argparse
 import sys
 
+from chaosindy.common import true_list
 from chaosindy.ledger_interaction import write_nym_and_check
 from chaosindy.helpers import run
 from logzero import logger
@@ -10,7 +11,8 @@ from typing import Union
 
 def write_nym(seed: str, genesis_file: str, pool_name: str = None,
               my_wallet_name: str = None, their_wallet_name: str = None,
-              timeout: Union[str,int] = '60') -> None:
+              timeout: Union[str,int] = '60',
+              reuse_session: Union[str,bool] = False) -> None:
     """
     Write a NYM to the ledger.
 
@@ -43,15 +45,25 @@ def write_nym(seed: str, genesis_file: str, pool_name: str = None,
     :param cleanup: Delete wallets and pool configuration?
         Optional. (Default: True)
     :type cleanup: bool
+    :param reuse_session: Keep the pool and wallet open across calls in the
+        same chaos process, instead of creating and deleting wallets each time?
+        Use the close_ledger_sessions action (chaosindy.actions.ledger) as a
+        rollback to close them.
+        Optional. (Default: False)
+        Valid inputs (case insensitive): 'false', '0', 'f', 'n', 'no', 'true',
+        '1', 't', 'y', 'yes'
+    :type reuse_session: Union[str,bool]
     :return: None
     """
     logger.debug("seed: %s genesis_file: %s pool_name: %s my_wallet_name: %s " \
-                 "their_wallet_name: %s timeout: %s", seed, genesis_file,
-                 pool_name, my_wallet_name, their_wallet_name, timeout)
+                 "their_wallet_name: %s timeout: %s reuse_session: %s", seed,
+                 genesis_file, pool_name, my_wallet_name, their_wallet_name,
+                 timeout, reuse_session)
     return run(write_nym_and_check, seed=seed, pool_name=pool_name,
                my_wallet_name=my_wallet_name,
                their_wallet_name=their_wallet_name, genesis_file=genesis_file,
-               timeout=int(timeout))
+               timeout=int(timeout),
+               reuse_session=str(reuse_session).lower() in true_list)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
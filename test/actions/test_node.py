@@ -1,10 +1,382 @@
+import io
+import json
 import os.path as path
 import pytest
+import subprocess
+import tarfile
 
+import chaosindy.actions.node as node
+import chaosindy.ledger_interaction as ledger_interaction
 from chaosindy.actions.node import get_aliases
+from chaosindy.common import StopStrategy
+from chaosindy.execute.execute import Result
+from test import patch
 
 
 def test_get_aliases():
     genesis_file = path.join(path.dirname(__file__), 'pool_transactions_genesis')
     rtn = get_aliases(genesis_file)
-    assert "Node1" in rtn
\ No newline at end of file
+    assert "Node1" in rtn
+
+def test_safe_tar_members(tmpdir):
+    archive = io.BytesIO()
+    with tarfile.open(fileobj=archive, mode='w:gz') as tar:
+        for name in ['run/requests.csv', '../escaped.csv', '/tmp/abs.csv']:
+            info = tarfile.TarInfo(name)
+            info.size = 3
+            tar.addfile(info, io.BytesIO(b'a,b'))
+        link = tarfile.TarInfo('run/link')
+        link.type = tarfile.SYMTYPE
+        link.linkname = '/etc/passwd'
+        tar.addfile(link)
+    archive.seek(0)
+    dest = tmpdir.join('client')
+    with tarfile.open(fileobj=archive, mode='r:gz') as tar:
+        members = node._safe_tar_members(tar, str(dest))
+    assert [member.name for member in members] == ['run/requests.csv']
+
+
+class FakeParallelExecutor(object):
+    """Records each action and reports every host as done"""
+    def __init__(self, failing_hosts=[]):
+        self.actions = []
+        self.failing_hosts = failing_hosts
+
+    def execute(self, hosts, action, **kwargs):
+        self.actions.append((list(hosts), action))
+        if isinstance(action, str) and 'systemctl stop' in action:
+            # stop_and_wait_command always exits 0 and reports its status
+            return dict([(host, {
+                'return_code': 0,
+                'stdout': '{} 0.000\n'.format(
+                    'failed' if host in self.failing_hosts else 'stopped'),
+                'stderr': ''}) for host in hosts])
+        return dict([(host, {
+            'return_code': 1 if host in self.failing_hosts else 0,
+            'stdout': '0\n',
+            'stderr': ''}) for host in hosts])
+
+
+def test_stop_and_wait_command():
+    invoke = pytest.importorskip('invoke')
+    # Nothing to wait for
+    result = invoke.run(node.stop_and_wait_command(5, stop=False), hide=True,
+                        in_stream=False)
+    assert result.return_code == 0
+    (status, elapsed) = node._parse_stop_result(result.stdout)
+    assert status == 'stopped'
+    assert elapsed < 5
+
+    # A process that outlives the deadline
+    process = subprocess.Popen(['bash', '-c',
+                                'exec -a start_indy_node sleep 30'])
+    try:
+        result = invoke.run(node.stop_and_wait_command(1, stop=False),
+                            hide=True, in_stream=False)
+    finally:
+        process.kill()
+        process.wait()
+    assert result.return_code == 0
+    (status, elapsed) = node._parse_stop_result(result.stdout)
+    assert status == 'timeout'
+    assert elapsed >= 1
+
+
+class FakeFabricExecutor(object):
+    """Fails to connect for the stop command, and succeeds otherwise"""
+    actions = []
+
+    def __init__(self, **kwargs):
+        pass
+
+    def execute(self, host, action, **kwargs):
+        FakeFabricExecutor.actions.append(action)
+        if 'systemctl stop' in action:
+            return Result(-1, '', 'Connection timed out')
+        return Result(0, '', '')
+
+
+def test_stop_by_node_name_unknown_status(tmpdir):
+    FakeFabricExecutor.actions = []
+    with patch(node, 'FabricExecutor', FakeFabricExecutor), \
+         patch(node, 'get_chaos_temp_dir', lambda: str(tmpdir)):
+        # Whether the services stopped is unknown, so they are killed
+        assert node.stop_by_node_name('Node1')
+        assert 'kill -9' in FakeFabricExecutor.actions[-1]
+        FakeFabricExecutor.actions = []
+        assert not node.stop_by_node_name('Node1', force=False)
+        assert len(FakeFabricExecutor.actions) == 1
+
+
+def test_stop_and_start_nodes_by_strategy(tmpdir):
+    executor = FakeParallelExecutor(failing_hosts=['Node3'])
+    with patch(node, 'get_parallel_executor', lambda **kwargs: executor), \
+         patch(node, 'get_chaos_temp_dir', lambda: str(tmpdir)):
+        rtn = node.stop_nodes_by_strategy('pool_transactions_genesis',
+                                          ['Node1', 'Node2', 'Node3'],
+                                          StopStrategy.SERVICE.value)
+        assert rtn['Node1'] == {'stop_strategy': StopStrategy.SERVICE.value}
+        assert rtn['Node2'] == {'stop_strategy': StopStrategy.SERVICE.value}
+        # systemctl failed on Node3, so it was killed (which also failed)
+        assert rtn['Node3'] is False
+        # Stopping and waiting for the services to stop is one round trip
+        assert executor.actions[0][0] == ['Node1', 'Node2', 'Node3']
+        assert 'systemctl stop' in executor.actions[0][1]
+        assert executor.actions[1][0] == ['Node3']
+        assert 'kill -9' in executor.actions[1][1]
+        stop_times = json.loads(tmpdir.join('stop_times').read())
+        assert sorted(stop_times) == ['Node1', 'Node2']
+        assert stop_times['Node1']['elapsed'] == 0.0
+
+        executor.actions = []
+        rtn = node.start_nodes_by_strategy('pool_transactions_genesis', {
+            'Node1': {'stop_strategy': StopStrategy.KILL.value},
+            'Node2': {'stop_strategy': StopStrategy.PORT.value,
+                      'client_port': '9702', 'node_port': '9701'}})
+        assert rtn == {'Node1': True, 'Node2': True}
+        assert executor.actions[0] == (['Node1'], 'systemctl start indy-node')
+        assert '9701' in executor.actions[1][1]['Node2']
+
+
+class FakePortSnapshot(object):
+    """Reports ports for the given nodes only"""
+    def __init__(self, aliases):
+        self.aliases = aliases
+
+    def get(self, alias):
+        if alias not in self.aliases:
+            return None
+        return {'Node_info': {'Client_port': 9702, 'Node_port': 9701}}
+
+
+def test_stop_nodes_by_strategy_without_validator_info(tmpdir):
+    executor = FakeParallelExecutor()
+    snapshot = FakePortSnapshot(['Node1'])
+    with patch(node, 'get_parallel_executor', lambda **kwargs: executor), \
+         patch(node.ValidatorInfoSnapshot, 'latest',
+               lambda genesis_file: snapshot), \
+         patch(node, 'get_chaos_temp_dir', lambda: str(tmpdir)):
+        rtn = node.stop_nodes_by_strategy('pool_transactions_genesis',
+                                          ['Node1', 'Node2'],
+                                          StopStrategy.PORT.value)
+        assert rtn['Node1']['node_port'] == '9701'
+        # Node2's ports are unknown, so it is not stopped
+        assert rtn['Node2'] is False
+        assert executor.actions[0][0] == ['Node1']
+        assert node.stop_by_strategy('pool_transactions_genesis', 'Node2',
+                                     StopStrategy.PORT.value) is False
+
+
+class FakeAsyncRemoteExecutor(object):
+    """Records each action and reports the time each host was released"""
+    instances = []
+
+    def __init__(self, **kwargs):
+        self.actions = []
+        FakeAsyncRemoteExecutor.instances.append(self)
+
+    async def execute(self, hosts, action, **kwargs):
+        self.actions.append(action)
+        released_at = {'Node1': '1000.25', 'Node2': '1000.5'}
+        return dict([(host, {
+            'return_code': 0,
+            'stdout': '{}\n'.format(released_at[host]),
+            'stderr': ''}) for host in hosts])
+
+    def close(self):
+        pass
+
+
+def test_stop_nodes_synchronized(tmpdir):
+    with patch(node, 'AsyncRemoteExecutor', FakeAsyncRemoteExecutor), \
+         patch(node, 'get_chaos_temp_dir', lambda: str(tmpdir)):
+        rtn = node.stop_nodes_synchronized('pool_transactions_genesis',
+                                           '["Node1", "Node2"]',
+                                           StopStrategy.KILL.value,
+                                           release_delay=0)
+    executor = FakeAsyncRemoteExecutor.instances[-1]
+    # Connections are opened before faults are staged
+    assert executor.actions[0] == "date +%s.%N"
+    fault = executor.actions[1]['Node2']
+    assert fault.startswith("bash -c ")
+    assert "{:.6f}".format(rtn['release_at']) in fault
+    assert "kill -9" in fault
+    assert rtn['injected_at'] == {'Node1': 1000.25, 'Node2': 1000.5}
+    assert rtn['skew'] == 0.25
+    assert sorted(rtn['stopped_nodes']) == ['Node1', 'Node2']
+    assert tmpdir.join('stopped_nodes').check()
+
+
+class FakeLedger(object):
+    """Builds, signs and submits NODE requests, rejecting the given nodes"""
+    def __init__(self, rejected=[]):
+        self.rejected = rejected
+        self.submitted = []
+
+    async def build_node_request(self, submitter_did, target_did, data):
+        return json.dumps({'dest': target_did, 'data': json.loads(data)})
+
+    async def sign_request(self, wallet_handle, submitter_did, request):
+        return request
+
+    async def submit_request(self, pool_handle, request):
+        alias = json.loads(request)['data']['alias']
+        self.submitted.append(alias)
+        return json.dumps({
+            'op': 'REJECT' if alias in self.rejected else 'REPLY'})
+
+
+def test_stop_nodes_synchronized_demote(tmpdir):
+    genesis_file = path.join(path.dirname(__file__), 'pool_transactions_genesis')
+    fake_ledger = FakeLedger(rejected=['Node2'])
+    session = ledger_interaction.LedgerSession('pool', 1, 'wallet', '{}', '{}',
+                                               1, 'did', 'verkey')
+
+    async def get_session(**kwargs):
+        return session
+
+    with patch(ledger_interaction, 'ledger', fake_ledger), \
+         patch(node, 'get_session', get_session), \
+         patch(node, 'get_chaos_temp_dir', lambda: str(tmpdir)):
+        rtn = node.stop_nodes_synchronized(genesis_file, ['Node1', 'Node2'],
+                                           StopStrategy.DEMOTE.value,
+                                           release_delay=0.1)
+    # Each node is demoted once
+    assert sorted(fake_ledger.submitted) == ['Node1', 'Node2']
+    # Transactions are submitted at the release time
+    assert rtn['injected_at']['Node1'] >= rtn['release_at']
+    assert rtn['skew'] < 0.1
+    assert list(rtn['stopped_nodes']) == ['Node1']
+    assert tmpdir.join('synchronized_fault').check()
+
+
+class FakeSnapshot(object):
+    """Reports the given primary for each node"""
+    def __init__(self, primaries):
+        self.aliases = list(primaries.keys())
+        self.primaries = primaries
+
+    def primary(self, alias, instance=0):
+        return self.primaries[alias]
+
+
+def test_wait_for_view_change(tmpdir):
+    genesis_file = path.join(path.dirname(__file__), 'pool_transactions_genesis')
+    aliases = get_aliases(genesis_file)
+    old, new = aliases[0], aliases[1]
+    polls = [
+        FakeSnapshot(dict([(alias, old) for alias in aliases])),
+        # One node has moved on, but there is no quorum yet
+        FakeSnapshot(dict([(alias, new if alias == aliases[1] else old)
+                           for alias in aliases])),
+        FakeSnapshot(dict([(alias, 'Unknown' if alias == old else new)
+                           for alias in aliases])),
+    ]
+    sleeps = []
+    with patch(node.ValidatorInfoSnapshot, 'collect',
+               lambda *args, **kwargs: polls.pop(0)), \
+         patch(node, 'sleep', sleeps.append), \
+         patch(node, 'get_chaos_temp_dir', lambda: str(tmpdir)):
+        rtn = node.wait_for_view_change(genesis_file, previous_primary=old,
+                                        initial_interval=0.5, backoff=2)
+    assert rtn['view_changed']
+    assert rtn['primary'] == new
+    assert rtn['checks'] == 3
+    # Fast initial polls, backing off exponentially
+    assert sleeps == [0.5, 1.0]
+    assert rtn['first_new_primary_at'] < rtn['agreed_at']
+    assert rtn['duration'] == rtn['agreed_at'] - rtn['started_at']
+    primaries = json.loads(tmpdir.join('primaries').read())
+    assert primaries['current_primary'] == new
+
+
+def test_benchmark_view_change(tmpdir):
+    durations = [3.0, 1.0, 2.0]
+
+    def stop_primary(genesis_file, **kwargs):
+        tmpdir.join('stopped_primary').write(json.dumps({
+            'stopped_primary': 'Node1', 'stopped_at': 100.0}))
+        return True
+
+    def start_after_view_change(genesis_file, **kwargs):
+        duration = durations.pop(0)
+        tmpdir.join('view_change').write(json.dumps({
+            'view_changed': True, 'primary': 'Node2',
+            'first_new_primary_at': 100.0 + duration / 2,
+            'agreed_at': 100.0 + duration}))
+        return True
+
+    report_file = tmpdir.join('report.json')
+    with patch(node, 'stop_primary', stop_primary), \
+         patch(node, 'start_stopped_primary_after_view_change',
+               start_after_view_change), \
+         patch(node, 'sleep', lambda seconds: None), \
+         patch(node, 'get_chaos_temp_dir', lambda: str(tmpdir)):
+        rtn = node.benchmark_view_change('pool_transactions_genesis',
+                                         iterations='3',
+                                         report_file=str(report_file))
+    assert rtn['completed'] == 3
+    assert rtn['failed'] == 0
+    assert rtn['time_to_agreement'] == {'min': 1.0, 'median': 2.0,
+                                        'p95': 3.0, 'max': 3.0}
+    assert rtn['time_to_first_report']['median'] == 1.0
+    assert json.loads(report_file.read()) == rtn
+
+
+class FakeFSnapshot(object):
+    """Reports the given f value"""
+    def __init__(self, f_value):
+        self.f = f_value
+
+    def f_value(self, alias):
+        return self.f
+
+
+def test_decrease_f_to(tmpdir):
+    validators = ['Node{}'.format(i) for i in range(1, 11)]
+    demoted = []
+
+    def stop_by_strategy(genesis_file, alias, stop_strategy, **kwargs):
+        demoted.append(alias)
+        return {'stop_strategy': stop_strategy}
+
+    with patch(node, 'get_primary', lambda genesis_file, **kwargs: 'Node1'), \
+         patch(node.ValidatorInfoSnapshot, 'latest',
+               lambda genesis_file: FakeFSnapshot(3)), \
+         patch(node, 'get_current_validator_list',
+               lambda **kwargs: list(validators)), \
+         patch(node, 'stop_by_strategy', stop_by_strategy), \
+         patch(node, 'sleep', lambda seconds: None), \
+         patch(node, 'get_chaos_temp_dir', lambda: str(tmpdir)):
+        assert node.decrease_f_to('pool_transactions_genesis', f_value=1)
+    # 10 validators down to 6 (f=1), never demoting the primary
+    assert demoted == ['Node10', 'Node9', 'Node8', 'Node7']
+    # revert_f reads the demoted-nodes state file to promote them back
+    assert sorted(json.loads(tmpdir.join('demoted-nodes').read())) == \
+        sorted(demoted)
+
+
+class FakeCatchupSnapshot(object):
+    """Reports the domain ledger of every node synced after 5 transactions"""
+    def catchup_status(self, alias):
+        return {'Number_txns_in_catchup': {'1': 5},
+                'Ledger_statuses': {'1': 'synced'}}
+
+
+def test_nodes_are_caught_up():
+    def ledger_consistency(lagging):
+        report = {'lagging': [], 'divergent': [], 'missing': []}
+        return {'ledgers': {
+            '1': report,
+            '2': {'lagging': lagging, 'divergent': [], 'missing': []}}}
+
+    for (lagging, caught_up) in [([], True), (['Node2'], False),
+                                 (['Node3'], True)]:
+        with patch(node, 'get_ledger_consistency',
+                   lambda genesis_file, **kwargs: ledger_consistency(lagging)), \
+             patch(node.ValidatorInfoSnapshot, 'latest',
+                   lambda genesis_file: FakeCatchupSnapshot()):
+            # Node2 is synced on the domain ledger, but may lag on another
+            assert node.nodes_are_caught_up(['Node1', 'Node2'],
+                                            'pool_transactions_genesis',
+                                            '1 to 10') is caught_up
@@ -0,0 +1,141 @@
+import json
+import os.path as path
+import time
+
+import chaosindy.probes.catchup as catchup
+import chaosindy.probes.validator_info as validator_info
+from test import patch
+
+
+class FakeSnapshot(object):
+    """Reports the given catchup status for each node"""
+    def __init__(self, statuses):
+        self.statuses = statuses
+
+    def catchup_status(self, alias):
+        return self.statuses.get(alias, None)
+
+
+def catchup_status(domain, txns):
+    return {
+        'Ledger_statuses': {'0': 'synced', '1': domain},
+        'Number_txns_in_catchup': {'0': 0, '1': txns}
+    }
+
+
+def test_track_catchup(tmpdir):
+    samples = [
+        # Node2 did not return validator info
+        FakeSnapshot({'Node1': catchup_status('syncing', 0)}),
+        FakeSnapshot({'Node1': catchup_status('synced', 100),
+                      'Node2': catchup_status('syncing', 0)}),
+        FakeSnapshot({'Node2': catchup_status('synced', 50)}),
+    ]
+    collected = []
+
+    def collect(genesis_file, **kwargs):
+        collected.append(kwargs['ttl'])
+        return samples.pop(0)
+
+    with patch(catchup.ValidatorInfoSnapshot, 'collect', collect), \
+         patch(catchup, 'sleep', lambda seconds: None), \
+         patch(catchup, 'get_chaos_temp_dir', lambda: str(tmpdir)):
+        rtn = catchup.track_catchup('pool_transactions_genesis',
+                                    '["Node1", "Node2"]',
+                                    started_at=time.time() - 1)
+    assert rtn['synced']
+    assert rtn['samples'] == 3
+    # Validator info is collected on every sample
+    assert collected == [0, 0, 0]
+    node1 = rtn['nodes']['Node1']
+    assert node1['synced']
+    domain = node1['ledgers']['1']
+    assert domain['txns_in_catchup'] == 100
+    assert domain['txns_per_sec'] == 100 / domain['time_to_synced']
+    assert rtn['nodes']['Node2']['time_to_synced'] > \
+        node1['time_to_synced']
+    assert json.loads(tmpdir.join('catchup').read()) == rtn
+
+
+def test_track_catchup_deadline(tmpdir):
+    with patch(catchup.ValidatorInfoSnapshot, 'collect',
+               lambda genesis_file, **kwargs: FakeSnapshot({
+                   'Node1': catchup_status('syncing', 0)})), \
+         patch(catchup, 'get_chaos_temp_dir', lambda: str(tmpdir)):
+        rtn = catchup.track_catchup('pool_transactions_genesis', ['Node1'],
+                                    deadline=0)
+    assert not rtn['synced']
+    assert rtn['samples'] == 1
+    assert rtn['nodes']['Node1']['ledgers']['1']['status'] == 'syncing'
+
+
+class FakeLedgerSnapshot(object):
+    """Reports the given (size, root) of each ledger for each node"""
+    def __init__(self, ledgers):
+        self.aliases = list(ledgers.keys())
+        self.ledgers = ledgers
+
+    def get(self, alias):
+        return self.ledgers[alias]
+
+    def ledger_sizes(self, alias):
+        return dict([(ledger, size) for (ledger, (size, root_hash))
+                     in self.ledgers[alias].items()])
+
+    def ledger_root_hashes(self, alias):
+        return dict([(ledger, root_hash) for (ledger, (size, root_hash))
+                     in self.ledgers[alias].items()])
+
+
+def test_get_ledger_consistency(tmpdir):
+    pool = (4, 'pool-root')
+    snapshot = FakeLedgerSnapshot({
+        'Node1': {'0': pool, '1': (10, 'a')},
+        'Node2': {'0': pool, '1': (10, 'a')},
+        'Node3': {'0': pool, '1': (10, 'b')},
+        'Node4': {'0': pool, '1': (8, 'c')},
+        'Node5': None
+    })
+    with patch(catchup.ValidatorInfoSnapshot, 'collect',
+               lambda genesis_file, **kwargs: snapshot), \
+         patch(catchup, 'get_chaos_temp_dir', lambda: str(tmpdir)):
+        rtn = catchup.get_ledger_consistency('pool_transactions_genesis',
+                                             ledgers='["0", "1"]')
+        assert not catchup.ledgers_are_consistent('pool_transactions_genesis',
+            aliases=['Node1', 'Node2', 'Node3', 'Node4'])
+        assert catchup.ledgers_are_consistent('pool_transactions_genesis',
+            aliases=['Node1', 'Node2'], ledgers=['0', '1'])
+        # Neither node reports the config or audit ledger
+        missing = catchup.get_ledger_consistency('pool_transactions_genesis',
+            aliases=['Node1', 'Node2'])
+    assert not rtn['consistent']
+    assert rtn['unreachable'] == ['Node5']
+    assert rtn['ledgers']['0']['lagging'] == []
+    assert rtn['ledgers']['0']['divergent'] == []
+    domain = rtn['ledgers']['1']
+    assert domain['size'] == 10
+    assert domain['root'] == 'a'
+    assert domain['lagging'] == ['Node4']
+    assert domain['divergent'] == ['Node3']
+    assert domain['sizes']['Node4'] == 8
+    assert domain['missing'] == []
+    assert not missing['consistent']
+    assert missing['ledgers']['2']['missing'] == ['Node1', 'Node2']
+    assert missing['ledgers']['1']['missing'] == []
+
+
+def test_track_catchup_ignores_stale_validator_info(tmpdir):
+    genesis_file = path.join(path.dirname(path.dirname(__file__)), 'actions',
+                             'pool_transactions_genesis')
+    # Left over from before Node1 was stopped
+    tmpdir.join('Node1-validator-info').write(json.dumps({
+        'Node_info': {'Catchup_status': catchup_status('synced', 0)}}))
+
+    # Node1 does not answer, so no validator info is written for it
+    with patch(validator_info, 'get_validator_info',
+               lambda genesis_file, **kwargs: False), \
+         patch(validator_info, 'get_chaos_temp_dir', lambda: str(tmpdir)), \
+         patch(catchup, 'get_chaos_temp_dir', lambda: str(tmpdir)):
+        rtn = catchup.track_catchup(genesis_file, ['Node1'], deadline=0)
+    assert not rtn['synced']
+    assert rtn['nodes']['Node1']['ledgers'] == {}
@@ -0,0 +1,97 @@
+import asyncio
+import json
+import os.path as path
+import threading
+
+import chaosindy.probes.mode as mode
+import chaosindy.probes.validator_info as validator_info
+from test import patch
+
+
+def test_summarize_mode_timeline():
+    summary = mode.summarize_mode_timeline({
+        'Node1': [[0, 'participating'], [10, 'Unknown'], [15, 'starting'],
+                  [16, 'syncing'], [20, 'synced'], [22, 'participating']],
+        'Node2': [[0, 'participating']]
+    }, 30)
+    assert summary['Node1']['phases'] == {
+        'participating': 18, 'Unknown': 5, 'starting': 1, 'syncing': 4,
+        'synced': 2}
+    assert summary['Node1']['modes'][-1] == 'participating'
+    assert summary['Node1']['recovery_time'] == 12
+    assert summary['Node2']['phases'] == {'participating': 30}
+    assert summary['Node2']['recovery_time'] is None
+
+
+class FakeSnapshot(object):
+    """Reports the given mode for each node"""
+    def __init__(self, modes):
+        self.aliases = list(modes.keys())
+        self.modes = modes
+
+    def mode(self, alias):
+        return self.modes[alias]
+
+
+def test_mode_tracker(tmpdir):
+    samples = [
+        FakeSnapshot({'Node1': 'participating', 'Node2': 'participating'}),
+        FakeSnapshot({'Node1': 'Unknown', 'Node2': 'participating'}),
+        FakeSnapshot({'Node1': 'syncing', 'Node2': 'participating'}),
+    ]
+
+    sampled = threading.Event()
+
+    def collect(genesis_file, **kwargs):
+        # Getting validator info from the ledger uses the thread's event loop
+        assert not asyncio.get_event_loop().is_closed()
+        if len(samples) > 1:
+            return samples.pop(0)
+        sampled.set()
+        return samples[0]
+
+    with patch(mode.ValidatorInfoSnapshot, 'collect', collect), \
+         patch(mode, 'get_chaos_temp_dir', lambda: str(tmpdir)):
+        assert mode.start_mode_tracker('pool_transactions_genesis',
+                                       interval=0.01)
+        # Only one tracker with a given name at a time
+        assert not mode.start_mode_tracker('pool_transactions_genesis')
+        assert sampled.wait(5)
+        rtn = mode.stop_mode_tracker(timeout=5)
+    assert rtn['samples'] >= 3
+    assert [m for (t, m) in rtn['timeline']['Node1']] == \
+        ['participating', 'Unknown', 'syncing']
+    assert len(rtn['timeline']['Node2']) == 1
+    assert rtn['summary']['Node1']['recovery_time'] is None
+    state = json.loads(tmpdir.join('mode-timeline-mode').read())
+    assert state['status'] == 'stopped'
+    assert state['timeline'] == rtn['timeline']
+
+
+def test_sample_modes_while_node_is_down(tmpdir):
+    genesis_file = path.join(path.dirname(path.dirname(__file__)), 'actions',
+                             'pool_transactions_genesis')
+    # Node1 answers, is down (and leaves its last file behind), then answers
+    answers = ['participating', None, 'syncing']
+    stop = threading.Event()
+
+    def get_validator_info(genesis_file, **kwargs):
+        answer = answers.pop(0)
+        if not answers:
+            stop.set()
+        if answer is None:
+            return False
+        validator_info._write_validator_info(str(tmpdir), 'Node1',
+            json.dumps({'Node_info': {'Mode': answer}}))
+        return True
+
+    validator_info.ValidatorInfoSnapshot.invalidate()
+    with patch(validator_info, 'get_validator_info', get_validator_info), \
+         patch(validator_info, 'get_chaos_temp_dir', lambda: str(tmpdir)):
+        rtn = mode.sample_modes(genesis_file, aliases=['Node1'], interval=0,
+                                stop=stop)
+    assert rtn['samples'] == 3
+    # The tracker's snapshots are not shared with other callers
+    assert validator_info.ValidatorInfoSnapshot._snapshots == {}
+    assert [m for (t, m) in rtn['timeline']['Node1']] == \
+        ['participating', 'Unknown', 'syncing']
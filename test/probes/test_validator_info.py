@@ -0,0 +1,88 @@
+import json
+import os
+import os.path as path
+import tempfile
+
+import chaosindy.common as common
+import chaosindy.probes.validator_info as validator_info_module
+from chaosindy.probes.validator_info import ValidatorInfoSnapshot
+from test import patch
+
+
+GENESIS_FILE = path.join(path.dirname(__file__), '..', 'actions',
+                         'pool_transactions_genesis')
+
+
+def node_info(alias, primary, mode='participating'):
+    return {
+        'Node_info': {
+            'Mode': mode,
+            'Count_of_replicas': 2,
+            'Replicas_status': {
+                '{}:0'.format(alias): {'Primary': '{}:0'.format(primary)},
+                '{}:1'.format(alias): {'Primary': 'Node3:1'}
+            },
+            'Catchup_status': {'Ledger_statuses': {'1': 'synced'}}
+        },
+        'Pool_info': {'f_value': 1, 'Reachable_nodes': [['Node2', 0]]}
+    }
+
+
+def test_validator_info_snapshot():
+    collected = []
+    def get_validator_info(genesis_file, **kwargs):
+        collected.append(kwargs)
+        # validator-info script output and indy-cli output (wrapped in 'data')
+        with open(path.join(temp_dir, 'Node1-validator-info'), 'w') as f:
+            f.write(json.dumps(node_info('Node1', 'Node2')))
+        with open(path.join(temp_dir, 'Node2-validator-info'), 'w') as f:
+            f.write(json.dumps({'data': node_info('Node2', 'Node2')}))
+
+    with tempfile.TemporaryDirectory() as temp_dir, \
+         patch(common, '_chaos_temp_dir', temp_dir), \
+         patch(common, '_chaos_temp_dir_pid', os.getpid()), \
+         patch(validator_info_module, 'get_validator_info',
+               get_validator_info):
+        ValidatorInfoSnapshot.invalidate()
+        snapshot = ValidatorInfoSnapshot.collect(GENESIS_FILE, ttl=60,
+                                                 timeout=5)
+        assert collected == [{'timeout': 5}]
+        assert snapshot.primary('Node1') == 'Node2'
+        assert snapshot.primary('Node2') == 'Node2'
+        assert snapshot.primary('Node2', 1) == 'Node3'
+        assert snapshot.mode('Node2') == 'participating'
+        assert snapshot.f_value('Node1') == 1
+        assert snapshot.replica_count('Node1') == 2
+        assert snapshot.reachable_nodes('Node1') == [['Node2', 0]]
+        assert snapshot.catchup_status('Node1')['Ledger_statuses']['1'] == \
+            'synced'
+        # Node3 did not return validator info
+        assert snapshot.primary('Node3') == 'Unknown'
+        assert snapshot.mode('Node3') == 'Unknown'
+        assert snapshot.f_value('Node3') is None
+
+        # Reused within the ttl
+        assert ValidatorInfoSnapshot.collect(GENESIS_FILE, ttl=60,
+                                             timeout=5) is snapshot
+        assert ValidatorInfoSnapshot.latest(GENESIS_FILE) is snapshot
+        assert len(collected) == 1
+        # ...but only when collected the same way
+        snapshot = ValidatorInfoSnapshot.collect(GENESIS_FILE, ttl=60,
+                                                 timeout=5, quorum=1)
+        assert len(collected) == 2
+        assert ValidatorInfoSnapshot.collect(GENESIS_FILE, ttl=0,
+                                             timeout=5, quorum=1) is not \
+            snapshot
+        assert len(collected) == 3
+
+        # Files left by an earlier run are not mistaken for fresh data
+        ValidatorInfoSnapshot.invalidate()
+        os.utime(path.join(temp_dir, 'Node1-validator-info'), (1000, 1000))
+        os.utime(path.join(temp_dir, 'Node2-validator-info'), (2000, 2000))
+        snapshot = ValidatorInfoSnapshot.latest(GENESIS_FILE)
+        assert snapshot.collected_at == 2000
+        assert snapshot.primary('Node1') == 'Node2'
+        assert ValidatorInfoSnapshot.collect(GENESIS_FILE, ttl=60) is not \
+            snapshot
+        assert len(collected) == 4
+        ValidatorInfoSnapshot.invalidate()
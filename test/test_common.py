@@ -0,0 +1,70 @@
+import os
+import os.path as path
+import shutil
+import tempfile
+
+import chaosindy.common as common
+from chaosindy.common import *
+from test import patch
+
+
+GENESIS_FILE = path.join(path.dirname(__file__), 'actions',
+                         'pool_transactions_genesis')
+
+
+def test_genesis_index():
+    index = GenesisIndex.load(GENESIS_FILE)
+    assert GenesisIndex.load(GENESIS_FILE) is index
+    assert index.aliases[0] == 'Node1'
+    assert len(index.aliases) == len(index.txns)
+    assert index.get_node('Node1')['node_port'] == 9701
+    assert index.get_dest('Node1') == \
+        'Gw6pDLhcBcoQesN72qfotTgFa7cbuqZpkX3Xo6pLhPhv'
+    assert index.get_node('NoSuchNode') is None
+    assert get_info_by_node_name(GENESIS_FILE, 'Node1', path='txn.data')[
+        'dest'] == index.get_dest('Node1')
+
+
+def test_genesis_index_reloads_changed_file():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        genesis_file = path.join(temp_dir, 'pool_transactions_genesis')
+        with open(GENESIS_FILE, 'r') as src, open(genesis_file, 'w') as dst:
+            dst.write(src.readline())
+        index = GenesisIndex.load(genesis_file)
+        assert get_aliases(genesis_file) == ['Node1']
+        shutil.copyfile(GENESIS_FILE, genesis_file)
+        assert GenesisIndex.load(genesis_file) is not index
+        assert get_aliases(genesis_file) == GenesisIndex.load(
+            GENESIS_FILE).aliases
+
+
+def test_get_quorum():
+    assert get_quorum(None, 4) == 4
+    assert get_quorum('n-f', 4) == 3
+    assert get_quorum('N-F', 7) == 5
+    assert get_quorum('n-f', 25) == 17
+    assert get_quorum('2', 4) == 2
+    assert get_quorum(10, 4) == 4
+
+
+def test_get_chaos_temp_dir_is_resolved_once():
+    calls = []
+    def find_chaos_pid():
+        calls.append(1)
+        return 12345
+    with patch(common, '_chaos_temp_dir', None), \
+         patch(common, '_find_chaos_pid', find_chaos_pid):
+        temp_dir = get_chaos_temp_dir()
+        assert temp_dir.endswith('chaosindy.12345')
+        assert get_chaos_temp_dir() == temp_dir
+        assert len(calls) == 1
+        shutil.rmtree(temp_dir)
+
+
+def test_get_chaos_temp_dir_override():
+    with tempfile.TemporaryDirectory() as job_dir:
+        temp_dir = path.join(job_dir, 'state')
+        with patch(common, '_chaos_temp_dir', None), \
+             patch(common, 'environ', {'CHAOS_TEMP_DIR': temp_dir}):
+            assert get_chaos_temp_dir() == temp_dir
+            assert path.isdir(temp_dir)
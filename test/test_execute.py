@@ -1,7 +1,10 @@
+import asyncio
 import logging
 import tempfile
 import pytest
+import time
 
+import chaosindy.execute.execute as execute_module
 from chaosindy.execute.execute import *
 from test import patch
 
@@ -17,6 +20,31 @@ def parallel_noop_do_execute(*args, **kwargs):
         f.write("Wrote ParallelResul to results queue...")
 
 
+class FakeConnection(object):
+    opened = 0
+
+    def __init__(self, host, config=None, user=None, connect_timeout=None,
+                 connect_kwargs=None):
+        self.host = host
+        self.is_connected = False
+        self.transport = self
+
+    def open(self):
+        FakeConnection.opened += 1
+        self.is_connected = True
+
+    def close(self):
+        self.is_connected = False
+
+    def send_ignore(self):
+        pass
+
+    def run(self, action, hide=True, timeout=None):
+        return Result(return_code=0, stdout='devin\n', stderr='')
+
+    sudo = run
+
+
 def test_verify_identity_file():
 
     with pytest.raises(ValueError):
@@ -88,6 +116,114 @@ def test_simple_parallel_fabric_test(caplog):
         for key in rtn.keys():
             assert rtn[key]['return_code'] == 0
             assert rtn[key]['stdout'] == 'corin\n'
+    executor.shutdown()
+
+
+def test_parallel_fabric_reuses_workers():
+    executor = ParallelFabricExecutor(processes=2)
+    pids = [process.pid for process in executor._processes]
+    for hosts in [['Node1', 'Node2'], ['Node1', 'Node2', 'Node3']]:
+        rtn = executor.execute(hosts, 'pytest', user='ubuntu')
+        assert sorted(rtn.keys()) == hosts
+        for key in rtn.keys():
+            assert rtn[key]['return_code'] == 0
+    assert [process.pid for process in executor._processes] == pids
+    assert all(process.is_alive() for process in executor._processes)
+    executor.shutdown()
+    executor.shutdown()
+    assert not any(process.is_alive() for process in executor._processes)
+    with pytest.raises(Exception):
+        executor.execute(['Node1'], 'pytest')
+
+
+def slow_parallel_execute_on_host(self, host, action, config, **kwargs):
+    if host == 'Node2':
+        time.sleep(3)
+    return ParallelResult(host, 0, 'corin\n', '')
+
+
+def test_parallel_fabric_execute_iter():
+    # Workers are forked when the executor is created, so patch first
+    with patch(ParallelFabricExecutor, '_parallel_execute_on_host',
+               slow_parallel_execute_on_host):
+        executor = ParallelFabricExecutor(processes=3)
+    started = time.time()
+    results = list(executor.execute_iter(['Node1', 'Node2', 'Node3'], 'echo',
+                                         deadline=1))
+    assert time.time() - started < 2.5
+    assert [r.host for r in results][-1] == 'Node2'
+    assert {r.host: r.return_code for r in results} == {
+        'Node1': 0, 'Node2': -1, 'Node3': 0}
+    # The late Node2 result must not leak into the next batch
+    time.sleep(2.5)
+    rtn = executor.execute(['Node1'], 'echo')
+    assert list(rtn.keys()) == ['Node1']
+    executor.shutdown()
+
+
+def hanging_parallel_execute_on_host(self, host, action, config, **kwargs):
+    if host == 'Node1':
+        time.sleep(60)
+    return ParallelResult(host, 0, 'corin\n', '')
+
+
+def test_parallel_fabric_execute_iter_hung_worker():
+    with patch(ParallelFabricExecutor, '_parallel_execute_on_host',
+               hanging_parallel_execute_on_host):
+        executor = ParallelFabricExecutor(processes=1)
+    pid = executor._processes[0].pid
+    started = time.time()
+    # Node2 is queued behind the hung Node1 and must expire with it
+    results = list(executor.execute_iter(['Node1', 'Node2'], 'echo',
+                                         deadline=1))
+    assert time.time() - started < 5
+    assert {r.host: r.return_code for r in results} == {
+        'Node1': -1, 'Node2': -1}
+    # The hung worker was replaced rather than lost
+    assert len(executor._processes) == 1
+    assert executor._processes[0].pid != pid
+    assert executor._processes[0].is_alive()
+    rtn = executor.execute(['Node3'], 'pytest', deadline=5)
+    assert rtn['Node3']['return_code'] == 0
+    executor.shutdown()
+
+
+def test_parallel_fabric_execute_quorum():
+    with patch(ParallelFabricExecutor, '_parallel_execute_on_host',
+               slow_parallel_execute_on_host):
+        executor = ParallelFabricExecutor(processes=3)
+    started = time.time()
+    rtn = executor.execute_quorum(['Node1', 'Node2', 'Node3'], 'echo',
+                                  quorum=2)
+    assert time.time() - started < 2
+    assert sorted(rtn.keys()) == ['Node1', 'Node3']
+    rtn = executor.execute_quorum(['Node1', 'Node2', 'Node3'], 'echo',
+                                  predicate=lambda results: 'Node2' in results)
+    assert 'Node2' in rtn
+    executor.shutdown()
+
+
+def echo_parallel_execute_on_host(self, host, action, config, **kwargs):
+    return ParallelResult(host, 0, action, '')
+
+
+def test_parallel_fabric_per_host_action():
+    with patch(ParallelFabricExecutor, '_parallel_execute_on_host',
+               echo_parallel_execute_on_host):
+        executor = ParallelFabricExecutor(processes=2)
+    rtn = executor.execute(['Node1', 'Node2'], {'Node1': 'one', 'Node2': 'two'})
+    assert rtn['Node1']['stdout'] == 'one'
+    assert rtn['Node2']['stdout'] == 'two'
+    executor.shutdown()
+
+
+def test_get_parallel_executor():
+    executor = get_parallel_executor()
+    assert get_parallel_executor() is executor
+    assert executor.execute(['Node1'], 'pytest')['Node1']['return_code'] == 0
+    shutdown_parallel_executors()
+    assert get_parallel_executor() is not executor
+    shutdown_parallel_executors()
 
 
 def test_ssh_config():
@@ -102,3 +238,71 @@ IdentityFile /tmp/QA-Pool.pem"""
         with patch(FabricExecutor, '_multiprocess_execute_on_host', noop_do_execute):
             rtn = executor.execute('Node1', 'echo "devin"')
             assert rtn.return_code == 0
+
+
+def test_connection_pool_reuses_connections():
+    pool = ConnectionPool()
+    with patch(execute_module, 'Connection', FakeConnection):
+        first = pool.acquire('Node1', None, user='ubuntu')
+        pool.release(first, user='ubuntu')
+        second = pool.acquire('Node1', None, user='ubuntu')
+        assert first is second
+        # A different user is a different key
+        other = pool.acquire('Node1', None, user='root')
+        assert other is not second
+        pool.release(second, user='ubuntu')
+        pool.release(other, user='root')
+        pool.close_all()
+        assert not first.is_connected
+        assert not other.is_connected
+
+
+def test_connection_pool_evicts_idle_and_unhealthy():
+    pool = ConnectionPool(max_idle=0, health_check_interval=0)
+    with patch(execute_module, 'Connection', FakeConnection):
+        idle = pool.acquire('Node1', None)
+        pool.release(idle)
+        pool.evict_idle()
+        assert not idle.is_connected
+
+        pool = ConnectionPool()
+        dropped = pool.acquire('Node1', None)
+        pool.release(dropped)
+        dropped.is_connected = False
+        assert pool.acquire('Node1', None) is not dropped
+
+
+def test_persistent_fabric_test():
+    executor = FabricExecutor(persistent=True)
+    with patch(execute_module, 'Connection', FakeConnection):
+        opened = FakeConnection.opened
+        for i in range(3):
+            rtn = executor.execute('Node1', 'echo "devin"', user='ubuntu')
+            assert rtn.return_code == 0
+            assert rtn.stdout == 'devin\n'
+        assert FakeConnection.opened == opened + 1
+        get_connection_pool().close_all()
+
+
+class HangingConnection(FakeConnection):
+    def run(self, action, hide=True, timeout=None):
+        if self.host == 'Node2':
+            time.sleep(2)
+        return FakeConnection.run(self, action, hide=hide, timeout=timeout)
+
+    sudo = run
+
+
+def test_async_remote_executor():
+    executor = AsyncRemoteExecutor(max_concurrency=2)
+    with patch(execute_module, 'Connection', HangingConnection):
+        loop = asyncio.get_event_loop()
+        rtn = loop.run_until_complete(
+            executor.execute(['Node1', 'Node2', 'Node3'], 'echo "devin"',
+                             timeout=1))
+    executor.close()
+    assert rtn['Node1']['return_code'] == 0
+    assert rtn['Node1']['stdout'] == 'devin\n'
+    assert rtn['Node3']['return_code'] == 0
+    assert rtn['Node2']['return_code'] == -1
+
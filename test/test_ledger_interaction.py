@@ -0,0 +1,235 @@
+import asyncio
+import json
+import threading
+
+import chaosindy.ledger_interaction as ledger_interaction
+from test import patch
+
+
+class FakeIndy(object):
+    """Stands in for the indy pool, wallet, did and ledger modules"""
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        async def call(*args, **kwargs):
+            self.calls.append(name)
+            if name == 'open_pool_ledger':
+                return 1
+            if name == 'open_wallet':
+                return 2
+            if name == 'create_and_store_my_did':
+                return ('V4SGRU86Z58d6TV7PBUe6f', 'verkey')
+            if name in ('build_get_validator_info_request', 'sign_request'):
+                return '{}'
+            if name == 'submit_action':
+                return json.dumps({
+                    'Node1': json.dumps({'op': 'REPLY', 'result': {
+                        'data': {'Node_info': {'Mode': 'participating'}}}}),
+                    'Node2': 'timeout'
+                })
+        return call
+
+
+def test_get_validator_info_from_ledger_reuses_session():
+    indy = FakeIndy()
+    loop = asyncio.get_event_loop()
+    with patch(ledger_interaction, 'pool', indy), \
+         patch(ledger_interaction, 'wallet', indy), \
+         patch(ledger_interaction, 'did', indy), \
+         patch(ledger_interaction, 'ledger', indy):
+        for i in range(2):
+            rtn = loop.run_until_complete(
+                ledger_interaction.get_validator_info_from_ledger(
+                    genesis_file='pool_transactions_genesis', timeout=5))
+            assert rtn['Node1']['Node_info']['Mode'] == 'participating'
+            assert rtn['Node2'] is None
+        assert indy.calls.count('open_pool_ledger') == 1
+        assert indy.calls.count('open_wallet') == 1
+        assert indy.calls.count('submit_action') == 2
+        loop.run_until_complete(ledger_interaction.close_sessions())
+        assert indy.calls.count('close_pool_ledger') == 1
+        assert indy.calls.count('delete_wallet') == 1
+
+
+class SlowFakeIndy(FakeIndy):
+    """Takes a while to open the pool ledger"""
+    def __getattr__(self, name):
+        call = super(SlowFakeIndy, self).__getattr__(name)
+        if name != 'open_pool_ledger':
+            return call
+
+        async def slow_call(*args, **kwargs):
+            await asyncio.sleep(0.1)
+            return await call(*args, **kwargs)
+        return slow_call
+
+
+def test_get_session_from_threads():
+    indy = SlowFakeIndy()
+    sessions = []
+
+    def get_session():
+        # Each thread runs its own event loop, like background load
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            sessions.append(loop.run_until_complete(asyncio.gather(
+                ledger_interaction.get_session(
+                    genesis_file='pool_transactions_genesis'),
+                ledger_interaction.get_session(
+                    genesis_file='pool_transactions_genesis'))))
+        finally:
+            loop.close()
+
+    with patch(ledger_interaction, 'pool', indy), \
+         patch(ledger_interaction, 'wallet', indy), \
+         patch(ledger_interaction, 'did', indy):
+        threads = [threading.Thread(target=get_session) for i in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert indy.calls.count('open_wallet') == 1
+        assert len(set([id(session) for pair in sessions
+                        for session in pair])) == 1
+        asyncio.get_event_loop().run_until_complete(
+            ledger_interaction.close_sessions())
+
+
+class FakePoolLedger(FakeIndy):
+    """Serves GET_TXN requests from a list of pool ledger transactions"""
+    def __init__(self, txns):
+        super(FakePoolLedger, self).__init__()
+        self.txns = txns
+        self.seq_nos = []
+
+    def __getattr__(self, name):
+        if name == 'build_get_txn_request':
+            async def build(submitter_did, seq_no, ledger_type):
+                self.seq_nos.append(seq_no)
+                return json.dumps({'seq_no': seq_no})
+            return build
+        if name == 'sign_and_submit_request':
+            async def submit(pool_handle, wallet_handle, submitter_did,
+                             request_json):
+                seq_no = json.loads(request_json)['seq_no']
+                data = None
+                if seq_no <= len(self.txns):
+                    data = {'txn': {'data': self.txns[seq_no - 1]}}
+                return json.dumps({'result': {'data': data,
+                                              'identifier': 'steward'}})
+            return submit
+        return super(FakePoolLedger, self).__getattr__(name)
+
+
+def node_txn(alias, dest, **kwargs):
+    data = {'alias': alias}
+    data.update(kwargs)
+    return {'dest': dest, 'data': data}
+
+
+def test_get_validator_state_windowed(tmpdir):
+    genesis_file = tmpdir.join('pool_transactions_genesis')
+    genesis_file.write('{}\n')
+    cache_dir = tmpdir.join('cache')
+    indy = FakePoolLedger([node_txn('Node1', 'D1', services=['VALIDATOR']),
+                           node_txn('Node2', 'D2', services=['VALIDATOR']),
+                           node_txn('Node1', 'D1', services=[])])
+    loop = asyncio.get_event_loop()
+
+    def get_validator_state():
+        loop.run_until_complete(ledger_interaction.get_validator_state(
+            genesis_file=str(genesis_file), window=2,
+            cache_dir=str(cache_dir)))
+        return json.loads(tmpdir.join('validator-state').read())
+
+    with patch(ledger_interaction, 'pool', indy), \
+         patch(ledger_interaction, 'wallet', indy), \
+         patch(ledger_interaction, 'did', indy), \
+         patch(ledger_interaction, 'ledger', indy), \
+         patch(ledger_interaction, 'get_chaos_temp_dir', lambda: str(tmpdir)), \
+         patch(ledger_interaction, '_pool_ledger_cache', {}):
+        state = get_validator_state()
+        assert state['Node1']['services'] == []
+        assert state['Node2']['dest'] == 'D2'
+        # The first seq_no is probed on its own, then a window at a time
+        assert indy.seq_nos == [1, 2, 3, 4, 5]
+        assert indy.calls.count('open_wallet') == 1
+
+        # Later calls start after the cached high-water mark
+        indy.txns.append(node_txn('Node3', 'D3', services=['VALIDATOR']))
+        indy.seq_nos = []
+        state = get_validator_state()
+        assert sorted(state.keys()) == ['Node1', 'Node2', 'Node3']
+        assert indy.seq_nos == [4, 5, 6]
+        assert indy.calls.count('open_wallet') == 1
+
+        # ... including calls in a later process, using the on-disk replica
+        ledger_interaction._pool_ledger_cache.clear()
+        indy.seq_nos = []
+        state = get_validator_state()
+        assert sorted(state.keys()) == ['Node1', 'Node2', 'Node3']
+        assert state['Node1']['services'] == []
+        # Up to date, so only the next seq_no is requested
+        assert indy.seq_nos == [5]
+
+        # The state is rebuilt from the transaction log if it is missing
+        ledger_interaction._pool_ledger_cache.clear()
+        genesis_hash = ledger_interaction.get_genesis_hash(str(genesis_file))
+        cache_dir.join("{}.json".format(genesis_hash)).remove()
+        indy.seq_nos = []
+        state = get_validator_state()
+        assert state['Node3']['dest'] == 'D3'
+        assert indy.seq_nos == [5]
+
+        loop.run_until_complete(ledger_interaction.close_sessions())
+
+
+def test_save_pool_ledger_cache_drops_truncated_entry(tmpdir):
+    def result(alias, dest):
+        return {'data': {'txn': {'data': node_txn(alias, dest,
+                                                  services=['VALIDATOR'])}}}
+
+    cache_dir = str(tmpdir)
+    ledger_interaction.save_pool_ledger_cache('hash', cache_dir, 1,
+        [result('Node1', 'D1'), result('Node2', 'D2')], {})
+    # An interrupted write
+    txn_log = tmpdir.join('hash.jsonl')
+    txn_log.write('{"seq_no": 3, "res', mode='a')
+    assert ledger_interaction.load_pool_ledger_cache('hash',
+                                                     cache_dir)['seq_no'] == 2
+
+    ledger_interaction.save_pool_ledger_cache('hash', cache_dir, 3,
+        [result('Node3', 'D3')], {})
+    assert ledger_interaction.load_pool_ledger_cache('hash',
+                                                     cache_dir)['seq_no'] == 3
+    assert [json.loads(line)['seq_no']
+            for line in txn_log.read().splitlines()] == [1, 2, 3]
+    # No temp files are left behind
+    assert sorted(f.basename for f in tmpdir.listdir()) == \
+        ['hash.json', 'hash.jsonl']
+
+
+def test_write_nym_and_check_reuse_session():
+    indy = FakeIndy()
+    loop = asyncio.get_event_loop()
+
+    async def submit_request(pool_handle, request_json):
+        indy.calls.append('submit_request')
+        return json.dumps({'result': {'dest': 'V4SGRU86Z58d6TV7PBUe6f'}})
+
+    with patch(ledger_interaction, 'pool', indy), \
+         patch(ledger_interaction, 'wallet', indy), \
+         patch(ledger_interaction, 'did', indy), \
+         patch(ledger_interaction, 'ledger', indy), \
+         patch(indy, 'submit_request', submit_request):
+        for i in range(3):
+            loop.run_until_complete(ledger_interaction.write_nym_and_check(
+                genesis_file='pool_transactions_genesis', reuse_session=True))
+        assert indy.calls.count('open_pool_ledger') == 1
+        assert indy.calls.count('create_wallet') == 1
+        assert indy.calls.count('sign_and_submit_request') == 3
+        assert indy.calls.count('submit_request') == 3
+        loop.run_until_complete(ledger_interaction.close_sessions())
+        assert indy.calls.count('delete_wallet') == 1
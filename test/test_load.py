@@ -0,0 +1,228 @@
+import asyncio
+import json
+import threading
+import time
+
+import chaosindy.load as load
+from chaosindy.helpers import BackgroundTask
+from chaosindy.load import (
+    MockPoolClient, PresignedNymClient, arrival_times, merge_request_records,
+    percentile, read_request_records, run_burst_load, run_load,
+    run_open_loop_load, summarize
+)
+from test import patch
+
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile(values, 100) == 100
+    assert percentile([7], 99) == 7
+    assert percentile([], 50) is None
+
+
+def test_summarize():
+    stats = summarize([0.3, 0.1, 0.2], 1, 2.0)
+    assert stats['count'] == 4
+    assert stats['succeeded'] == 3
+    assert stats['failed'] == 1
+    assert stats['tps'] == 1.5
+    assert stats['latency']['min'] == 0.1
+    assert stats['latency']['p50'] == 0.2
+    assert stats['latency']['max'] == 0.3
+
+
+def test_run_load_bounded_window():
+    client = MockPoolClient(latency=0.01)
+    loop = asyncio.get_event_loop()
+    stats = loop.run_until_complete(run_load(client, 50, concurrency=5))
+    assert stats['count'] == 50
+    assert stats['succeeded'] == 50
+    assert client.submitted == 50
+    assert client.max_in_flight == 5
+    # 10 rounds of 5 concurrent 10ms requests
+    assert stats['duration'] < 0.5
+    assert stats['latency']['p50'] >= 0.01
+
+
+def test_run_load_failures():
+    client = MockPoolClient(latency=0, failure_rate=1)
+    loop = asyncio.get_event_loop()
+    stats = loop.run_until_complete(run_load(client, 10, concurrency=3))
+    assert stats['failed'] == 10
+    assert stats['tps'] == 0
+    assert stats['latency']['p99'] is None
+
+
+class FailingPrepareClient(MockPoolClient):
+    """Fails to prepare every other request"""
+    async def prepare(self):
+        request = await super(FailingPrepareClient, self).prepare()
+        if self.prepared % 2 == 0:
+            raise ValueError("Failed to sign request")
+        return request
+
+
+def test_run_load_prepare_failures():
+    loop = asyncio.get_event_loop()
+    stats = loop.run_until_complete(run_load(FailingPrepareClient(latency=0),
+                                             10, concurrency=3))
+    assert stats['count'] == 10
+    assert stats['failed'] == 5
+    stats = loop.run_until_complete(
+        run_burst_load(FailingPrepareClient(latency=0), 10))
+    assert stats['count'] == 10
+    assert stats['failed'] == 5
+
+
+def test_arrival_times():
+    times = arrival_times(10, 2, 'uniform')
+    assert len(times) == 20
+    assert times[1] - times[0] == 0.1
+    times = arrival_times(1000, 2, 'poisson')
+    assert 1700 < len(times) < 2300
+    assert times == sorted(times)
+    assert times[-1] < 2
+
+
+def test_run_open_loop_load_measures_from_intended_send_time():
+    # The pool can only process one request at a time, taking 50ms each, but
+    # 100 requests per second are offered. An open loop keeps offering load,
+    # so latency grows with the queue instead of being hidden.
+    client = MockPoolClient(latency=0.05, capacity=1)
+    loop = asyncio.get_event_loop()
+    stats = loop.run_until_complete(
+        run_open_loop_load(client, 100, 0.5, arrival='uniform'))
+    assert stats['count'] == 50
+    assert stats['offered_tps'] == 100
+    assert client.max_in_flight > 10
+    assert stats['latency']['max'] > 1
+    assert stats['series'][0]['offered'] == 50
+    assert sum([b['completed'] for b in stats['series']]) == 50
+
+
+def test_run_open_loop_load_max_in_flight():
+    client = MockPoolClient(latency=0.2)
+    loop = asyncio.get_event_loop()
+    stats = loop.run_until_complete(
+        run_open_loop_load(client, 100, 0.1, arrival='uniform',
+                           max_in_flight=5))
+    assert stats['dropped'] == 5
+    assert stats['succeeded'] == 5
+    assert client.submitted == 5
+
+
+def test_load_deadline():
+    # The pool stalls, so no request completes before the deadline
+    loop = asyncio.get_event_loop()
+    stats = loop.run_until_complete(
+        run_open_loop_load(MockPoolClient(latency=10), 100, 1,
+                           arrival='uniform', deadline=0.2))
+    assert stats['timed_out']
+    assert stats['duration'] < 1
+    assert stats['succeeded'] == 0
+    # Requests offered before the deadline were cancelled and failed
+    assert 15 <= stats['failed'] <= 21
+    assert sum([b['offered'] for b in stats['series']]) == stats['failed']
+
+    stats = loop.run_until_complete(run_load(MockPoolClient(latency=10), 10,
+                                             concurrency=3, deadline=0.1))
+    assert stats['timed_out']
+    assert stats['failed'] == 3
+
+    stats = loop.run_until_complete(run_load(MockPoolClient(latency=0), 10,
+                                             deadline=5))
+    assert not stats['timed_out']
+    assert stats['succeeded'] == 10
+
+
+def test_generate_nym_load_timeout(tmpdir):
+    async def get_session(**kwargs):
+        return None
+
+    with patch(load, 'get_session', get_session), \
+         patch(load, 'NymLoadClient',
+               lambda session: MockPoolClient(latency=10)), \
+         patch(load, 'get_chaos_temp_dir', lambda: str(tmpdir)):
+        stats = load.generate_nym_load('pool_transactions_genesis', count=5,
+                                       concurrency=5, timeout=1)
+    assert stats['timed_out']
+    assert stats['failed'] == 5
+    assert json.loads(tmpdir.join('nym-load').read()) == stats
+
+
+def test_run_burst_load():
+    client = MockPoolClient(latency=0.05)
+    loop = asyncio.get_event_loop()
+    stats = loop.run_until_complete(run_burst_load(client, 100))
+    assert stats['succeeded'] == 100
+    assert client.max_in_flight == 100
+    assert stats['duration'] < 0.5
+
+    client = MockPoolClient(latency=0.01)
+    stats = loop.run_until_complete(run_burst_load(client, 20,
+                                                   max_in_flight=4))
+    assert stats['succeeded'] == 20
+    assert client.max_in_flight == 4
+
+
+def test_presigned_nym_client():
+    client = PresignedNymClient(None, ['a', 'b'])
+    loop = asyncio.get_event_loop()
+    assert loop.run_until_complete(client.prepare()) == 'a'
+    assert loop.run_until_complete(client.prepare()) == 'b'
+    try:
+        loop.run_until_complete(client.prepare())
+        assert False
+    except IndexError:
+        pass
+
+
+def test_merge_request_records(tmpdir):
+    csv_file = tmpdir.join('client1.csv')
+    csv_file.write("time_sent,time_reply,status\n"
+                   "100.0,100.5,ok\n"
+                   "100.2,101.4,ok\n"
+                   "100.9,,failed\n")
+    records = {
+        'client1': read_request_records(str(csv_file)),
+        'client2': [(100.1, 100.3), (101.0, 101.2)]
+    }
+    assert records['client1'][2] == (100.9, None)
+    merged = merge_request_records(records)
+    assert merged['started_at'] == 100.0
+    assert merged['summary']['succeeded'] == 4
+    assert merged['summary']['failed'] == 1
+    assert len(merged['series']) == 2
+    assert merged['series'][0]['sent'] == 4
+    assert merged['series'][0]['completed'] == 2
+    assert merged['series'][0]['failed'] == 1
+    assert merged['series'][1]['clients'] == {'client1': 1, 'client2': 1}
+    assert merged['skewed'] == 0
+    assert merge_request_records({})['series'] == []
+
+    # A reply before the first request (clock skew) is dropped, not counted in
+    # the last bucket
+    records['client2'].append((100.05, 99.0))
+    merged = merge_request_records(records)
+    assert merged['skewed'] == 1
+    assert merged['summary']['succeeded'] == 4
+    assert merged['series'][1]['clients'] == {'client1': 1, 'client2': 1}
+
+
+def test_run_open_loop_load_in_background_until_stopped():
+    client = MockPoolClient(latency=0.01)
+    stop = threading.Event()
+    task = BackgroundTask('load', run_open_loop_load, client, 100, 60,
+                          arrival='uniform', stop=stop,
+                          run_in_loop=True).start()
+    time.sleep(0.5)
+    assert task.is_alive()
+    stop.set()
+    assert task.join(5)
+    assert task.exception is None
+    assert 20 < task.result['count'] < 100
+    assert task.result['succeeded'] == task.result['count']
+    assert task.result['duration'] < 5